@@ -1,5 +1,6 @@
 from pathlib import Path
 from controllers.cash_box_controller import CashBoxPeriodController
+from controllers.period_context import period_context
 from controllers.user_controller import UserController
 from database.create_db import check_and_create_db
 from pyside6_custom_widgets.button import Button
@@ -10,7 +11,7 @@ from imports import QDialog, QVBoxLayout, QHBoxLayout,QIcon, QLineEdit, QApplica
 from qt_material import apply_stylesheet
 
 from main import MainWindow
-from utils.utils import save_config_data, set_app_icon, write_id_to_file
+from utils.utils import save_config_data, set_app_icon
 from views.manage_periodes_views import CashBoxPeriodCreateView
 
 class SignIn(QDialog):
@@ -131,7 +132,7 @@ class SignIn(QDialog):
             if is_authenticated :
                 user = self.controller.get_user(username=username)
                 save_config_data(user[0], user[1]) #Enregistrer les données de l'utilisateur connecté.
-                write_id_to_file(str(period_id)) #Enregistrer l'id de l'exercice choisit
+                period_context.switch_to(period_id) #Enregistrer l'id de l'exercice choisit
                 self.open_dashboard()
             else:
                 QMessageBox.critical(self,"Error","Nom d'utilisateur ou Mot de passe incorrecte.")
@@ -0,0 +1,14 @@
+"""
+Standalone performance scripts.
+
+Run them from the repository root, e.g. `python -m benchmarks.session_reuse`.
+Unless `CASH_BOX_DATABASE_URL` is already set, they work on a throw-away
+SQLite file so the real `database/db.db` is never touched.
+"""
+import os
+import tempfile
+
+os.environ.setdefault(
+    "CASH_BOX_DATABASE_URL",
+    f"sqlite:///{tempfile.mkdtemp(prefix='cbm_bench_')}/bench.db",
+)
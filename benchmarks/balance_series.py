@@ -0,0 +1,49 @@
+"""
+Latency of CashBoxPeriodController.get_balance_series on 1M transactions
+(500k incomes and 500k expenses). Exits with an AssertionError when a
+granularity takes more than BUDGET_MS, when the last balance disagrees
+with calculate_ending_balance or when a closed period, read from its
+rollup, gives another series.
+
+    python -m benchmarks.balance_series
+"""
+import benchmarks  # noqa: F401  (selects the throw-away database)
+
+from benchmarks.fixtures import seed, timed
+from controllers.cash_box_controller import BALANCE_GRANULARITIES, CashBoxPeriodController
+from controllers.period_context import period_context
+from database.period_rollup import CLOSED_STATUS
+
+ROWS_PER_KIND = 500_000
+BUDGET_MS = 100
+
+
+def main():
+    seed(rows_per_kind=ROWS_PER_KIND)
+    controller = CashBoxPeriodController()
+    ending_balance = controller.calculate_ending_balance()
+    results = {}
+    open_series = {}
+
+    for granularity in BALANCE_GRANULARITIES:
+        controller.get_balance_series(granularity)  # cache SQLite chaud
+        with timed(granularity, results):
+            series = open_series[granularity] = controller.get_balance_series(granularity)
+        assert series[-1].balance == ending_balance, (granularity, series[-1], ending_balance)
+        print(f"{granularity:<8}{len(series):>6} points{results[granularity]:>10.1f} ms")
+
+    # Une fois l'exercice clôturé, la série vient des lignes journalières figées.
+    controller.update(period_context.current.id, is_open=CLOSED_STATUS)
+    for granularity in BALANCE_GRANULARITIES:
+        label = f"{granularity} (closed)"
+        with timed(label, results):
+            series = controller.get_balance_series(granularity)
+        assert series == open_series[granularity], granularity
+        print(f"{label:<17}{results[label]:>10.1f} ms")
+
+    slow = {label: ms for label, ms in results.items() if ms > BUDGET_MS}
+    assert not slow, f"over the {BUDGET_MS} ms budget: {slow}"
+
+
+if __name__ == "__main__":
+    main()
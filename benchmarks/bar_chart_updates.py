@@ -0,0 +1,122 @@
+"""
+Cost of BarChartWidgetWithTwoDataSets.update_chart at 120 monthly buckets,
+headless (offscreen Qt platform), against the former full rebuild: every
+value removed then appended one by one, the x axis cleared and refilled,
+with series animations. Each update is timed until the chart is laid out
+and painted once; the frames of a running animation are not counted.
+
+Exits with an AssertionError when an update keeping the same buckets takes
+more than BUDGET_MS, rebuilds the axis or refills a bar set for a single
+changed bucket. Updates adding or removing a bucket are only reported: any
+change of the category axis makes Qt lay out every label again.
+
+    python -m benchmarks.bar_chart_updates
+"""
+import benchmarks  # noqa: F401  (selects the throw-away database)
+
+import os
+import random
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from controllers.dashboard_service import ExpenseMonth, IncomeMonth
+from imports import QApplication, QChart
+from models import Money
+from pyside6_custom_widgets.charts import BarChartWidgetWithTwoDataSets
+
+BUCKETS = 120
+REPEAT = 20
+BUDGET_MS = 60
+
+
+def monthly_data(buckets=BUCKETS, seed_value=0):
+    rng = random.Random(seed_value)
+    months = [f"{2015 + index // 12}-{index % 12 + 1:02d}" for index in range(buckets)]
+    return (
+        [IncomeMonth(month, Money(rng.randint(1, 10**7))) for month in months],
+        [ExpenseMonth(month, Money(rng.randint(1, 10**7))) for month in months],
+    )
+
+
+def one_bucket_changed(data, seed_value):
+    income, expense = data
+    index = seed_value % len(income)
+    income = list(income)
+    income[index] = income[index]._replace(total_income=income[index].total_income + seed_value + 1)
+    return income, expense
+
+
+def full_rebuild(widget, income_data, expense_data):
+    """update_chart as it was before diffing."""
+    widget.income_data = income_data
+    widget.expense_data = expense_data
+    widget.chart.setAnimationOptions(QChart.SeriesAnimations)
+    widget.income_bar_set.remove(0, widget.income_bar_set.count())
+    widget.expense_bar_set.remove(0, widget.expense_bar_set.count())
+    widget.buckets, income_values, expense_values = widget.extract_values()
+    for income, expense in zip(income_values, expense_values):
+        widget.income_bar_set.append(income)
+        widget.expense_bar_set.append(expense)
+    widget.categories = widget.extract_categories()
+    widget.axis_x.clear()
+    widget.axis_x.append(widget.categories)
+    widget.chart_view.repaint()
+
+
+def time_updates(app, widget, update, scenarios):
+    """Average milliseconds of `update` per scenario, layout and painting included."""
+    results = {}
+    for label, make_data in scenarios.items():
+        start = time.perf_counter()
+        for repeat in range(REPEAT):
+            update(widget, *make_data(repeat))
+            app.processEvents()
+            widget.chart_view.grab()
+        results[label] = (time.perf_counter() - start) * 1000 / REPEAT
+    return results
+
+
+def check_axis_kept(widget, data):
+    axis_changes, removals = [], []
+    widget.axis_x.categoriesChanged.connect(lambda: axis_changes.append(True))
+    widget.income_bar_set.valuesRemoved.connect(lambda *args: removals.append(args))
+    widget.update_chart(*one_bucket_changed(data, 7))
+    assert not axis_changes, "the axis was rebuilt although the buckets did not change"
+    assert not removals, "the bar set was refilled for a single changed bucket"
+    assert widget.chart.animationOptions() == QChart.NoAnimation
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+    data = monthly_data()
+    widget = BarChartWidgetWithTwoDataSets(*data)
+    widget.resize(1200, 600)
+    widget.show()
+    app.processEvents()
+    check_axis_kept(widget, data)
+
+    same_buckets = {
+        "same data": lambda repeat: data,
+        "one bucket changed": lambda repeat: one_bucket_changed(data, repeat),
+        "every value changed": lambda repeat: monthly_data(seed_value=repeat + 1),
+    }
+    scenarios = {
+        **same_buckets,
+        "one bucket in or out": lambda repeat: monthly_data(BUCKETS + 1 - repeat % 2),
+    }
+    results = {
+        "full rebuild": time_updates(app, widget, full_rebuild, scenarios),
+        "update_chart": time_updates(app, widget, BarChartWidgetWithTwoDataSets.update_chart, scenarios),
+    }
+
+    print(f"{'scenario':<22}" + "".join(f"{mode:>16}" for mode in results) + "  (ms)")
+    for label in scenarios:
+        print(f"{label:<22}" + "".join(f"{times[label]:>16.1f}" for times in results.values()))
+    for label in same_buckets:
+        ms = results["update_chart"][label]
+        assert ms <= BUDGET_MS, f"update_chart ({label}) took {ms:.1f} ms, budget {BUDGET_MS} ms"
+
+
+if __name__ == "__main__":
+    main()
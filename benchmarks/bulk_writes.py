@@ -0,0 +1,91 @@
+"""
+Throughput of create_many / update_many / delete_many against the
+row-by-row create path. Also checks that delete_many keeps a category
+whose incomes cannot be deleted, and audits the others as delete does.
+
+    python -m benchmarks.bulk_writes
+"""
+import benchmarks  # noqa: F401  (selects the throw-away database)
+
+import random
+from datetime import timedelta
+
+from sqlalchemy import text
+
+from benchmarks.fixtures import PERIOD_START, seed, timed
+from controllers.income_controller import IncomeCategoryController, IncomeController
+from database.database import engine, session_scope
+from models.audit_model import AuditLog
+
+SIZES = (10_000, 100_000)
+SINGLE_CREATES = 1_000
+
+
+def make_rows(count, rng):
+    return [
+        {
+            "amount": rng.randint(1, 500) * 100,
+            "date": PERIOD_START + timedelta(days=rng.randrange(365)),
+            "description": f"Import n°{i}",
+            "category_id": rng.randint(1, 20),
+        }
+        for i in range(count)
+    ]
+
+
+def check_cascade_failure():
+    """delete_many keeps the categories whose incomes fail to delete."""
+    seed(rows_per_kind=1_000)
+    controller = IncomeCategoryController()
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TRIGGER keep_category_1 BEFORE DELETE ON incomes WHEN old.category_id = 1 "
+            "BEGIN SELECT RAISE(ABORT, 'kept'); END"
+        ))
+    try:
+        result = controller.delete_many([1, 2, 3])
+    finally:
+        with engine.begin() as connection:
+            connection.execute(text("DROP TRIGGER keep_category_1"))
+    assert result.succeeded == [2, 3], result
+    assert [id_ for id_, _ in result.failed] == [1], result
+    with session_scope() as session:
+        assert controller.get_by_id(1) is not None
+        descriptions = dict(session.query(AuditLog.record_id, AuditLog.description).filter(
+            AuditLog.table_name == "income_categories", AuditLog.action == "delete"
+        ))
+    # Même description que `delete` : les valeurs de l'enregistrement, pas seulement son id.
+    assert sorted(descriptions) == [2, 3], descriptions
+    assert all(f"id={id_}, title=" in descriptions[id_] for id_ in descriptions), descriptions
+    print("delete_many keeps the categories whose incomes fail to delete")
+
+
+def main():
+    rng = random.Random(7)
+    controller = IncomeController()
+
+    seed(rows_per_kind=0)
+    results = {}
+    with timed("create", results):
+        for row in make_rows(SINGLE_CREATES, rng):
+            controller.create(**row)
+    print(f"create x{SINGLE_CREATES:<8}{SINGLE_CREATES / results['create'] * 1000:>12,.0f} rows/s")
+
+    for size in SIZES:
+        seed(rows_per_kind=0)
+        rows = make_rows(size, rng)
+        results = {}
+        with timed("create_many", results):
+            created = controller.create_many(rows).succeeded
+        with timed("update_many", results):
+            controller.update_many({id_: {"amount": 100} for id_ in created})
+        with timed("delete_many", results):
+            controller.delete_many(created)
+        for label, ms in results.items():
+            print(f"{label} x{size:<8}{size / ms * 1000:>12,.0f} rows/s")
+
+    check_cascade_failure()
+
+
+if __name__ == "__main__":
+    main()
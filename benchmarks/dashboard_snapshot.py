@@ -0,0 +1,104 @@
+"""
+Statements and time for one dashboard refresh: the controller properties
+against DashboardService.snapshot. Exits with an AssertionError when the
+snapshot needs more than EXPECTED_STATEMENTS queries or disagrees with the
+controllers, with every category and cut to TOP_N categories, including
+when a category kept in the top is titled like the remainder row.
+
+    python -m benchmarks.dashboard_snapshot
+"""
+import benchmarks  # noqa: F401  (selects the throw-away database)
+
+from benchmarks.fixtures import seed, timed
+from benchmarks.session_reuse import refresh_dashboard
+from controllers.dashboard_service import DashboardService
+from controllers.expense_controller import ExpenseController
+from controllers.income_controller import IncomeController
+from database.database import session_scope
+from database.query_plan import capture_statements
+from database.top_categories import REMAINDER_LABEL
+from models import IncomeCategoryModel
+
+EXPECTED_STATEMENTS = 1
+TOP_N = 5
+TRANSACTION_CONTROL = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE")
+
+
+def count_queries(func):
+    with capture_statements() as statements:
+        func()
+    return sum(not statement.lstrip().upper().startswith(TRANSACTION_CONTROL) for statement, _ in statements)
+
+
+def check_top_n():
+    snapshot = DashboardService(top_n=TOP_N).snapshot()
+    income_controller, expense_controller = IncomeController(), ExpenseController()
+    with session_scope():
+        income_by_category = income_controller.get_totals_by_category(top_n=TOP_N)
+        expense_by_category = expense_controller.get_totals_by_category(top_n=TOP_N)
+        assert snapshot.income_by_category == tuple(map(tuple, income_by_category))
+        assert snapshot.expense_by_category == tuple(map(tuple, expense_by_category))
+        assert len(income_by_category) == TOP_N + 1 and income_by_category[-1].is_remainder
+        assert sum(row.total_amount for row in income_by_category) == income_controller.get_total_income
+
+
+def check_remainder_title():
+    """Title the largest income category like the remainder row, then check top_n."""
+    with session_scope() as session:
+        largest = IncomeController().get_totals_by_category(top_n=1)[0].category
+        category = session.query(IncomeCategoryModel).filter_by(title=largest).one()
+        category.title = REMAINDER_LABEL
+        session.commit()
+    try:
+        check_top_n()
+        snapshot = DashboardService(top_n=TOP_N).snapshot()
+        remainders = [row for row in snapshot.income_by_category if row.is_remainder]
+        assert len(remainders) == 1 and snapshot.income_by_category[-1] is remainders[0]
+        assert snapshot.income_by_category[0] == (REMAINDER_LABEL, snapshot.income_by_category[0].total_amount, False)
+    finally:
+        with session_scope() as session:
+            session.query(IncomeCategoryModel).filter_by(title=REMAINDER_LABEL).one().title = largest
+            session.commit()
+
+
+def check_snapshot():
+    service = DashboardService()
+    snapshot = service.snapshot()
+    queries = count_queries(service.snapshot)
+    assert queries == EXPECTED_STATEMENTS, f"snapshot ran {queries} queries, expected {EXPECTED_STATEMENTS}"
+    check_top_n()
+    check_remainder_title()
+
+    income_controller, expense_controller = IncomeController(), ExpenseController()
+    with session_scope():
+        assert snapshot.total_income == income_controller.get_total_income
+        assert snapshot.total_expense == expense_controller.get_total_expense
+        assert snapshot.income_by_category == tuple(map(tuple, income_controller.get_income_by_category))
+        assert snapshot.expense_by_category == tuple(map(tuple, expense_controller.get_expense_by_category))
+        assert snapshot.income_by_month == tuple(map(tuple, income_controller.get_income_by_month))
+        assert snapshot.expense_by_month == tuple(map(tuple, expense_controller.get_expense_by_month))
+    return queries
+
+
+def main():
+    seed(rows_per_kind=20_000)
+    service = DashboardService()
+    results = {}
+
+    queries = {
+        "controller properties": count_queries(refresh_dashboard),
+        "DashboardService.snapshot": check_snapshot(),
+    }
+    with timed("controller properties", results):
+        with session_scope():
+            refresh_dashboard()
+    with timed("DashboardService.snapshot", results):
+        service.snapshot()
+
+    print(f"{'mode':<28}{'queries':>8}{'ms':>10}")
+    for label, ms in results.items():
+        print(f"{label:<28}{queries[label]:>8}{ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
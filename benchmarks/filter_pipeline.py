@@ -0,0 +1,108 @@
+"""
+Typing a search in the 100k-income list, headless (offscreen Qt platform):
+the debounced background filters of CustomTableView against filtering
+synchronously on every keystroke, as the search bar used to.
+
+Keystrokes are KEY_INTERVAL_MS apart. For both, the time the GUI thread is
+blocked per keystroke, the number of searches run and the time until the
+final rows are shown are reported. Exits with an AssertionError when a
+keystroke blocks the GUI thread more than BUDGET_MS, when more than one
+search runs for the whole burst, when the rows shown are not those of
+the last text, or when a refresh (as after a create, edit or delete) drops
+the search while the cancel button does not clear it.
+
+    python -m benchmarks.filter_pipeline
+"""
+import benchmarks  # noqa: F401  (selects the throw-away database)
+
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from benchmarks.fixtures import seed
+from controllers.income_controller import IncomeController
+from imports import QApplication
+from models import IncomeModel
+from pyside6_custom_widgets.table_view import FILTER_DELAY_MS, CustomTableView
+
+ROWS = 100_000
+TEXT = "Vente de marchandises n°12"
+KEY_INTERVAL_MS = 60
+BUDGET_MS = 50
+
+
+class CountingIncomeController(IncomeController):
+    """IncomeController counting its searches, i.e. the first pages it reads."""
+
+    searches = 0
+
+    def query_page(self, spec=None, order_key_after=None, *args, **kwargs):
+        if order_key_after is None:
+            type(self).searches += 1
+        return super().query_page(spec, order_key_after, *args, **kwargs)
+
+
+def wait(app, ms):
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        app.processEvents()
+        time.sleep(0.001)
+
+
+def type_text(app, view, synchronous):
+    """Type TEXT; return the longest keystroke (ms) and the time to the final rows (ms)."""
+    view.search_bar.line_edit.clear()
+    view.update_pagination()
+    CountingIncomeController.searches = 0
+    longest = 0
+    for length in range(1, len(TEXT) + 1):
+        start = time.perf_counter()
+        view.search_bar.line_edit.setText(TEXT[:length])
+        if synchronous:
+            view.filter_debouncer.cancel()
+            view.update_pagination()
+        app.processEvents()
+        longest = max(longest, (time.perf_counter() - start) * 1000)
+        wait(app, KEY_INTERVAL_MS)
+
+    start = time.perf_counter()
+    while view.filter_debouncer.is_pending() or view.filter_runner.is_running():
+        app.processEvents()
+        time.sleep(0.001)
+    app.processEvents()
+    return longest, (time.perf_counter() - start) * 1000
+
+
+def main():
+    seed(rows_per_kind=ROWS)
+    app = QApplication.instance() or QApplication([])
+    controller = CountingIncomeController()
+    view = CustomTableView(IncomeModel, controller, enable_pagination=False)
+    view.resize(1200, 800)
+    view.show()
+    app.processEvents()
+    expected = controller.search_text(TEXT)
+
+    results = {}
+    for label, synchronous in ((f"debounced ({FILTER_DELAY_MS} ms)", False), ("filter on every keystroke", True)):
+        longest, settle = type_text(app, view, synchronous)
+        results[label] = (longest, CountingIncomeController.searches, settle)
+        assert view.table_model.total == len(expected), (label, view.table_model.total, len(expected))
+
+    view.refresh_data()
+    assert view.table_model.total == len(expected), ("refresh", view.table_model.total, len(expected))
+    view.cancel_filters()
+    assert view.search_bar.get_text() == "" and view.table_model.total == ROWS, ("cancel", view.table_model.total)
+
+    print(f"{len(TEXT)} keystrokes, {KEY_INTERVAL_MS} ms apart, {ROWS:,} incomes")
+    print(f"{'':<28}{'longest key (ms)':>18}{'searches':>10}{'settle (ms)':>13}")
+    for label, (longest, searches, settle) in results.items():
+        print(f"{label:<28}{longest:>18.1f}{searches:>10}{settle:>13.1f}")
+    longest, searches, _ = results[f"debounced ({FILTER_DELAY_MS} ms)"]
+    assert searches == 1, f"{searches} searches run for one burst of keystrokes"
+    assert longest <= BUDGET_MS, f"a keystroke blocked the GUI thread {longest:.1f} ms, budget {BUDGET_MS} ms"
+
+
+if __name__ == "__main__":
+    main()
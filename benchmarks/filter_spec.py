@@ -0,0 +1,114 @@
+"""
+Combined filters of the 100k-income list: one FilterSpec (text, category,
+date range, amount range and sort) compiled by BaseController.query_page
+into a single statement, against the separate queries the table widget
+used to run, one per filter widget (`search_text`,
+`get_filter_by_category_id`, `get_filter_by_period`), each returning every
+matching record and discarding the other filters. For the old queries, the
+time to combine their results in Python is included.
+
+Exits with an AssertionError when the spec does not return the records
+matching every filter in the requested order with their count and amount
+total, when its first page is not at least MIN_SPEEDUP times faster, or
+when totals computed while another thread commits a write are cached.
+
+    python -m benchmarks.filter_spec
+"""
+import benchmarks  # noqa: F401  (selects the throw-away database)
+
+import threading
+from datetime import date
+
+from benchmarks.fixtures import seed, timed
+from controllers.base_controller import FilterSpec
+from controllers.income_controller import IncomeController
+from models.money import Money
+from pyside6_custom_widgets.table_model import FETCH_CHUNK
+
+ROWS = 100_000
+MIN_SPEEDUP = 5
+SPEC = FilterSpec(
+    text="Vente",
+    equals=(("category_id", 1),),
+    date_range=(date(2024, 3, 1), date(2024, 8, 31)),
+    amount_range=(250, None),
+    sort=(("amount", True),),
+)
+
+
+def separate_queries(controller):
+    """Run one query per filter, as the widget did, and combine the results."""
+    start_date, end_date = SPEC.date_range
+    minimum, _ = SPEC.amount_range
+    by_text = controller.search_text(SPEC.text, period=SPEC.date_range)
+    by_category = {record.id for record in controller.get_filter_by_category_id(dict(SPEC.equals)["category_id"])}
+    by_period = {record.id for record in controller.get_filter_by_period(start_date, end_date)}
+    records = [
+        record
+        for record in by_text
+        if record.id in by_category and record.id in by_period and record.amount >= Money.from_major(minimum)
+    ]
+    records.sort(key=lambda record: (-record.amount.minor, -record.id))
+    return records, sum((record.amount for record in records), Money())
+
+
+def check_write_during_totals(controller):
+    """Totals read while another thread commits a write must not stay cached."""
+    compute = controller._compute_totals
+
+    def compute_then_write(spec):
+        totals = compute(spec)
+        # L'écriture est validée entre la requête et la mise en cache.
+        writer = threading.Thread(
+            target=IncomeController().create,
+            kwargs={"amount": 100, "date": date(2024, 5, 1), "description": "Vente", "category_id": 1},
+        )
+        writer.start()
+        writer.join()
+        return totals
+
+    controller._compute_totals = compute_then_write
+    try:
+        stale, _ = controller.totals()
+    finally:
+        del controller._compute_totals
+    fresh, _ = controller.totals()
+    assert fresh == stale + 1, (stale, fresh)
+
+
+def main():
+    seed(rows_per_kind=ROWS)
+    controller = IncomeController()
+    controller._invalidate_counts()
+    results = {}
+
+    with timed("separate queries, combined in Python", results):
+        expected, expected_total = separate_queries(controller)
+    with timed("FilterSpec, first page and totals", results):
+        page = controller.query_page(SPEC, limit=FETCH_CHUNK, snapshots=True)
+    controller._invalidate_counts()
+    with timed("FilterSpec, every page", results):
+        records = []
+        key = None
+        while True:
+            page = controller.query_page(SPEC, key, FETCH_CHUNK)
+            records.extend(page.rows)
+            key = page.next_key
+            if key is None:
+                break
+
+    assert [record.id for record in records] == [record.id for record in expected], "the spec must apply every filter"
+    assert page.total == len(expected), (page.total, len(expected))
+    assert page.amount_total == expected_total, (page.amount_total, expected_total)
+
+    print(f"{ROWS:,} incomes, {len(expected):,} matching {SPEC}")
+    for label, ms in results.items():
+        print(f"{label:<40}{ms:>10.1f} ms")
+    speedup = results["separate queries, combined in Python"] / results["FilterSpec, first page and totals"]
+    assert speedup >= MIN_SPEEDUP, f"first page only {speedup:.1f}x faster than the separate queries"
+
+    check_write_during_totals(controller)
+
+
+if __name__ == "__main__":
+    main()
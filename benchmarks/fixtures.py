@@ -0,0 +1,105 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlalchemy import insert
+
+from controllers.audit_writer import audit_writer
+from database.create_db import upgrade_database
+from database.database import engine
+from models.user import User
+from models.audit_model import AuditLog
+from models import (
+    CashBoxPeriod,
+    ExpenseCategoryModel,
+    ExpenseModel,
+    IncomeCategoryModel,
+    IncomeModel,
+)
+from utils.utils import read_id_from_file
+
+PERIOD_START = date(2024, 1, 1)
+PERIOD_END = date(2024, 12, 31)
+
+DESCRIPTIONS = [
+    "Facture d'électricité",
+    "Achat de fournitures de bureau",
+    "Loyer du local",
+    "Réparation du véhicule",
+    "Vente de marchandises",
+    "Cotisation des membres",
+    "Frais de téléphone",
+    "Prestation de service",
+]
+
+
+def create_schema():
+    """Recreate the benchmark database from the Alembic migrations."""
+    # Le journal en attente doit être écrit avant que les fichiers ne disparaissent.
+    audit_writer.shutdown()
+    engine.dispose()
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{engine.url.database}{suffix}").unlink(missing_ok=True)
+    upgrade_database()
+
+
+def seed(rows_per_kind=10_000, categories=20, seed_value=42):
+    """
+    Fill the benchmark database with a cash box period and random ledger rows.
+
+    The period gets the id stored in `current_period_data.ksb` so controllers
+    pick it up as the active period.
+
+    Args:
+        rows_per_kind (int): Number of incomes and of expenses to insert.
+        categories (int): Number of categories for each kind.
+        seed_value (int): Seed of the random generator.
+    """
+    create_schema()
+    rng = random.Random(seed_value)
+    days = (PERIOD_END - PERIOD_START).days + 1
+    with engine.begin() as conn:
+        conn.execute(
+            insert(CashBoxPeriod),
+            [
+                {
+                    "id": read_id_from_file(),
+                    "start_date": PERIOD_START,
+                    "end_date": PERIOD_END,
+                    "initial_amount": 100_000,
+                    "is_open": "Ouvert",
+                }
+            ],
+        )
+        for category_model, ledger_model in (
+            (IncomeCategoryModel, IncomeModel),
+            (ExpenseCategoryModel, ExpenseModel),
+        ):
+            conn.execute(
+                insert(category_model),
+                [{"id": i, "title": f"Catégorie {i}"} for i in range(1, categories + 1)],
+            )
+            if not rows_per_kind:
+                continue
+            conn.execute(
+                insert(ledger_model),
+                [
+                    {
+                        "amount": rng.randint(1, 500) * 100,
+                        "date": PERIOD_START + timedelta(days=rng.randrange(days)),
+                        "description": f"{rng.choice(DESCRIPTIONS)} n°{i}",
+                        "category_id": rng.randint(1, categories),
+                    }
+                    for i in range(rows_per_kind)
+                ],
+            )
+
+
+@contextmanager
+def timed(label, results):
+    """Record the wall time of the block in `results[label]` (milliseconds)."""
+    start = time.perf_counter()
+    yield
+    results[label] = (time.perf_counter() - start) * 1000
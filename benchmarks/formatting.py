@@ -0,0 +1,102 @@
+"""
+Formatting of numbers, amounts and dates: utils/formatting.py against direct
+babel calls (format_decimal, format_currency) and strftime.
+
+The compiled formats are first checked against babel on random floats,
+Decimals and Money values. Then a 100k-cell column is timed: amounts drawn
+from 500 distinct values, as in a real ledger, and dates over one year.
+Exits with an AssertionError on the first output that differs from babel,
+or when format_column is less than MIN_SPEEDUP times faster than babel.
+
+    python -m benchmarks.formatting
+"""
+import benchmarks  # noqa: F401  (selects the throw-away database)
+
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from babel.numbers import format_currency, format_decimal
+
+from benchmarks.fixtures import PERIOD_START, timed
+from models import Money
+from utils.formatting import (
+    CURRENCY,
+    LOCALE,
+    NumberFormat,
+    format_amount,
+    format_column,
+    format_date,
+    format_number,
+)
+
+CELLS = 100_000
+PARITY_VALUES = 20_000
+MIN_SPEEDUP = 5
+
+
+def babel_number(value):
+    return format_decimal(value.to_decimal() if isinstance(value, Money) else value, locale=LOCALE)
+
+
+def babel_amount(value):
+    return format_currency(value.to_decimal() if isinstance(value, Money) else value, currency=CURRENCY, locale=LOCALE)
+
+
+def check_parity(rng):
+    values = [0, -0.0004, 0.0005, 2.675, 10**20, Decimal("-0"), Money(-5), float("inf")]
+    values += [rng.uniform(-1e7, 1e7) for _ in range(PARITY_VALUES // 3)]
+    values += [Decimal(rng.randint(-10**9, 10**9)).scaleb(-rng.randint(0, 5)) for _ in range(PARITY_VALUES // 3)]
+    values += [Money(rng.randint(-10**9, 10**9)) for _ in range(PARITY_VALUES // 3)]
+    # Formats sans mémoire : chaque valeur passe par le code compilé.
+    number, amount = NumberFormat(format_number.pattern, cache_size=0), NumberFormat(
+        format_amount.pattern, currency=CURRENCY, cache_size=0
+    )
+    for value in values:
+        assert number(value) == babel_number(value), (value, number(value), babel_number(value))
+        assert amount(value) == babel_amount(value), (value, amount(value), babel_amount(value))
+    return len(values)
+
+
+def main():
+    rng = random.Random(42)
+    checked = check_parity(rng)
+    print(f"{checked} values formatted like babel")
+
+    amounts = [Money(rng.randint(1, 500) * 10_000) for _ in range(CELLS)]
+    days = [PERIOD_START + timedelta(days=rng.randrange(366)) for _ in range(CELLS)]
+    results = {}
+    with timed("babel format_decimal per cell", results):
+        expected = [babel_number(value) for value in amounts]
+    with timed("format_number per cell (cold)", results):
+        format_number._cached.cache_clear()
+        formatted = [format_number(value) for value in amounts]
+    assert formatted == expected
+    with timed("format_column (cold)", results):
+        format_number._cached.cache_clear()
+        formatted = format_column(amounts, format_number)
+    assert formatted == expected
+    with timed("format_column (warm)", results):
+        format_column(amounts, format_number)
+    with timed("babel format_currency per cell", results):
+        expected = [babel_amount(value) for value in amounts]
+    with timed("format_column amounts (cold)", results):
+        format_amount._cached.cache_clear()
+        formatted = format_column(amounts, format_amount)
+    assert formatted == expected
+    with timed("strftime per cell", results):
+        expected = [day.strftime("%d/%m/%Y") for day in days]
+    with timed("format_column dates (cold)", results):
+        format_date.cache_clear()
+        formatted = format_column(days, format_date)
+    assert formatted == expected
+
+    print(f"{'':<34}{'ms':>10}   ({CELLS} cells)")
+    for label, ms in results.items():
+        print(f"{label:<34}{ms:>10.1f}")
+    speedup = results["babel format_decimal per cell"] / results["format_column (cold)"]
+    assert speedup >= MIN_SPEEDUP, f"format_column only {speedup:.1f}x faster than babel"
+
+
+if __name__ == "__main__":
+    main()
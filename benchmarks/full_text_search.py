@@ -0,0 +1,52 @@
+"""
+Searching descriptions: LIKE '%x%' (search_text) against the FTS5 index.
+Exits with an AssertionError when search_text misses accented capitals
+("électr" must find "ÉLECTRICITÉ", "équipement" a category "Équipement").
+
+    python -m benchmarks.full_text_search
+"""
+import benchmarks  # noqa: F401  (selects the throw-away database)
+
+from benchmarks.fixtures import seed, timed
+from datetime import date
+
+from controllers.income_controller import IncomeCategoryController, IncomeController
+
+ROWS = 200_000
+QUERIES = ["réparation", "reparation vehic", "électr", "n°12345"]
+
+
+def check_accented_capitals(controller):
+    """search_text folds accented capitals in descriptions and category titles."""
+    created = controller.create(amount=100, date=date(2024, 5, 1), description="ÉLECTRICITÉ du local", category_id=1)
+    IncomeCategoryController().update(1, title="Équipement")
+    by_description = controller.search_text("électricité du", columns=["description"])
+    assert [record.id for record in by_description] == [created.id], by_description
+    by_category = controller.search_text("équipement", columns=["category_id"])
+    assert by_category and all(record.category_id == 1 for record in by_category), len(by_category)
+
+
+def main():
+    seed(rows_per_kind=ROWS)
+    controller = IncomeController()
+    results, found = {}, {}
+
+    for query in QUERIES:
+        label = f"search_text({query!r})"
+        with timed(label, results):
+            found[label] = len(controller.search_text(query, columns=["description"]))
+        label = f"full_text_search({query!r})"
+        with timed(label, results):
+            found[label] = len(controller.full_text_search(query, limit=50))
+
+    # search_text ignore la casse mais pas les accents : "reparation" ne
+    # trouve pas "Réparation".
+    print(f"{ROWS:,} incomes")
+    for label, ms in results.items():
+        print(f"{label:<42}{ms:>10.1f} ms{found[label]:>10,} rows")
+
+    check_accented_capitals(controller)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Opening a 500k-row list: get_all against keyset pagination.
+
+    python -m benchmarks.keyset_pagination
+"""
+import benchmarks  # noqa: F401  (selects the throw-away database)
+
+from benchmarks.fixtures import seed, timed
+from controllers.income_controller import IncomeController
+
+ROWS = 500_000
+PAGE_SIZE = 50
+
+
+def main():
+    seed(rows_per_kind=ROWS)
+    controller = IncomeController()
+    results = {}
+
+    with timed("get_all + slice first page", results):
+        controller.get_all()[:PAGE_SIZE]
+    with timed("get_page first page (count not cached)", results):
+        page = controller.get_page(limit=PAGE_SIZE)
+    with timed("get_page next page (count cached)", results):
+        controller.get_page(page.next_key, limit=PAGE_SIZE)
+
+    # Page située au milieu de la liste : le coût reste celui d'une page.
+    middle_key = controller.get_page(limit=ROWS // 2).next_key
+    with timed("get_page at row 250k", results):
+        controller.get_page(middle_key, limit=PAGE_SIZE)
+
+    print(f"{ROWS:,} incomes, {page.total:,} in the current period")
+    for label, ms in results.items():
+        print(f"{label:<42}{ms:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Check that every hot controller query on incomes/expenses is served by an
+index. Exits with an AssertionError naming the offending statement.
+
+    python -m benchmarks.query_plans
+"""
+import benchmarks  # noqa: F401  (selects the throw-away database)
+
+from benchmarks.fixtures import PERIOD_END, PERIOD_START, seed
+from controllers.base_controller import FilterSpec
+from controllers.expense_controller import ExpenseController
+from controllers.income_controller import IncomeController
+from database.query_plan import capture_statements, explain_query_plan, full_table_scans
+
+LEDGER_TABLES = {"incomes", "expenses"}
+
+
+def hot_queries(controller):
+    kind = "income" if isinstance(controller, IncomeController) else "expense"
+    return {
+        "get_all": controller.get_all,
+        "get_filter_by_category_id": lambda: controller.get_filter_by_category_id(1),
+        "get_filter_by_period": lambda: controller.get_filter_by_period(PERIOD_START, PERIOD_END),
+        "query_page(FilterSpec)": lambda: controller.query_page(
+            FilterSpec(text="Vente", equals=(("category_id", 1),), amount_range=(250, None), sort=(("amount", True),))
+        ),
+        f"get_total_{kind}": lambda: getattr(controller, f"get_total_{kind}"),
+        f"get_{kind}_by_category": lambda: getattr(controller, f"get_{kind}_by_category"),
+        "get_totals_by_category(top_n=5)": lambda: controller.get_totals_by_category(top_n=5),
+        f"get_{kind}_by_month": lambda: getattr(controller, f"get_{kind}_by_month"),
+    }
+
+
+def check_query_plans():
+    for controller in (IncomeController(), ExpenseController()):
+        for name, call in hot_queries(controller).items():
+            with capture_statements() as statements:
+                call()
+            for statement, parameters in statements:
+                if not any(table in statement for table in LEDGER_TABLES):
+                    continue
+                plan = explain_query_plan(statement, parameters)
+                scans = full_table_scans(plan, LEDGER_TABLES)
+                assert not scans, f"{type(controller).__name__}.{name} scans {scans}:\n{statement}"
+            print(f"ok  {type(controller).__name__}.{name}")
+
+
+if __name__ == "__main__":
+    seed(rows_per_kind=5_000)
+    check_query_plans()
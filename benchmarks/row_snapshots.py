@@ -0,0 +1,80 @@
+"""
+Rows of a 100k-income list: model instances read cell by cell as
+CustomTableWidget.get_column_value does (getattr, column info lookup and
+`category` relationship per cell) against the row snapshots of
+BaseController.get_page(snapshots=True), with the category label joined in
+SQL. Times loading and reading every cell, and measures the memory the
+loaded rows keep alive (tracemalloc).
+
+Exits with an AssertionError when a snapshot cell differs from the
+instance cell, when snapshots are slower to load and read, or when they
+are not at least MIN_MEMORY_RATIO times smaller than the instances.
+
+    python -m benchmarks.row_snapshots
+"""
+import benchmarks  # noqa: F401  (selects the throw-away database)
+
+import gc
+import tracemalloc
+from types import SimpleNamespace
+
+from benchmarks.fixtures import seed, timed
+from controllers.income_controller import IncomeController
+from models import IncomeModel, display_columns
+from pyside6_custom_widgets.table_widget import CustomTableWidget
+
+ROWS = 100_000
+MIN_MEMORY_RATIO = 2.5
+
+
+def load(controller, snapshots):
+    """Load every row; return them with the memory they retain (bytes)."""
+    gc.collect()
+    tracemalloc.start()
+    rows = controller.get_page(limit=ROWS, snapshots=snapshots).rows
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return rows, retained
+
+
+def main():
+    seed(rows_per_kind=ROWS)
+    controller = IncomeController()
+    columns = [column.name for column in display_columns(IncomeModel)]
+    # get_column_value n'utilise que self.model.
+    widget = SimpleNamespace(model=IncomeModel)
+    results = {}
+
+    with timed("load instances", results):
+        controller.get_page(limit=ROWS)
+    with timed("load snapshots", results):
+        controller.get_page(limit=ROWS, snapshots=True)
+
+    instances, instances_memory = load(controller, snapshots=False)
+    snapshots, snapshots_memory = load(controller, snapshots=True)
+    assert len(instances) == len(snapshots) == ROWS
+
+    with timed("read cells of instances", results):
+        instance_cells = [
+            [CustomTableWidget.get_column_value(widget, instance, column) for column in columns]
+            for instance in instances
+        ]
+    with timed("read cells of snapshots", results):
+        snapshot_cells = [list(snapshot) for snapshot in snapshots]
+    assert instance_cells == snapshot_cells, "snapshots must hold the displayed values"
+
+    print(f"{ROWS:,} incomes")
+    for label, ms in results.items():
+        print(f"{label:<32}{ms:>10.1f} ms")
+    print(f"{'memory of instances':<32}{instances_memory / 2**20:>10.1f} MiB")
+    print(f"{'memory of snapshots':<32}{snapshots_memory / 2**20:>10.1f} MiB")
+    instances_ms = results["load instances"] + results["read cells of instances"]
+    snapshots_ms = results["load snapshots"] + results["read cells of snapshots"]
+    assert snapshots_ms < instances_ms, "snapshots must be faster to load and read"
+    ratio = instances_memory / snapshots_memory
+    assert ratio >= MIN_MEMORY_RATIO, f"snapshots only {ratio:.1f}x smaller than instances"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Connection checkouts and ORM loads for one dashboard refresh, with and
+without a shared unit of work.
+
+    python -m benchmarks.session_reuse
+"""
+import benchmarks  # noqa: F401  (selects the throw-away database)
+
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper
+
+from benchmarks.fixtures import seed, timed
+from controllers.cash_box_controller import CashBoxPeriodController
+from controllers.expense_controller import ExpenseController
+from controllers.income_controller import IncomeController
+from database.database import engine, session_scope
+
+
+class Counters:
+    def __init__(self):
+        self.checkouts = 0
+        self.loads = 0
+
+    def on_checkout(self, *args):
+        self.checkouts += 1
+
+    def on_load(self, *args):
+        self.loads += 1
+
+
+def refresh_dashboard():
+    """The controller calls made by MainWindow.refresh_dashboard."""
+    income_controller = IncomeController()
+    expense_controller = ExpenseController()
+    period_controller = CashBoxPeriodController()
+    period_controller.get_initial_balance
+    income_controller.get_total_income
+    expense_controller.get_total_expense
+    income_controller.get_income_by_category
+    expense_controller.get_expense_by_category
+    income_controller.get_income_by_month
+    expense_controller.get_expense_by_month
+
+
+def measure(label, func, results):
+    counters = Counters()
+    event.listen(engine, "checkout", counters.on_checkout)
+    event.listen(Mapper, "load", counters.on_load)
+    try:
+        with timed(label, results):
+            func()
+    finally:
+        event.remove(engine, "checkout", counters.on_checkout)
+        event.remove(Mapper, "load", counters.on_load)
+    return counters
+
+
+def main():
+    seed(rows_per_kind=20_000)
+    timings = {}
+
+    def scoped():
+        with session_scope():
+            refresh_dashboard()
+
+    rows = [
+        ("session per call", measure("session per call", refresh_dashboard, timings)),
+        ("one unit of work", measure("one unit of work", scoped, timings)),
+    ]
+    print(f"{'mode':<20}{'checkouts':>10}{'loads':>8}{'ms':>10}")
+    for label, counters in rows:
+        print(f"{label:<20}{counters.checkouts:>10}{counters.loads:>8}{timings[label]:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
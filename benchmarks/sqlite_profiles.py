@@ -0,0 +1,77 @@
+"""
+Bulk inserts and dashboard aggregates under each SQLite profile. Also
+checks that malformed `sqlite_pragmas` values (null, lists) are ignored
+instead of stopping the application.
+
+    python -m benchmarks.sqlite_profiles
+"""
+import benchmarks  # noqa: F401  (selects the throw-away database)
+
+from datetime import date
+
+from sqlalchemy import create_engine, event, insert
+
+from benchmarks.fixtures import seed, timed
+from benchmarks.session_reuse import refresh_dashboard
+from controllers.income_controller import IncomeController
+from database.database import DATABASE_URL, SessionLocal, engine, session, session_scope
+from database.sqlite_profile import DEFAULT_PROFILE, SQLITE_PROFILES, apply_sqlite_profile, resolve_sqlite_profile
+from models import IncomeModel
+
+SINGLE_INSERTS = 300
+BULK_ROWS = 50_000
+ROWS = 20_000
+
+
+def profiled_engine(name):
+    profiled = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+    event.listen(
+        profiled,
+        "connect",
+        lambda dbapi_connection, _: apply_sqlite_profile(dbapi_connection, SQLITE_PROFILES[name]),
+    )
+    return profiled
+
+
+def run(name):
+    results = {}
+    profiled = profiled_engine(name)
+    SessionLocal.configure(bind=profiled)
+    session.remove()
+    try:
+        rows = [
+            {"amount": 1000, "date": date(2024, 6, 1), "description": f"n°{i}", "category_id": 1}
+            for i in range(BULK_ROWS)
+        ]
+        with timed(f"bulk insert x{BULK_ROWS}", results):
+            with profiled.begin() as connection:
+                connection.execute(insert(IncomeModel), rows)
+        controller = IncomeController()
+        with timed(f"create x{SINGLE_INSERTS}", results):
+            for i in range(SINGLE_INSERTS):
+                controller.create(amount=1000, date=date(2024, 6, 1), description=f"n°{i}", category_id=1)
+        with timed("dashboard", results):
+            with session_scope():
+                refresh_dashboard()
+    finally:
+        profiled.dispose()
+        SessionLocal.configure(bind=engine)
+    return results
+
+
+def check_malformed_pragmas():
+    pragmas = resolve_sqlite_profile({"sqlite_pragmas": {"cache_size": None, "mmap_size": [1], "busy_timeout": "100"}})
+    assert pragmas == dict(SQLITE_PROFILES[DEFAULT_PROFILE], busy_timeout=100), pragmas
+
+
+def main():
+    check_malformed_pragmas()
+    for name in SQLITE_PROFILES:
+        seed(rows_per_kind=ROWS)
+        engine.dispose()
+        results = run(name)
+        print(f"{name:<10}" + "".join(f"{label:>22}: {ms:8.1f} ms" for label, ms in results.items()))
+
+
+if __name__ == "__main__":
+    main()
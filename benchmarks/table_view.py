@@ -0,0 +1,128 @@
+"""
+Opening, scrolling and filtering the income list at 10k, 100k and 1M rows,
+headless (offscreen Qt platform): CustomTableView, which fetches rows chunk
+by chunk, against CustomTableWidget, which creates an item per cell. The
+row buttons of both are painted by ActionButtonsDelegate. Each step is timed
+until the table is painted once.
+
+The item-based widget, which reads and formats every row up front, is only
+timed at BASELINE_ROWS. Exits with an AssertionError when opening the view
+takes more than BUDGET_MS, or when a scroll loads more than one chunk or
+creates widgets. The category filter is timed until its debounced query
+has run and the table is painted. Seeding a million incomes and as many expenses takes
+several minutes.
+
+    python -m benchmarks.table_view
+"""
+import benchmarks  # noqa: F401  (selects the throw-away database)
+
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from benchmarks.fixtures import seed, timed
+from controllers.income_controller import IncomeController
+from imports import QApplication, QEvent, QWidget
+from models import IncomeModel
+from pyside6_custom_widgets.combobox_3 import ComboBox
+from pyside6_custom_widgets.table_view import CustomTableView
+from pyside6_custom_widgets.table_widget import CustomTableWidget
+
+SIZES = (10_000, 100_000, 1_000_000)
+BASELINE_ROWS = 10_000
+BUDGET_MS = 500
+
+
+def open_table(app, table_class, controller):
+    table = table_class(IncomeModel, controller, enable_pagination=False)
+    table.resize(1200, 800)
+    table.show()
+    app.processEvents()
+    table.grab()
+    return table
+
+
+def repaint(app, table):
+    app.processEvents()
+    table.grab()
+
+
+def settle(app, view):
+    """Wait for the debounced background filter of the view, then repaint."""
+    while view.filter_debouncer.is_pending() or view.filter_runner.is_running():
+        app.processEvents()
+        time.sleep(0.001)
+    repaint(app, view)
+
+
+def close(app, table):
+    table.close()
+    table.deleteLater()
+    # processEvents ne traite pas les suppressions différées.
+    app.sendPostedEvents(None, QEvent.DeferredDelete)
+
+
+def time_size(app, rows):
+    seed(rows_per_kind=rows)
+    controller = IncomeController()
+    # Les comptes mis en cache portent sur la base précédente.
+    controller._invalidate_counts()
+    results = {}
+
+    with timed("CustomTableView open", results):
+        view = open_table(app, CustomTableView, controller)
+    model = view.table_model
+    assert model.total == rows, (model.total, rows)
+
+    loaded, widgets = model.rowCount(), len(view.findChildren(QWidget))
+    with timed("CustomTableView scroll to last loaded row", results):
+        view.table.scrollToBottom()
+        repaint(app, view)
+    assert model.rowCount() == loaded + model.chunk_size, "a scroll must fetch a single chunk"
+    assert len(view.findChildren(QWidget)) == widgets, "fetched rows must not create widgets"
+
+    combo_filter = view.findChild(ComboBox, "category_id")
+    with timed("CustomTableView category filter", results):
+        combo_filter.combobox.setCurrentIndex(1)
+        settle(app, view)
+    assert 0 < model.total < rows
+
+    with timed("CustomTableView refresh", results):
+        view.refresh_data()
+        repaint(app, view)
+    close(app, view)
+    return results
+
+
+def time_baseline(app):
+    """Open CustomTableWidget at BASELINE_ROWS, once the view is timed."""
+    seed(rows_per_kind=BASELINE_ROWS)
+    controller = IncomeController()
+    controller._invalidate_counts()
+    results = {}
+    with timed("CustomTableWidget open", results):
+        widget = open_table(app, CustomTableWidget, controller)
+    close(app, widget)
+    return results
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+    results = {rows: time_size(app, rows) for rows in SIZES}
+    results[BASELINE_ROWS].update(time_baseline(app))
+
+    labels = list(dict.fromkeys(label for times in results.values() for label in times))
+    print(f"{'ms':<42}" + "".join(f"{rows:>12,}" for rows in SIZES))
+    for label in labels:
+        cells = "".join(
+            f"{results[rows][label]:>12.1f}" if label in results[rows] else f"{'-':>12}" for rows in SIZES
+        )
+        print(f"{label:<42}{cells}")
+    for rows in SIZES:
+        ms = results[rows]["CustomTableView open"]
+        assert ms <= BUDGET_MS, f"opening the view at {rows:,} rows took {ms:.1f} ms, budget {BUDGET_MS} ms"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Check that the bucket keys computed by SQLite match `bucket_key` for every
+day of 2019-2026 and every granularity, then time a yearly history read by
+week. Exits with an AssertionError on the first mismatch.
+
+    python -m benchmarks.time_buckets
+"""
+import benchmarks  # noqa: F401  (selects the throw-away database)
+
+from datetime import date, timedelta
+
+from sqlalchemy import literal, select, union_all
+
+from benchmarks.fixtures import seed, timed
+from controllers.income_controller import IncomeController
+from database.database import engine
+from database.time_buckets import bucket_expression
+from utils.time_buckets import GRANULARITIES, bucket_key
+
+FIRST_DAY = date(2019, 1, 1)
+DAYS = 8 * 366
+
+
+def check_keys():
+    days = [FIRST_DAY + timedelta(days=offset) for offset in range(DAYS)]
+    with engine.connect() as connection:
+        for granularity in GRANULARITIES:
+            keys = []
+            # Les dates sont passées en littéraux ISO, 400 par requête.
+            for start in range(0, len(days), 400):
+                statement = union_all(
+                    *(select(bucket_expression(literal(day.isoformat()), granularity)) for day in days[start:start + 400])
+                )
+                keys += connection.execute(statement).scalars().all()
+            for day, key in zip(days, keys):
+                assert key == bucket_key(day, granularity), (granularity, day, key)
+
+
+def main():
+    check_keys()
+    print(f"{DAYS} days x {len(GRANULARITIES)} granularities: SQL and Python keys agree")
+
+    seed(rows_per_kind=100_000)
+    controller = IncomeController()
+    results = {}
+    for granularity in GRANULARITIES:
+        with timed(granularity, results):
+            buckets = controller.get_totals_by_bucket(granularity)
+        print(f"{granularity:<8}{len(buckets):>6} buckets{results[granularity]:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from .base_controller import BaseController
+from .ledger_controller import LedgerController
 from .user_controller import UserController
 from .income_controller import IncomeCategoryController, IncomeController
 from .expense_controller import ExpenseCategoryController, ExpenseController
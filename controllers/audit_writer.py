@@ -0,0 +1,132 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+
+from sqlalchemy import event, insert
+
+from database.database import SessionLocal, session, session_scope
+from models.audit_model import AuditLog
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "pending_audit_entries"
+
+
+class AuditWriter:
+    """
+    Background writer that stores audit rows in batches.
+
+    Entries are queued in memory and a daemon thread inserts them with one
+    executemany per batch, as soon as `batch_size` entries are waiting or
+    `flush_interval` seconds have passed. `shutdown` drains the queue; it is
+    registered with `atexit` so nothing is lost when the application quits.
+
+    Args:
+        batch_size (int, optional): Maximum number of rows per insert. Defaults to 200.
+        flush_interval (float, optional): Maximum delay before a partial batch is written. Defaults to 0.5.
+    """
+
+    _STOP = object()
+
+    def __init__(self, batch_size=200, flush_interval=0.5):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, entries):
+        """
+        Queue audit entries for writing.
+
+        Args:
+            entries (list[dict]): Column values of the AuditLog rows.
+        """
+        self._ensure_started()
+        for entry in entries:
+            self._queue.put(entry)
+
+    def flush(self):
+        """Block until every queued entry has been written."""
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.join()
+
+    def shutdown(self, timeout=10):
+        """
+        Write the remaining entries and stop the writer thread.
+
+        Args:
+            timeout (float, optional): Maximum time to wait, in seconds. Defaults to 10.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(self._STOP)
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.error("Audit writer did not drain its queue before shutdown.")
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            deadline = None
+            while len(batch) < self.batch_size:
+                timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+                try:
+                    entry = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if entry is self._STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(entry)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch):
+        try:
+            for attempt in (1, 2):
+                try:
+                    with session_scope():
+                        session.execute(insert(AuditLog), batch)
+                        session.commit()
+                    break
+                # Toute erreur est journalisée : si le thread mourait, flush() attendrait sans fin.
+                except Exception as e:
+                    if attempt == 2:
+                        logger.error(f"Failed to write {len(batch)} audit entries: {e} -> {batch}")
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+
+audit_writer = AuditWriter()
+atexit.register(audit_writer.shutdown)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _submit_pending_entries(committed_session):
+    entries = committed_session.info.pop(PENDING_KEY, None)
+    if entries:
+        audit_writer.submit(entries)
+
+
+@event.listens_for(SessionLocal, "after_transaction_end")
+def _discard_pending_entries(ended_session, transaction):
+    # Une transaction annulée ne doit laisser aucune trace dans le journal.
+    if transaction.parent is None:
+        ended_session.info.pop(PENDING_KEY, None)
@@ -1,12 +1,21 @@
 import logging
+import threading
+from collections import namedtuple
+from dataclasses import dataclass, field, replace
+from sqlalchemy import Date, DateTime, Float, Integer, String, and_, bindparam, cast, delete, func, insert, literal, or_, select, tuple_, type_coerce, update
 from sqlalchemy.inspection import inspect
+from sqlalchemy.orm import aliased, lazyload
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
-from database.database import session
+from controllers.audit_writer import PENDING_KEY, audit_writer
+from controllers.change_events import ChangeEvent, change_bus
+from controllers.period_context import period_context
+from database.database import session, unit_of_work
 from models.audit_model import AuditLog
-from models.cash_box_period import CashBoxPeriod
-from utils.utils import read_config_file_data, read_id_from_file
+from models.base_model import display_columns
+from models.money import MINOR_UNITS, Money, MoneyType
+from utils.utils import read_config_file_data
 
 # Configurer le logger pour capturer les erreurs SQLAlchemy
 logging.basicConfig(
@@ -15,26 +24,37 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 user_id = read_config_file_data()["user_id"]
+audit_mode = read_config_file_data().get("audit_mode", "buffered")
 
 
 class ActionLogger:
     """
     A logger class to log actions performed on the database for non-repudiation.
+
+    In "strict" mode the log row is added to the caller's session and commits
+    atomically with the record it describes. In "buffered" mode (the default)
+    it is handed to the background `audit_writer` once the caller's
+    transaction has committed, so saving a record costs a single commit.
     """
 
-    def __init__(self):
+    def __init__(self, mode=None):
         """
         Initialize the logger with a model to store log entries.
 
         Args:
-            log_model (Type[Base]): The SQLAlchemy model class for logging actions.
+            mode (str, optional): "strict" or "buffered". Defaults to the
+                `audit_mode` key of config.json.
         """
         self.log_model = AuditLog
+        self.mode = mode or audit_mode
 
     def log(self, action, user_id, table_name, record_id, description=None):
         """
         Log an action performed on a record.
 
+        Must be called before the caller commits: the entry is only kept if
+        that transaction commits.
+
         Args:
             action (str): The type of action (e.g., 'create', 'update', 'delete').
             user_id (int): The ID of the user performing the action.
@@ -42,23 +62,129 @@ class ActionLogger:
             record_id (int): The ID of the affected record.
             description (str, optional): A description or details about the action.
         """
+        entry = {
+            "action": action,
+            "user_id": user_id,
+            "table_name": table_name,
+            "record_id": record_id,
+            "description": description,
+            "timestamp": datetime.now(timezone.utc),
+        }
+        if self.mode == "strict":
+            session.add(self.log_model(**entry))
+        else:
+            session.info.setdefault(PENDING_KEY, []).append(entry)
+
+    def log_many(self, action, user_id, table_name, entries):
+        """
+        Add the log rows of a bulk operation to the current transaction.
 
-        try:
-            log_entry = self.log_model(
-                action=action,
-                user_id=user_id,
-                table_name=table_name,
-                record_id=record_id,
-                description=description,
-            )
-            session.add(log_entry)
-            session.commit()
-        except SQLAlchemyError as e:
-            logger.error(f"Failed to log action: {e}")
-            session.rollback()
-            raise
-        finally:
-            session.close()
+        Nothing is committed: the rows are written together with the records
+        they describe when the caller commits. This holds in both modes, a
+        single executemany costs little next to the batch itself.
+
+        Args:
+            action (str): The type of action (e.g., 'create', 'update', 'delete').
+            user_id (int): The ID of the user performing the action.
+            table_name (str): The name of the table affected.
+            entries (list): (record_id, description) pairs.
+        """
+        if not entries:
+            return
+        session.execute(
+            insert(self.log_model),
+            [
+                {
+                    "action": action,
+                    "user_id": user_id,
+                    "table_name": table_name,
+                    "record_id": record_id,
+                    "description": description,
+                }
+                for record_id, description in entries
+            ],
+        )
+
+
+@dataclass
+class BulkResult:
+    """
+    Outcome of a bulk operation.
+
+    Attributes:
+        succeeded (list): IDs of the records created, updated or deleted.
+        failed (list): (key, error message) pairs of the rejected rows. The key
+            is the row position for `create_many` and the record ID otherwise.
+    """
+
+    succeeded: list = field(default_factory=list)
+    failed: list = field(default_factory=list)
+
+
+@dataclass
+class Page:
+    """
+    One page of a keyset-paginated listing.
+
+    Attributes:
+        rows (list): The model instances or row snapshots of the page.
+        next_key (tuple): Key to pass as `order_key_after` to get the next
+            page, or None on the last page.
+        total (int): Number of records matching the filters.
+        amount_total (Money): Sum of the `amount` column over the records
+            matching the filters, set by `query_page`. None otherwise.
+    """
+
+    rows: list
+    next_key: tuple
+    total: int
+    amount_total: object = None
+
+
+@dataclass(frozen=True)
+class FilterSpec:
+    """
+    Filters and sort order of a listing, compiled by `BaseController.query_page`.
+
+    The filters combine: a record is listed when it matches all of them. A
+    spec is immutable and hashable; `dataclasses.replace` and `with_equal`
+    return updated copies, so a view can change one filter and keep the others.
+
+    Attributes:
+        text (str): Text searched in the searchable columns, as by
+            `BaseController.search_text`. Empty for no search.
+        equals (tuple): (column name, value) pairs the records must be equal
+            to, e.g. (("category_id", 3),).
+        date_range (tuple): (start_date, end_date), both included. None for
+            the current period.
+        amount_range (tuple): (minimum, maximum) of the `amount` column, in
+            Money or major units. Either bound may be None.
+        sort (tuple): (column name, descending) pairs. Foreign keys are sorted
+            on the label of the related record. Empty for the `order_column`
+            columns of the model.
+    """
+
+    text: str = ""
+    equals: tuple = ()
+    date_range: tuple = None
+    amount_range: tuple = None
+    sort: tuple = ()
+
+    def with_equal(self, name, value):
+        """
+        Return a copy where `name` must be equal to `value`.
+
+        Args:
+            name (str): The column name, e.g. "category_id".
+            value: The value, or None/"" to stop filtering on the column.
+
+        Returns:
+            FilterSpec: The updated copy.
+        """
+        equals = tuple((key, current) for key, current in self.equals if key != name)
+        if value not in (None, ""):
+            equals = tuple(sorted(equals + ((name, value),)))
+        return replace(self, equals=equals)
 
 
 class BaseController:
@@ -70,6 +196,14 @@ class BaseController:
         action_logger (ActionLogger): The logger to record database actions.
     """
 
+    # Nombre de lignes par (table, filtres, exercice), vidé à chaque écriture.
+    _count_cache = {}
+    # Incrémentée à chaque invalidation : un compte lu pendant une écriture n'est pas gardé.
+    _count_generation = 0
+    _count_lock = threading.Lock()
+    # Classe des instantanés de ligne de chaque modèle.
+    _snapshot_types = {}
+
     def __init__(self, model):
         """
         Initialize the BaseController with a specific SQLAlchemy model and a logger.
@@ -80,6 +214,7 @@ class BaseController:
         """
         self.model = model
         self.action_logger = ActionLogger()
+        self.bulk_chunk_size = 500
 
     def _hasattr_date(self):
         return hasattr(self.model, "date")
@@ -88,17 +223,19 @@ class BaseController:
         """
         Retrieve the currently active cash box period.
 
+        The period is cached process-wide by `period_context`, so this does not
+        touch the disk nor the database once loaded.
+
         Returns:
-            The current CashBoxPeriod instance, or None if no period is active.
+            PeriodBounds: The current period, or None if no period is active.
         """
         try:
-            current_period_id = read_id_from_file()
-            current_period = session.query(CashBoxPeriod).filter_by(id=current_period_id).first()
-            return current_period
+            return period_context.current
         except SQLAlchemyError as e:
             logger.error(f"Error retrieving current cash box period: {e}")
             return None
 
+    @unit_of_work
     def create(self, **kwargs):
         """
         Create a new record in the database.
@@ -118,7 +255,7 @@ class BaseController:
         try:
             instance = self.model(**kwargs)
             session.add(instance)
-            session.commit()
+            session.flush()
             self.action_logger.log(
                 "create",
                 user_id,
@@ -126,6 +263,9 @@ class BaseController:
                 instance.id,
                 description=f"Created record with values {kwargs}",
             )
+            session.commit()
+            self._after_write()
+            self._publish_change("create", new=self._row_values(instance))
             return instance
         except IntegrityError:
             session.rollback()
@@ -135,9 +275,8 @@ class BaseController:
         except SQLAlchemyError as e:
             session.rollback()
             raise
-        finally:
-            session.close()
 
+    @unit_of_work
     def get_by_id(self, id_):
         """
         Retrieve a record by its ID.
@@ -162,9 +301,8 @@ class BaseController:
             raise
         except SQLAlchemyError as e:
             raise
-        finally:
-            session.close()
 
+    @unit_of_work
     def update(self, id_, **kwargs):
         """
         Update an existing record with new values.
@@ -186,10 +324,11 @@ class BaseController:
             if instance is None:
                 raise RecordNotFoundError("Record not found.")
 
+            old = self._row_values(instance)
             for key, value in kwargs.items():
                 setattr(instance, key, value)
+            self._before_update_commit(instance, old)
 
-            session.commit()
             self.action_logger.log(
                 "update",
                 user_id,
@@ -197,6 +336,9 @@ class BaseController:
                 id_,
                 description=f"Updated record with values {kwargs}",
             )
+            session.commit()
+            self._after_write()
+            self._publish_change("update", old=old, new=self._row_values(instance))
             return instance
         except RecordNotFoundError:
             session.rollback()
@@ -204,9 +346,8 @@ class BaseController:
         except SQLAlchemyError as e:
             session.rollback()
             raise
-        finally:
-            session.close()
 
+    @unit_of_work
     def delete(self, id_):
         """
         Delete a record by its ID.
@@ -227,15 +368,18 @@ class BaseController:
             if instance is None:
                 raise RecordNotFoundError("Record not found.")
 
+            old = self._row_values(instance)
             session.delete(instance)
-            session.commit()
             self.action_logger.log(
                 "delete",
                 user_id,
                 self.model.__tablename__,
                 id_,
-                description=f"Deleted record with values {instance}",
+                description=self._delete_description(instance),
             )
+            session.commit()
+            self._after_write()
+            self._publish_change("delete", old=old)
             return True
         except RecordNotFoundError:
             session.rollback()
@@ -243,9 +387,209 @@ class BaseController:
         except SQLAlchemyError as e:
             session.rollback()
             raise
-        finally:
-            session.close()
+
+    @staticmethod
+    def _delete_description(instance):
+        """Audit description of a deleted record, shared by `delete` and `delete_many`."""
+        return f"Deleted record with values {instance}"
             
+    @unit_of_work
+    def create_many(self, rows):
+        """
+        Create many records in a single transaction.
+
+        Rows are inserted in chunks (one statement per chunk) and their audit
+        rows are written in the same transaction. A row breaking a constraint
+        is reported in the result and does not abort the others.
+
+        Args:
+            rows (list[dict]): Field values of each new record.
+
+        Returns:
+            BulkResult: The created IDs and the rejected row positions.
+
+        Raises:
+            SQLAlchemyError: For any error other than an integrity error.
+        """
+        result = BulkResult()
+        try:
+            statement = insert(self.model).returning(self.model.id, sort_by_parameter_order=True)
+            created = self._execute_in_chunks(statement, rows, list(range(len(rows))), result, returning=True)
+            result.succeeded = [record_id for _, record_id in created]
+            self.action_logger.log_many(
+                "create",
+                user_id,
+                self.model.__tablename__,
+                [
+                    (record_id, f"Created record with values {rows[position]}")
+                    for position, record_id in created
+                ],
+            )
+            session.commit()
+            self._after_write()
+            self._publish_change("bulk")
+            return result
+        except SQLAlchemyError:
+            session.rollback()
+            raise
+
+    @unit_of_work
+    def update_many(self, values_by_id):
+        """
+        Update many records in a single transaction.
+
+        Args:
+            values_by_id (dict): New field values keyed by record ID.
+
+        Returns:
+            BulkResult: The updated IDs and the rejected IDs.
+
+        Raises:
+            SQLAlchemyError: For any error other than an integrity error.
+        """
+        result = BulkResult()
+        try:
+            ids = self._existing_ids(values_by_id, result)
+            rows = [{**values_by_id[id_], "id": id_} for id_ in ids]
+            updated = self._execute_in_chunks(update(self.model), rows, ids, result)
+            result.succeeded = [id_ for id_, _ in updated]
+            self.action_logger.log_many(
+                "update",
+                user_id,
+                self.model.__tablename__,
+                [(id_, f"Updated record with values {values_by_id[id_]}") for id_ in result.succeeded],
+            )
+            session.commit()
+            self._after_write()
+            self._publish_change("bulk")
+            return result
+        except SQLAlchemyError:
+            session.rollback()
+            raise
+
+    @unit_of_work
+    def delete_many(self, ids):
+        """
+        Delete many records in a single transaction.
+
+        Children declared with a delete cascade on the model relationships are
+        deleted with them, as `delete` does; a record whose children cannot be
+        deleted is rejected and kept. The audit rows describe the records as
+        `delete` does.
+
+        Args:
+            ids (list[int]): The IDs of the records to delete.
+
+        Returns:
+            BulkResult: The deleted IDs and the rejected IDs.
+
+        Raises:
+            SQLAlchemyError: For any error other than an integrity error.
+        """
+        result = BulkResult()
+        try:
+            descriptions = self._delete_descriptions(ids, result)
+            ids = list(descriptions)
+            for relationship in inspect(self.model).relationships:
+                if relationship.cascade.delete and relationship.direction.name == "ONETOMANY":
+                    (child_column,) = relationship.remote_side
+                    # Un parent dont les enfants n'ont pas pu être supprimés est conservé.
+                    ids = [
+                        id_
+                        for id_, _ in self._execute_in_chunks(
+                            delete(child_column.table).where(child_column == bindparam("parent_id")),
+                            [{"parent_id": id_} for id_ in ids],
+                            ids,
+                            result,
+                        )
+                    ]
+            table = self.model.__table__
+            deleted = self._execute_in_chunks(
+                delete(table).where(table.c.id == bindparam("record_id")),
+                [{"record_id": id_} for id_ in ids],
+                ids,
+                result,
+            )
+            result.succeeded = [id_ for id_, _ in deleted]
+            self.action_logger.log_many(
+                "delete",
+                user_id,
+                self.model.__tablename__,
+                [(id_, descriptions[id_]) for id_ in result.succeeded],
+            )
+            session.commit()
+            self._after_write()
+            self._publish_change("bulk")
+            return result
+        except SQLAlchemyError:
+            session.rollback()
+            raise
+
+    def _existing_ids(self, ids, result):
+        """Return the IDs that exist, reporting the others as failures."""
+        ids = list(ids)
+        existing = set()
+        for start in range(0, len(ids), self.bulk_chunk_size):
+            chunk = ids[start:start + self.bulk_chunk_size]
+            existing.update(session.scalars(select(self.model.id).where(self.model.id.in_(chunk))))
+        for id_ in ids:
+            if id_ not in existing:
+                result.failed.append((id_, "Record not found."))
+        return [id_ for id_ in ids if id_ in existing]
+
+    def _delete_descriptions(self, ids, result):
+        """
+        Return the audit description of each existing record, by ID, reporting the others as failures.
+
+        The records are read in chunks, described, then detached from the
+        session, since they are deleted without the ORM.
+        """
+        ids = list(ids)
+        descriptions = {}
+        for start in range(0, len(ids), self.bulk_chunk_size):
+            chunk = ids[start:start + self.bulk_chunk_size]
+            for instance in session.scalars(select(self.model).where(self.model.id.in_(chunk))):
+                descriptions[instance.id] = self._delete_description(instance)
+                session.expunge(instance)
+        for id_ in ids:
+            if id_ not in descriptions:
+                result.failed.append((id_, "Record not found."))
+        return {id_: descriptions[id_] for id_ in ids if id_ in descriptions}
+
+    def _execute_in_chunks(self, statement, rows, keys, result, returning=False):
+        """
+        Execute `statement` once per chunk of `rows`, each chunk in a savepoint.
+
+        When a chunk raises an IntegrityError it is replayed row by row so that
+        only the offending rows end up in `result.failed`.
+
+        Returns:
+            list: (key, returned value) pairs of the rows that succeeded.
+        """
+        done = []
+        for start in range(0, len(rows), self.bulk_chunk_size):
+            chunk = rows[start:start + self.bulk_chunk_size]
+            chunk_keys = keys[start:start + self.bulk_chunk_size]
+            try:
+                with session.begin_nested():
+                    done.extend(zip(chunk_keys, self._execute_chunk(statement, chunk, returning)))
+            except IntegrityError:
+                for key, row in zip(chunk_keys, chunk):
+                    try:
+                        with session.begin_nested():
+                            done.extend(zip([key], self._execute_chunk(statement, [row], returning)))
+                    except IntegrityError as e:
+                        result.failed.append((key, str(e.orig)))
+        return done
+
+    def _execute_chunk(self, statement, chunk, returning):
+        if returning:
+            # SQLite < 3.41 renvoie l'id en REAL lorsque la clé n'est pas la première colonne.
+            return [int(value) for value in session.scalars(statement, chunk)]
+        session.execute(statement, chunk)
+        return [None] * len(chunk)
+
+    @unit_of_work
     def get_all(self):
         """
         Fetch all records with optional ordering.
@@ -254,13 +598,7 @@ class BaseController:
             A list of model instances, ordered if applicable.
         """
         try:
-            current_period = self.get_current_period()
-            query = session.query(self.model)
-            if current_period:
-                start_date = current_period.start_date
-                end_date = current_period.end_date
-                if self._hasattr_date():
-                    query = query.filter(self.model.date.between(start_date, end_date+timedelta(days=1)))
+            query = self._filtered_query(session.query(self.model))
 
             # Récupérer les colonnes avec 'order_column' dans leur 'info'
             order_columns = self._get_order_columns()
@@ -271,9 +609,458 @@ class BaseController:
             return query.all()
         except SQLAlchemyError as e:
             raise
-        finally:
-            session.close()
 
+    @unit_of_work
+    def get_page(self, order_key_after=None, limit=50, filters=None, period=None, snapshots=False):
+        """
+        Fetch one page of records using keyset (seek) pagination.
+
+        Records are ordered by the `order_column` columns then by `id`, and the
+        page starts right after `order_key_after`, so the cost of a page does
+        not depend on its position in the listing.
+
+        Args:
+            order_key_after (tuple, optional): `Page.next_key` of the previous
+                page. None for the first page.
+            limit (int, optional): Maximum number of records. Defaults to 50.
+            filters (dict, optional): Column values the records must be equal to.
+            period (tuple, optional): (start_date, end_date). Defaults to the
+                current period.
+            snapshots (bool, optional): Return row snapshots (see
+                `get_snapshot_type`) instead of model instances.
+
+        Returns:
+            Page: The records, the key of the next page and the cached total.
+        """
+        try:
+            key_columns = self._get_page_key_columns()
+            query = self._filtered_query(self._rows_query(snapshots), filters, period)
+            if order_key_after is not None:
+                query = query.filter(tuple_(*key_columns) > tuple_(*order_key_after))
+            rows = self._fetch_rows(query.order_by(*key_columns).limit(limit), snapshots)
+
+            next_key = None
+            if len(rows) == limit:
+                next_key = tuple(getattr(rows[-1], column.key) for column in key_columns)
+            return Page(rows=rows, next_key=next_key, total=self.count(filters, period))
+        except SQLAlchemyError as e:
+            raise
+
+    @unit_of_work
+    def count(self, filters=None, period=None):
+        """
+        Count the records of a period matching `filters`.
+
+        The result is cached per filter set until the next write made through
+        a controller.
+
+        Args:
+            filters (dict, optional): Column values the records must be equal to.
+            period (tuple, optional): (start_date, end_date). Defaults to the
+                current period.
+
+        Returns:
+            int: The number of matching records.
+        """
+        try:
+            current_period = self.get_current_period()
+            key = (
+                self.model.__tablename__,
+                tuple(sorted((filters or {}).items())),
+                period or (current_period.id if current_period else None),
+            )
+            query = self._filtered_query(session.query(func.count(self.model.id)), filters, period)
+            return self._cached_count(key, query.scalar)
+        except SQLAlchemyError as e:
+            raise
+
+    @unit_of_work
+    def sum(self, column_name, filters=None, period=None):
+        """
+        Sum a column over the records of a period matching `filters`.
+
+        Args:
+            column_name (str): The column to sum, e.g. "amount".
+            filters (dict, optional): Column values the records must be equal to.
+            period (tuple, optional): (start_date, end_date). Defaults to the
+                current period.
+
+        Returns:
+            The sum, with the type of the column (Money for amounts), or 0
+            when no record matches.
+        """
+        try:
+            column = getattr(self.model, column_name)
+            total = self._filtered_query(session.query(func.sum(column)), filters, period).scalar()
+            return total if total is not None else 0
+        except SQLAlchemyError as e:
+            raise
+
+    @unit_of_work
+    def query_page(self, spec=None, order_key_after=None, limit=50, snapshots=False):
+        """
+        Fetch one page of the records matching a FilterSpec, with their totals.
+
+        The text, equality, date and amount filters of `spec` are compiled
+        together into the WHERE clause of one statement, ordered by
+        `spec.sort` then `id` and paginated by keyset like `get_page`. The
+        count and the amount total come from `totals`.
+
+        Args:
+            spec (FilterSpec, optional): The filters and sort order. Defaults
+                to every record of the current period.
+            order_key_after (tuple, optional): `Page.next_key` of the previous
+                page. None for the first page.
+            limit (int, optional): Maximum number of records, None for all of
+                them. Defaults to 50.
+            snapshots (bool, optional): Return row snapshots (see
+                `get_snapshot_type`) instead of model instances.
+
+        Returns:
+            Page: The records, the key of the next page, the number of
+            matching records and their amount total.
+
+        Raises:
+            ValueError: If `spec.sort` names a column the model does not have.
+        """
+        spec = spec or FilterSpec()
+        try:
+            query, sort_keys = self._compile_spec(self._rows_query(snapshots), spec, sort=True)
+            if order_key_after is not None:
+                query = query.filter(_keyset_clause(sort_keys, order_key_after))
+            # Les clés de tri sont lues avec les lignes : un instantané contient le libellé, pas l'ID.
+            query = query.add_columns(*(expression for expression, _ in sort_keys)).order_by(
+                *(expression.desc() if descending else expression for expression, descending in sort_keys)
+            )
+            if limit is not None:
+                query = query.limit(limit)
+            rows = query.all()
+
+            next_key = None
+            if limit is not None and len(rows) == limit:
+                next_key = tuple(rows[-1][-len(sort_keys):])
+            if snapshots:
+                records = self._make_rows((row[:-len(sort_keys)] for row in rows), snapshots)
+            else:
+                records = [row[0] for row in rows]
+            total, amount_total = self.totals(spec)
+            return Page(rows=records, next_key=next_key, total=total, amount_total=amount_total)
+        except SQLAlchemyError as e:
+            raise
+
+    @unit_of_work
+    def totals(self, spec=None):
+        """
+        Count the records matching a FilterSpec and sum their amounts.
+
+        Both come from a single aggregate statement with the WHERE clause of
+        `query_page`, cached per spec until the next write made through a
+        controller.
+
+        Args:
+            spec (FilterSpec, optional): The filters. Defaults to every record
+                of the current period.
+
+        Returns:
+            tuple: (number of records, amount total). The amount total is a
+            Money, or None when the model has no `amount` column.
+        """
+        spec = spec or FilterSpec()
+        try:
+            current_period = self.get_current_period()
+            key = (
+                self.model.__tablename__,
+                spec,
+                spec.date_range or (current_period.id if current_period else None),
+            )
+            return self._cached_count(key, lambda: self._compute_totals(spec))
+        except SQLAlchemyError as e:
+            raise
+
+    def _compute_totals(self, spec):
+        aggregates = [func.count(self.model.id)]
+        if hasattr(self.model, "amount"):
+            aggregates.append(func.sum(self.model.amount))
+        query, _ = self._compile_spec(session.query(*aggregates).select_from(self.model), spec)
+        total, *sums = query.one()
+        amount_total = None
+        if sums:
+            amount_total = sums[0] if sums[0] is not None else Money()
+        return total, amount_total
+
+    def _cached_count(self, key, compute):
+        """
+        Return the cached value of `key`, calling `compute` when it is missing.
+
+        The cache generation is read before the query and the result is only
+        stored if it did not change meanwhile: a value computed while another
+        thread committed a write is returned, but not cached.
+        """
+        with self._count_lock:
+            if key in self._count_cache:
+                return self._count_cache[key]
+            generation = BaseController._count_generation
+        value = compute()
+        with self._count_lock:
+            if BaseController._count_generation == generation:
+                self._count_cache[key] = value
+        return value
+
+    @unit_of_work
+    def search_text(self, query, columns=None, period=None, snapshots=False):
+        """
+        Case-insensitive substring search, evaluated by SQLite.
+
+        Text columns are matched directly, foreign keys through the label of
+        the related record (`related_column`), dates as shown in the table
+        (`2024-01-31` or `31/01/2024`) and amounts ignoring spaces and with a
+        comma accepted as decimal separator.
+
+        Args:
+            query (str): The text typed by the user.
+            columns (list[str], optional): Columns to search. Defaults to every
+                editable column of the model.
+            period (tuple, optional): (start_date, end_date) to search in.
+                Defaults to the current period.
+            snapshots (bool, optional): Return row snapshots (see
+                `get_snapshot_type`) instead of model instances.
+
+        Returns:
+            A list of model instances or snapshots, ordered like `get_all`.
+        """
+        try:
+            statement = self._filtered_query(self._rows_query(snapshots), period=period)
+            clauses = []
+            for name in columns or self._get_searchable_columns():
+                clause, related_model = self._search_clause(name, query)
+                if related_model is not None:
+                    statement = statement.outerjoin(
+                        related_model, related_model.id == getattr(self.model, name)
+                    )
+                if clause is not None:
+                    clauses.append(clause)
+            if clauses:
+                statement = statement.filter(or_(*clauses))
+            return self._fetch_rows(statement.order_by(*self._get_order_columns()), snapshots)
+        except SQLAlchemyError as e:
+            raise
+
+    def get_snapshot_type(self):
+        """
+        Return the row snapshot class of the model, for the list views.
+
+        A snapshot is a named tuple of the display columns of a record, in
+        display order (`display_columns`). A foreign key holds the label of
+        the related record (`related_column`), joined in SQL, instead of its
+        ID. Snapshots keep no session state nor relationships, so a list of
+        them is much smaller than the model instances.
+
+        Returns:
+            type: A namedtuple class, e.g. IncomeModelRow(id, date, ...).
+        """
+        if self.model not in self._snapshot_types:
+            names = [column.name for column in display_columns(self.model)]
+            self._snapshot_types[self.model] = namedtuple(f"{self.model.__name__}Row", names)
+        return self._snapshot_types[self.model]
+
+    def _rows_query(self, snapshots=False):
+        """Query of the model instances, or of the snapshot columns with their joins."""
+        if not snapshots:
+            return session.query(self.model)
+        columns, joins = [], []
+        for column in display_columns(self.model):
+            if column.foreign_keys and "related_column" in column.info:
+                # Alias : la recherche peut joindre la même table pour ses propres critères.
+                related_model = aliased(self.get_related_model(column.name))
+                columns.append(getattr(related_model, column.info["related_column"]).label(column.name))
+                joins.append((related_model, related_model.id == getattr(self.model, column.name)))
+            else:
+                columns.append(column)
+        query = session.query(*columns).select_from(self.model)
+        for related_model, on_clause in joins:
+            query = query.outerjoin(related_model, on_clause)
+        return query
+
+    def _fetch_rows(self, query, snapshots=False):
+        return self._make_rows(query.all(), snapshots)
+
+    def _make_rows(self, rows, snapshots=False):
+        if not snapshots:
+            return list(rows)
+        make_row = self.get_snapshot_type()._make
+        labels = [
+            index
+            for index, column in enumerate(display_columns(self.model))
+            if column.foreign_keys and "related_column" in column.info
+        ]
+        if not labels:
+            return [make_row(row) for row in rows]
+        # Un seul objet str par libellé, comme une seule instance liée par enregistrement.
+        shared = {}
+        records = []
+        for row in rows:
+            values = list(row)
+            for index in labels:
+                values[index] = shared.setdefault(values[index], values[index])
+            records.append(make_row(values))
+        return records
+
+    def _search_clause(self, name, text):
+        """Return the LIKE clause for one column and the model it needs to join."""
+        column = self.model.__table__.columns[name]
+        # Les deux côtés passent par str.lower (py_lower) : "é" trouve "É".
+        pattern = f"%{_escape_like(text.strip().lower())}%"
+
+        if column.foreign_keys and "related_column" in column.info:
+            related_model = self.get_related_model(name)
+            label = getattr(related_model, column.info["related_column"])
+            return func.py_lower(label).like(pattern, escape="\\"), related_model
+        if isinstance(column.type, (Date, DateTime)):
+            return or_(
+                cast(column, String).like(pattern, escape="\\"),
+                func.strftime("%d/%m/%Y", column).like(pattern, escape="\\"),
+            ), None
+        if isinstance(column.type, MoneyType):
+            number = "".join(text.split()).replace(",", ".")
+            if not number:
+                return None, None
+            # Montant en unités majeures, tel qu'affiché : "5000.00".
+            amount = func.printf("%.2f", type_coerce(column, Float) / MINOR_UNITS)
+            return amount.like(f"%{_escape_like(number)}%", escape="\\"), None
+        if isinstance(column.type, (Float, Integer)):
+            number = "".join(text.split()).replace(",", ".")
+            if not number:
+                return None, None
+            return cast(column, String).like(f"%{_escape_like(number)}%", escape="\\"), None
+        if isinstance(column.type, String):
+            return func.py_lower(column).like(pattern, escape="\\"), None
+        return None, None
+
+    def _compile_spec(self, query, spec, sort=False):
+        """
+        Restrict `query` to the records matching a FilterSpec.
+
+        The related models needed by the text search and by the sort on a
+        foreign key are joined once.
+
+        Args:
+            query: The query to restrict.
+            spec (FilterSpec): The filters and sort order.
+            sort (bool, optional): Also build the sort keys.
+
+        Returns:
+            tuple: (query, sort keys), the sort keys being (expression,
+            descending) pairs ending with `id`; empty when `sort` is False.
+
+        Raises:
+            ValueError: If `spec.sort` names a column the model does not have.
+        """
+        query = self._filtered_query(query, dict(spec.equals), spec.date_range)
+        if spec.amount_range and hasattr(self.model, "amount"):
+            minimum, maximum = spec.amount_range
+            if minimum is not None:
+                query = query.filter(self.model.amount >= minimum)
+            if maximum is not None:
+                query = query.filter(self.model.amount <= maximum)
+
+        related_models, clauses = {}, []
+        if spec.text:
+            for name in self._get_searchable_columns():
+                clause, related_model = self._search_clause(name, spec.text)
+                if related_model is not None:
+                    related_models[name] = related_model
+                if clause is not None:
+                    clauses.append(clause)
+
+        sort_keys = []
+        if sort:
+            columns = self.model.__table__.columns
+            for name, descending in spec.sort or [(column.name, False) for column in self._get_order_columns()]:
+                if name not in columns:
+                    raise ValueError(f"{self.model.__name__} has no column {name!r} to sort on")
+                if name == "id":
+                    continue
+                column = columns[name]
+                expression = column
+                if column.foreign_keys and "related_column" in column.info:
+                    related_model = related_models.setdefault(name, self.get_related_model(name))
+                    expression = getattr(related_model, column.info["related_column"])
+                if column.nullable or expression is not column:
+                    # Pas de NULL dans une clé de pagination : NULL > x n'est jamais vrai.
+                    expression = func.coalesce(expression, "" if isinstance(expression.type, String) else 0)
+                sort_keys.append((expression, bool(descending)))
+            id_descending = dict(spec.sort).get("id", sort_keys[-1][1] if sort_keys else False)
+            sort_keys.append((self.model.id, bool(id_descending)))
+
+        for name, related_model in related_models.items():
+            query = query.outerjoin(related_model, related_model.id == getattr(self.model, name))
+        if clauses:
+            query = query.filter(or_(*clauses))
+        return query, sort_keys
+
+    def _get_searchable_columns(self):
+        return [
+            column.name
+            for column in self.model.__table__.columns
+            if column.name != "id" and column.info.get("editable", "true") != "false"
+        ]
+
+    def _filtered_query(self, query, filters=None, period=None):
+        """
+        Restrict `query` to a period and to the equality `filters`.
+
+        Args:
+            period (tuple, optional): (start_date, end_date). Defaults to the
+                current period.
+        """
+        if period is None:
+            current_period = self.get_current_period()
+            if current_period:
+                period = (current_period.start_date, current_period.end_date)
+        if period and self._hasattr_date():
+            start_date, end_date = period
+            query = query.filter(self.model.date.between(start_date, end_date + timedelta(days=1)))
+        for key, value in (filters or {}).items():
+            if hasattr(self.model, key):
+                query = query.filter(getattr(self.model, key) == value)
+        return query
+
+    def _get_page_key_columns(self):
+        return [column for column in self._get_order_columns() if column.name != "id"] + [self.model.id]
+
+    def _before_update_commit(self, instance, old):
+        """
+        Hook run by `update` in its transaction, right before the commit.
+
+        Args:
+            instance: The record, with the new values set.
+            old (dict): The column values before the update.
+        """
+
+    def _after_write(self):
+        """Drop what was cached from the table; called after each committed write."""
+        self._invalidate_counts()
+
+    @classmethod
+    def _invalidate_counts(cls):
+        with cls._count_lock:
+            BaseController._count_generation += 1
+            cls._count_cache.clear()
+
+    def _publish_change(self, action, old=None, new=None):
+        """Announce a committed write on `change_bus`."""
+        change_bus.publish(ChangeEvent(self.model, action, old, new))
+
+    def _row_values(self, instance):
+        """
+        Return the column values of `instance` as a plain dict.
+
+        Read after the commit, the values come back from the database with
+        their column types (the forms pass amounts as text).
+        """
+        return {column.key: getattr(instance, column.key) for column in self.model.__table__.columns}
+
+    @unit_of_work
     def search(self, **filters):
         """
         Search records based on multiple filters.
@@ -286,39 +1073,25 @@ class BaseController:
         """
 
         try:
-            current_period = self.get_current_period()
-            query = session.query(self.model)
-            if current_period:
-                start_date = current_period.start_date
-                end_date = current_period.end_date
-                if self._hasattr_date():
-                    query = query.filter(self.model.date.between(start_date, end_date+timedelta(days=1)))
-            
+            query = self._filtered_query(session.query(self.model))
+
             for key, value in filters.items():
                 if hasattr(self.model, key):
                     query = query.filter(getattr(self.model, key) == value)
             return query.all()
         except SQLAlchemyError as e:
             raise
-        finally:
-            session.close()
 
+    @unit_of_work
     def get_filter_by_category_id(self, id):
         try:
-            current_period = self.get_current_period()
-            query = session.query(self.model).filter_by(category_id=id)
-            if current_period:
-                start_date = current_period.start_date
-                end_date = current_period.end_date
-                if self._hasattr_date():
-                    query = query.filter(self.model.date.between(start_date, end_date+timedelta(days=1)))
+            query = self._filtered_query(session.query(self.model), {"category_id": id})
             data = query.order_by(*self._get_order_columns()).all()
             return data
         except SQLAlchemyError as e:
             raise
-        finally:
-            session.close()
 
+    @unit_of_work
     def get_filter_by_period(self, start_date, end_date):
         """
         Retrieve all instance within a specific date range.
@@ -331,18 +1104,10 @@ class BaseController:
             list: A list of  instances within the date range.
         """
         try:
-            return (
-                session.query(self.model)
-                .filter(
-                    self.model.date.between(start_date, end_date + timedelta(days=1))
-                )
-                .order_by(*self._get_order_columns())
-                .all()
-            )
+            query = self._filtered_query(session.query(self.model), period=(start_date, end_date))
+            return query.order_by(*self._get_order_columns()).all()
         except SQLAlchemyError as e:
             raise
-        finally:
-            session.close()
 
     def get_related_model(self, foreign_key_column_name):
         """
@@ -361,17 +1126,18 @@ class BaseController:
                 if col.name == foreign_key_column_name:
                     return prop.mapper.class_
 
+    @unit_of_work
     def get_related_model_all(self, foreign_key_column_name):
 
         try:
             related_model = self.get_related_model(foreign_key_column_name)
             if related_model:
-                return session.query(related_model).outerjoin(self.model).all()
+                # Sans jointure ni chargement des collections : seules les lignes liées sont lues.
+                return session.query(related_model).options(lazyload("*")).order_by(related_model.id).all()
         except SQLAlchemyError as e:
             raise
-        finally:
-            session.close()
 
+    @unit_of_work
     def get_related_model_item_by_id(self, foreign_key_column_name, _id):
 
         try:
@@ -379,14 +1145,12 @@ class BaseController:
             if related_model:
                 return (
                     session.query(related_model)
-                    .outerjoin(self.model)
+                    .options(lazyload("*"))
                     .filter(related_model.id == _id)
                     .first()
                 )
         except SQLAlchemyError as e:
             raise
-        finally:
-            session.close()
 
     def _get_order_columns(self):
         order_columns = []
@@ -397,6 +1161,33 @@ class BaseController:
         return order_columns
 
 
+def _escape_like(text):
+    """Escape the LIKE wildcards of a user-typed text."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _keyset_clause(sort_keys, key):
+    """
+    Return the clause selecting the records after `key` in the order of `sort_keys`.
+
+    Args:
+        sort_keys (list): (expression, descending) pairs, as built by
+            `BaseController._compile_spec`.
+        key (tuple): The sort key values of the last record of the previous page.
+    """
+    values = [literal(value, expression.type) for (expression, _), value in zip(sort_keys, key)]
+    directions = {descending for _, descending in sort_keys}
+    if len(directions) == 1:
+        # Une seule direction : comparaison de tuples, que SQLite résout avec l'index.
+        columns = tuple_(*(expression for expression, _ in sort_keys))
+        return columns < tuple_(*values) if directions.pop() else columns > tuple_(*values)
+    clauses = []
+    for index, (expression, descending) in enumerate(sort_keys):
+        equal = [previous == value for (previous, _), value in zip(sort_keys[:index], values)]
+        clauses.append(and_(*equal, expression < values[index] if descending else expression > values[index]))
+    return or_(*clauses)
+
+
 class RecordNotFoundError(Exception):
     """Exception raised when a record is not found."""
 
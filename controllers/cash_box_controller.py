@@ -1,21 +1,42 @@
+from collections import namedtuple
 from datetime import datetime, timedelta
+from sqlalchemy import Date, case, func, literal, select, type_coerce
 from sqlalchemy.exc import SQLAlchemyError
-from database.database import session
+from database.database import session, unit_of_work
 
 from controllers.base_controller import BaseController, RecordNotFoundError
-from controllers.expense_controller import ExpenseController
-from controllers.income_controller import IncomeController
+from controllers.period_context import period_context
 
+from database.ledger_summary import LEDGER_KINDS
+from database.period_rollup import CLOSED_STATUS, DROP_PERIOD_ROLLUP, freeze_period_rollup
 from models.cash_box_period import CashBoxPeriod
-from utils.utils import read_config_file_data, read_id_from_file
+from models.ledger_summary import LedgerDailySummary
+from models.money import Money, MoneyType
+from models.period_rollup import PeriodRollup
+from utils.utils import read_config_file_data
 
 user_id = read_config_file_data()["user_id"]
 
+# Premier jour de la tranche (jour, semaine commençant le lundi, mois) d'une date.
+BALANCE_GRANULARITIES = {
+    "day": lambda column: column,
+    "week": lambda column: func.date(column, "weekday 0", "-6 days"),
+    "month": lambda column: func.date(column, "start of month"),
+}
+
+BalancePoint = namedtuple("BalancePoint", ["date", "net", "balance"])
+
 class CashBoxPeriodController(BaseController):
     
     def __init__(self):
         super().__init__(model=CashBoxPeriod)
-            
+
+    def _after_write(self):
+        super()._after_write()
+        # Les dates ou le solde initial de l'exercice actif ont pu changer.
+        period_context.invalidate()
+
+    @unit_of_work
     def get_all(self):
         """
         Fetch all records with optional ordering.
@@ -35,29 +56,83 @@ class CashBoxPeriodController(BaseController):
             return query.all()
         except SQLAlchemyError as e:
             raise
-        finally:
-            session.close()
     
-    def calculate_ending_balance(self):
+    def _before_update_commit(self, instance, old):
+        # Fermer un exercice fige ses agrégats dans la même transaction ; le
+        # rouvrir les supprime.
+        session.flush()
+        if instance.is_open == CLOSED_STATUS:
+            if old["is_open"] != CLOSED_STATUS:
+                freeze_period_rollup(session, instance.id, instance.start_date, instance.end_date)
+            instance.ending_balance = self._ending_balance(instance)
+        elif old["is_open"] == CLOSED_STATUS:
+            session.execute(DROP_PERIOD_ROLLUP, {"period_id": instance.id})
+
+    @unit_of_work
+    def calculate_ending_balance(self, period_id=None):
         """
-        Calculate the ending balance for the current period.
+        Calculate the ending balance of a period.
+
+        Args:
+            period_id (int, optional): The period. Defaults to the current one.
 
         Returns:
-            float: The ending balance of the current cash box period.
+            Money: The ending balance of the period, Money(0) if there is none.
         """
-        total_expense = ExpenseController().get_total_expense
-        total_income = IncomeController().get_total_income
-        
-        end_balance = float(self.get_initial_balance) + total_income - total_expense
-        return end_balance 
-    
+        if period_id is None:
+            current_period = self.get_current_period()
+            if current_period is None:
+                return Money(0)
+            period_id = current_period.id
+        return self._ending_balance(self.get_by_id(period_id))
+
+    @unit_of_work
+    def get_period_totals(self, period_id):
+        """
+        Number and total amount of the incomes and expenses of a period.
+
+        A closed period is read from its rollup, an open one is summed from
+        `ledger_daily_summary`.
+
+        Args:
+            period_id (int): The period.
+
+        Returns:
+            dict: (count, total) pairs keyed by kind ("income", "expense").
+
+        Raises:
+            RecordNotFoundError: If the period does not exist.
+        """
+        try:
+            period = self.get_by_id(period_id)
+            if period.is_open == CLOSED_STATUS:
+                rows = session.query(PeriodRollup.kind, PeriodRollup.count, PeriodRollup.total).filter(
+                    PeriodRollup.period_id == period.id, PeriodRollup.section == "total"
+                )
+            else:
+                summary = LedgerDailySummary
+                rows = (
+                    session.query(summary.kind, func.sum(summary.count), func.sum(summary.total))
+                    .filter(summary.date.between(period.start_date, period.end_date + timedelta(days=1)))
+                    .group_by(summary.kind)
+                )
+            totals = {kind: (0, Money()) for kind in LEDGER_KINDS.values()}
+            totals.update({kind: (count, total) for kind, count, total in rows})
+            return totals
+        except SQLAlchemyError as e:
+            raise
+
+    def _ending_balance(self, period):
+        totals = self.get_period_totals(period.id)
+        return period.initial_amount + totals["income"][1] - totals["expense"][1]
+
     @property
     def get_initial_balance(self):
         try:
-            instance = session.query(self.model).filter(self.model.id == read_id_from_file()).first()
-            if instance is None:
-                return 0
-            initial_balance = instance.initial_amount
+            current_period = self.get_current_period()
+            if current_period is None:
+                return Money()
+            initial_balance = current_period.initial_amount
 
             return initial_balance 
     
@@ -65,5 +140,68 @@ class CashBoxPeriodController(BaseController):
             raise
         except SQLAlchemyError as e:
             raise
-        finally:
-            session.close()
\ No newline at end of file
+
+    @unit_of_work
+    def get_balance_series(self, granularity="day"):
+        """
+        Compute the cash balance at the end of each day, week or month.
+
+        Incomes and expenses are read together from `ledger_daily_summary`,
+        or from the `day` rows of the rollup when the current period is
+        closed; the running balance is a window sum evaluated by SQLite, in a
+        single statement. Periods without any transaction are not returned.
+
+        Args:
+            granularity (str, optional): "day", "week" or "month". Defaults to "day".
+
+        Returns:
+            list[BalancePoint]: First day of each bucket, its net amount and the
+            balance at its end, in chronological order.
+
+        Raises:
+            ValueError: If the granularity is unknown.
+        """
+        if granularity not in BALANCE_GRANULARITIES:
+            raise ValueError(f"Unknown granularity: {granularity}")
+        try:
+            current_period = self.get_current_period()
+            return [
+                BalancePoint(*row)
+                for row in session.execute(self._balance_statement(granularity, current_period))
+            ]
+        except SQLAlchemyError as e:
+            raise
+
+    def _balance_statement(self, granularity, current_period):
+        initial_amount = Money()
+        if current_period and current_period.is_closed:
+            # Exercice clôturé : ses montants journaliers figés font foi.
+            daily = select(
+                PeriodRollup.kind, PeriodRollup.bucket.label("date"), PeriodRollup.total
+            ).where(PeriodRollup.period_id == current_period.id, PeriodRollup.section == "day")
+        else:
+            summary = LedgerDailySummary
+            daily = select(summary.kind, summary.date, summary.total)
+            if current_period:
+                daily = daily.where(
+                    summary.date.between(
+                        current_period.start_date, current_period.end_date + timedelta(days=1)
+                    )
+                )
+        if current_period:
+            initial_amount = current_period.initial_amount
+
+        daily = daily.subquery()
+        bucket = BALANCE_GRANULARITIES[granularity](daily.c.date)
+        signed_total = case((daily.c.kind == "income", daily.c.total), else_=-daily.c.total)
+        net = (
+            select(bucket.label("bucket"), func.sum(signed_total).label("net"))
+            .group_by(bucket)
+            .subquery()
+        )
+        running_total = func.sum(net.c.net).over(order_by=net.c.bucket, rows=(None, 0))
+        return select(
+            type_coerce(net.c.bucket, Date),
+            net.c.net,
+            type_coerce(literal(initial_amount, MoneyType()) + running_total, MoneyType()).label("balance"),
+        ).order_by(net.c.bucket)
@@ -0,0 +1,92 @@
+from collections import namedtuple
+from dataclasses import dataclass
+
+from imports import QObject, Signal
+
+# Montant à ajouter (ou retirer si négatif) au total d'une catégorie un jour donné.
+LedgerDelta = namedtuple("LedgerDelta", ["category", "date", "amount"])
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """
+    A write committed through a controller.
+
+    Rows are plain dicts of column values read from the database, so they
+    stay valid once the session is closed. Ledger rows also carry the
+    `category` title (see LedgerController).
+
+    Attributes:
+        model (type): The model class of the table written.
+        action (str): "create", "update", "delete", or "bulk" when many rows
+            changed at once (create_many, update_many, delete_many); a "bulk"
+            event carries no rows and listeners must reload what they show.
+        old (dict): The row before the write, None for "create".
+        new (dict): The row after the write, None for "delete".
+    """
+
+    model: type
+    action: str
+    old: dict = None
+    new: dict = None
+
+    @property
+    def amount_delta(self):
+        """Change of the `amount` column, 0 when the table has none."""
+        return (self.new or {}).get("amount", 0) - (self.old or {}).get("amount", 0)
+
+    @property
+    def category(self):
+        """Category title of the row (the old one for a delete)."""
+        return (self.new or self.old or {}).get("category")
+
+    @property
+    def date(self):
+        """Date of the row (the old one for a delete)."""
+        return (self.new or self.old or {}).get("date")
+
+    def deltas(self):
+        """
+        Split the change into per-(category, date) amounts.
+
+        An update that moves a row to another category or day gives two
+        deltas: the old amount removed from its bucket, the new one added to
+        its own.
+
+        Returns:
+            list[LedgerDelta]: Empty for a "bulk" event.
+        """
+        deltas = []
+        if self.old is not None:
+            deltas.append(LedgerDelta(self.old.get("category"), self.old.get("date"), -self.old.get("amount", 0)))
+        if self.new is not None:
+            deltas.append(LedgerDelta(self.new.get("category"), self.new.get("date"), self.new.get("amount", 0)))
+        if len(deltas) == 2 and deltas[0][:2] == deltas[1][:2]:
+            return [LedgerDelta(*deltas[1][:2], self.amount_delta)]
+        return deltas
+
+
+class ChangeBus(QObject):
+    """
+    Process-wide Qt signal announcing the writes committed by controllers.
+
+    Listeners living in the GUI thread receive the events there even when the
+    write ran on a worker thread (queued connection).
+
+    Signals:
+        changed (ChangeEvent): Emitted after each committed write.
+    """
+
+    changed = Signal(object)
+
+    def publish(self, event):
+        """
+        Announce a committed write.
+
+        Args:
+            event (ChangeEvent): The change to announce.
+        """
+        self.changed.emit(event)
+
+
+change_bus = ChangeBus()
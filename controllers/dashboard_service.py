@@ -0,0 +1,198 @@
+from collections import namedtuple
+from dataclasses import dataclass
+from datetime import timedelta
+
+from sqlalchemy import and_, func, literal, select, union_all
+from sqlalchemy.exc import SQLAlchemyError
+
+from controllers.period_context import period_context
+from database.database import session, unit_of_work
+from database.time_buckets import bucket_expression
+from database.top_categories import top_categories
+from models import ExpenseCategoryModel, IncomeCategoryModel, LedgerDailySummary, Money, PeriodRollup
+
+# Mêmes noms d'attributs que les lignes renvoyées par les contrôleurs, pour que
+# les graphiques acceptent indifféremment les unes ou les autres.
+CategoryTotal = namedtuple("CategoryTotal", ["category", "total_amount", "is_remainder"], defaults=(False,))
+IncomeMonth = namedtuple("IncomeMonth", ["month", "total_income"])
+ExpenseMonth = namedtuple("ExpenseMonth", ["month", "total_expense"])
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    """
+    Everything the dashboard shows, read at one point in time.
+
+    Attributes:
+        initial_balance (Money): Opening balance of the current period.
+        total_income (Money): Sum of the incomes of the period.
+        total_expense (Money): Sum of the expenses of the period.
+        income_by_category (tuple[CategoryTotal]): Largest first, the
+            remainder row (`is_remainder`) last.
+        expense_by_category (tuple[CategoryTotal]): Largest first, the
+            remainder row (`is_remainder`) last.
+        income_by_month (tuple[IncomeMonth]): Keyed 'YYYY-MM', in chronological order.
+        expense_by_month (tuple[ExpenseMonth]): Keyed 'YYYY-MM', in chronological order.
+    """
+
+    initial_balance: Money
+    total_income: Money
+    total_expense: Money
+    income_by_category: tuple
+    expense_by_category: tuple
+    income_by_month: tuple
+    expense_by_month: tuple
+
+    @classmethod
+    def empty(cls, initial_balance=Money()):
+        """A snapshot with no transaction, shown until the first one is loaded."""
+        return cls(initial_balance, Money(), Money(), (), (), (), ())
+
+    @property
+    def balance(self):
+        """The current balance of the period."""
+        return self.initial_balance + self.total_income - self.total_expense
+
+
+class DashboardService:
+    """
+    Build the dashboard from `ledger_daily_summary` in a single statement.
+
+    The per-category and per-month series of both kinds are read with one
+    UNION ALL query; the totals are derived from the monthly series and the
+    initial balance comes from `period_context`. A closed period is read from
+    its frozen rows in `period_rollups` instead.
+
+    Attributes:
+        top_n (int): Number of categories kept in the by-category series,
+            the others being summed in one remainder row. None keeps them all.
+    """
+
+    def __init__(self, top_n=None):
+        self.top_n = top_n
+
+    @unit_of_work
+    def snapshot(self):
+        """
+        Read the dashboard data of the current period.
+
+        Returns:
+            DashboardSnapshot: The immutable dashboard data.
+        """
+        try:
+            current_period = period_context.current
+            if current_period and current_period.is_closed:
+                statement = self._rollup_statement(current_period)
+            else:
+                statement = self._statement(current_period)
+            rows = session.execute(statement).all()
+        except SQLAlchemyError as e:
+            raise
+
+        by_category = {"income": [], "expense": []}
+        by_month = {"income": [], "expense": []}
+        for section, kind, label, total, is_remainder in rows:
+            if section == "category":
+                by_category[kind].append(CategoryTotal(label, total, bool(is_remainder)))
+            else:
+                by_month[kind].append((label, total))
+        for series in by_category.values():
+            # Ordre de controller.get_totals_by_category : le reste en dernier.
+            series.sort(key=lambda item: (item.is_remainder, -item.total_amount, item.category))
+
+        income_by_month = tuple(IncomeMonth(*item) for item in sorted(by_month["income"]))
+        expense_by_month = tuple(ExpenseMonth(*item) for item in sorted(by_month["expense"]))
+        return DashboardSnapshot(
+            initial_balance=current_period.initial_amount if current_period else Money(),
+            total_income=sum((item.total_income for item in income_by_month), Money()),
+            total_expense=sum((item.total_expense for item in expense_by_month), Money()),
+            income_by_category=tuple(by_category["income"]),
+            expense_by_category=tuple(by_category["expense"]),
+            income_by_month=income_by_month,
+            expense_by_month=expense_by_month,
+        )
+
+    def _statement(self, current_period):
+        summary = LedgerDailySummary
+        period_filter = []
+        if current_period:
+            period_filter.append(
+                summary.date.between(
+                    current_period.start_date, current_period.end_date + timedelta(days=1)
+                )
+            )
+
+        # Agréger par category_id d'abord : les titres ne sont joints que sur
+        # les quelques lignes obtenues.
+        totals = (
+            select(
+                summary.kind,
+                summary.category_id,
+                func.sum(summary.total).label("total"),
+            )
+            .where(*period_filter)
+            .group_by(summary.kind, summary.category_id)
+            .subquery()
+        )
+        labelled = (
+            select(
+                totals.c.kind,
+                func.coalesce(IncomeCategoryModel.title, ExpenseCategoryModel.title).label("label"),
+                totals.c.total,
+            )
+            .select_from(totals)
+            .outerjoin(
+                IncomeCategoryModel,
+                and_(totals.c.kind == "income", IncomeCategoryModel.id == totals.c.category_id),
+            )
+            .outerjoin(
+                ExpenseCategoryModel,
+                and_(totals.c.kind == "expense", ExpenseCategoryModel.id == totals.c.category_id),
+            )
+        )
+        by_category = self._category_rows(labelled)
+
+        month = bucket_expression(summary.date, "month")
+        by_month = (
+            select(
+                literal("month").label("section"),
+                summary.kind,
+                month.label("label"),
+                func.sum(summary.total).label("total"),
+                literal(False).label("is_remainder"),
+            )
+            .where(*period_filter)
+            .group_by(summary.kind, month)
+        )
+        return union_all(by_category, by_month)
+
+    def _rollup_statement(self, current_period):
+        rollup = PeriodRollup
+        # Même forme de lignes que _statement : (section, kind, label, total, is_remainder).
+        by_category = self._category_rows(
+            select(rollup.kind, rollup.label, rollup.total).where(
+                rollup.period_id == current_period.id, rollup.section == "category"
+            )
+        )
+        by_month = select(
+            literal("month").label("section"), rollup.kind, rollup.bucket, rollup.total, literal(False)
+        ).where(
+            rollup.period_id == current_period.id, rollup.section == "month"
+        )
+        return union_all(by_category, by_month)
+
+    def _category_rows(self, labelled):
+        """Rows (section, kind, label, total, is_remainder) of a (kind, label, total) select, cut to top_n."""
+        labelled = labelled.subquery()
+        if self.top_n is None:
+            return select(
+                literal("category").label("section"),
+                labelled.c.kind,
+                labelled.c.label,
+                labelled.c.total,
+                literal(False).label("is_remainder"),
+            )
+        ranked = top_categories(labelled, self.top_n, "kind").subquery()
+        return select(
+            literal("category").label("section"), ranked.c.kind, ranked.c.label, ranked.c.total, ranked.c.is_remainder
+        )
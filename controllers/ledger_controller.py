@@ -0,0 +1,268 @@
+from datetime import timedelta
+
+from sqlalchemy import bindparam, func, literal, select, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from controllers.base_controller import BaseController
+from database.database import session, unit_of_work
+from database.full_text import FTS_TABLE, LEDGER_TABLES, match_expression
+from database.ledger_summary import LEDGER_KINDS
+from database.time_buckets import bucket_expression
+from database.top_categories import top_categories
+from models.ledger_summary import LedgerDailySummary
+from models.money import Money
+from models.period_rollup import PeriodRollup
+
+
+class LedgerController(BaseController):
+    """
+    Base controller for the ledger tables (incomes and expenses).
+
+    Attributes:
+        category_model (type): The category model of the ledger table.
+        kind (str): The `kind` of the ledger in `ledger_daily_summary`.
+    """
+
+    def __init__(self, model, category_model):
+        super().__init__(model=model)
+        self.category_model = category_model
+        self.kind = LEDGER_KINDS[model.__tablename__]
+        self._fts_offset = LEDGER_TABLES[model.__tablename__][1]
+
+    def _summary_query(self, *columns, period=None):
+        """
+        Query `ledger_daily_summary` rows of this ledger in a period.
+
+        Args:
+            columns: The columns or aggregates to select.
+            period (tuple, optional): (start_date, end_date). Defaults to the
+                current period.
+        """
+        query = session.query(*columns).select_from(LedgerDailySummary).filter(
+            LedgerDailySummary.kind == self.kind
+        )
+        if period is None:
+            current_period = self.get_current_period()
+            if current_period:
+                period = (current_period.start_date, current_period.end_date)
+        if period:
+            start_date, end_date = period
+            query = query.filter(
+                LedgerDailySummary.date.between(start_date, end_date + timedelta(days=1))
+            )
+        return query
+
+    def _closed_period(self, period=None):
+        """
+        Return the current period when the figures must come from its rollup.
+
+        Args:
+            period (tuple, optional): The period asked by the caller; an
+                explicit period is always read from the live summary.
+
+        Returns:
+            PeriodBounds: The current period if it is closed and `period` is
+            None, else None.
+        """
+        if period is not None:
+            return None
+        current_period = self.get_current_period()
+        return current_period if current_period and current_period.is_closed else None
+
+    def _rollup_query(self, *columns, closed_period, section):
+        """Query the `period_rollups` rows of this ledger in one section of a closed period."""
+        return session.query(*columns).filter(
+            PeriodRollup.period_id == closed_period.id,
+            PeriodRollup.kind == self.kind,
+            PeriodRollup.section == section,
+        )
+
+    @unit_of_work
+    def get_total(self, period=None):
+        """
+        Fetch the total amount of the ledger.
+
+        A closed current period is read from its rollup (`period_rollups`).
+
+        Args:
+            period (tuple, optional): (start_date, end_date). Defaults to the
+                current period; without a current period the whole history
+                is used.
+
+        Returns:
+            Money: The total amount.
+        """
+        try:
+            closed_period = self._closed_period(period)
+            if closed_period:
+                query = self._rollup_query(PeriodRollup.total, closed_period=closed_period, section="total")
+            else:
+                query = self._summary_query(func.sum(LedgerDailySummary.total), period=period)
+            total = query.scalar()
+            return total if total is not None else Money()
+        except SQLAlchemyError as e:
+            raise
+
+    @unit_of_work
+    def get_totals_by_bucket(self, granularity="month", period=None):
+        """
+        Fetch the totals of the ledger grouped by time bucket.
+
+        The buckets are computed by SQLite from `ledger_daily_summary`, read
+        through its (kind, date) index over the date range, and their keys
+        hold the year (see `database/time_buckets.py`). A closed current
+        period is read from the `day` rows of its rollup.
+
+        Args:
+            granularity (str, optional): "day", "week", "month", "quarter" or
+                "year". Defaults to "month".
+            period (tuple, optional): (start_date, end_date). Defaults to the
+                current period; without a current period the whole history
+                is used.
+
+        Returns:
+            A list of rows (<granularity>, total_<kind>), e.g. (month,
+            total_income), in chronological order.
+
+        Raises:
+            ValueError: If the granularity is unknown.
+        """
+        try:
+            closed_period = self._closed_period(period)
+            if closed_period:
+                daily = self._rollup_query(
+                    PeriodRollup.bucket.label("date"), PeriodRollup.total, closed_period=closed_period, section="day"
+                ).subquery()
+            else:
+                # Regrouper par jour d'abord : la clé n'est calculée qu'une fois par date.
+                daily = (
+                    self._summary_query(
+                        LedgerDailySummary.date, func.sum(LedgerDailySummary.total).label("total"), period=period
+                    )
+                    .group_by(LedgerDailySummary.date)
+                    .subquery()
+                )
+            bucket = bucket_expression(daily.c.date, granularity).label(granularity)
+            return (
+                session.query(bucket, func.sum(daily.c.total).label(f"total_{self.kind}"))
+                .group_by(bucket)
+                .order_by(bucket)
+                .all()
+            )
+        except SQLAlchemyError as e:
+            raise
+
+    @unit_of_work
+    def get_totals_by_category(self, top_n=None, period=None):
+        """
+        Fetch the totals of the ledger grouped by category.
+
+        The totals are summed per category_id in `ledger_daily_summary`
+        before the titles are joined. With `top_n`, SQLite also ranks them and
+        sums every category after the first `top_n` into one remainder row
+        (see `database/top_categories.py`). A closed current period is read
+        from the `category` rows of its rollup, with the titles it froze.
+
+        Args:
+            top_n (int, optional): Number of categories kept. Defaults to all.
+            period (tuple, optional): (start_date, end_date). Defaults to the
+                current period; without a current period the whole history
+                is used.
+
+        Returns:
+            A list of rows (category, total_amount, is_remainder), the largest
+            first and the remainder row, the only one with `is_remainder`
+            true, last.
+
+        Raises:
+            ValueError: If top_n is smaller than 1.
+        """
+        try:
+            closed_period = self._closed_period(period)
+            if closed_period:
+                labelled = self._rollup_query(
+                    PeriodRollup.label.label("label"), PeriodRollup.total, closed_period=closed_period, section="category"
+                ).subquery()
+            else:
+                summary = LedgerDailySummary
+                totals = (
+                    self._summary_query(summary.category_id, func.sum(summary.total).label("total"), period=period)
+                    .group_by(summary.category_id)
+                    .subquery()
+                )
+                labelled = (
+                    select(self.category_model.title.label("label"), totals.c.total)
+                    .join_from(totals, self.category_model, self.category_model.id == totals.c.category_id)
+                    .subquery()
+                )
+            if top_n is None:
+                return (
+                    session.query(
+                        labelled.c.label.label("category"),
+                        labelled.c.total.label("total_amount"),
+                        literal(False).label("is_remainder"),
+                    )
+                    .order_by(labelled.c.total.desc(), labelled.c.label)
+                    .all()
+                )
+            ranked = top_categories(labelled, top_n).subquery()
+            return (
+                session.query(
+                    ranked.c.label.label("category"),
+                    ranked.c.total.label("total_amount"),
+                    ranked.c.is_remainder,
+                )
+                .order_by(ranked.c.slot)
+                .all()
+            )
+        except SQLAlchemyError as e:
+            raise
+
+    def _row_values(self, instance):
+        # Les graphiques regroupent par titre de catégorie : on le joint à
+        # l'événement pour qu'ils n'aient pas à le relire.
+        values = super()._row_values(instance)
+        category = session.get(self.category_model, values["category_id"])
+        values["category"] = category.title if category is not None else None
+        return values
+
+    @unit_of_work
+    def full_text_search(self, query, limit=50):
+        """
+        Search descriptions and category titles through the FTS5 index.
+
+        Words are matched as prefixes, ignoring case and accents, across every
+        period. Results are ranked by relevance (bm25).
+
+        Args:
+            query (str): The text typed by the user.
+            limit (int, optional): Maximum number of results. Defaults to 50.
+
+        Returns:
+            A list of model instances, the most relevant first.
+        """
+        expression = match_expression(query)
+        if expression is None:
+            return []
+        try:
+            statement = text(
+                f"SELECT rowid FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH :expression AND rowid % 2 = :offset "
+                "ORDER BY rank LIMIT :limit"
+            ).bindparams(bindparam("expression"), bindparam("offset"), bindparam("limit"))
+            ids = [
+                rowid // 2
+                for rowid in session.execute(
+                    statement,
+                    {"expression": expression, "offset": self._fts_offset, "limit": limit},
+                ).scalars()
+            ]
+            if not ids:
+                return []
+            records = {
+                record.id: record
+                for record in session.query(self.model).filter(self.model.id.in_(ids))
+            }
+            return [records[id_] for id_ in ids if id_ in records]
+        except SQLAlchemyError as e:
+            raise
@@ -0,0 +1,109 @@
+import threading
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from database.database import session, session_scope
+from database.period_rollup import CLOSED_STATUS
+from models.cash_box_period import CashBoxPeriod
+from models.money import Money
+from utils.utils import read_id_from_file, write_id_to_file
+
+
+@dataclass(frozen=True)
+class PeriodBounds:
+    """
+    The active cash box period, as plain values.
+
+    Attributes:
+        id (int): The id of the period.
+        start_date (date): First day of the period.
+        end_date (date): Last day of the period.
+        initial_amount (Money): The opening balance.
+        is_closed (bool): True once the period is closed; its figures are
+            then read from `period_rollups`.
+    """
+
+    id: int
+    start_date: date
+    end_date: date
+    initial_amount: Money
+    is_closed: bool = False
+
+    def contains(self, day):
+        """
+        Tell whether `day` is counted in the period.
+
+        Uses the same bounds as the controller queries, which include the day
+        after `end_date`.
+
+        Args:
+            day (date): The date of a transaction.
+        """
+        return self.start_date <= day <= self.end_date + timedelta(days=1)
+
+
+class PeriodContext:
+    """
+    Process-wide cache of the active cash box period.
+
+    The period id is read from `current_period_data.ksb` and the period row
+    loaded once, then kept until `invalidate` is called: when the user picks
+    another period or when a period is written through
+    CashBoxPeriodController.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bounds = None
+        self._loaded = False
+
+    @property
+    def current(self):
+        """
+        Return the active period, loading it on first use.
+
+        Returns:
+            PeriodBounds: The active period, or None if there is none.
+        """
+        with self._lock:
+            if not self._loaded:
+                self._bounds = self._load()
+                self._loaded = True
+            return self._bounds
+
+    def invalidate(self):
+        """Forget the cached period; the next access reloads it."""
+        with self._lock:
+            self._bounds = None
+            self._loaded = False
+
+    def switch_to(self, period_id):
+        """
+        Make `period_id` the active period.
+
+        Args:
+            period_id (int): The id of the period chosen by the user.
+        """
+        write_id_to_file(str(period_id))
+        self.invalidate()
+
+    def _load(self):
+        with session_scope():
+            row = (
+                session.query(
+                    CashBoxPeriod.id,
+                    CashBoxPeriod.start_date,
+                    CashBoxPeriod.end_date,
+                    CashBoxPeriod.initial_amount,
+                    CashBoxPeriod.is_open,
+                )
+                .filter(CashBoxPeriod.id == read_id_from_file())
+                .first()
+            )
+        if row is None:
+            return None
+        *bounds, status = row
+        return PeriodBounds(*bounds, is_closed=status == CLOSED_STATUS)
+
+
+period_context = PeriodContext()
@@ -1,5 +1,5 @@
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from database.database import session  
+from database.database import session, unit_of_work
 from models.user import User
 from utils.hashing import hash_text, verify_hashed_text
 
@@ -7,6 +7,7 @@ class UserController:
     def __init__(self):
         self.model = User
 
+    @unit_of_work
     def create_user(self, username: str, password: str, secret_question: str, secret_answer: str):
         """
         Create a new user secret question and answer.
@@ -28,6 +29,7 @@ class UserController:
             session.rollback()
             raise e
 
+    @unit_of_work
     def authenticate_user(self, username: str, password: str):
         """
         Authenticate a user with their username and password.
@@ -40,6 +42,7 @@ class UserController:
         except SQLAlchemyError as e:
             raise e
 
+    @unit_of_work
     def change_password(self, username: str, new_password: str):
         """
         Change the password for an existing user.
@@ -56,6 +59,7 @@ class UserController:
             session.rollback()
             raise e
 
+    @unit_of_work
     def set_secret_question(self, username: str, question: str, answer: str):
         """
         Set the secret question and answer for a user.
@@ -72,6 +76,7 @@ class UserController:
             session.rollback()
             raise e
 
+    @unit_of_work
     def verify_secret_answer(self, username: str, answer: str):
         """
         Verify the secret answer for a user.
@@ -84,6 +89,7 @@ class UserController:
         except SQLAlchemyError as e:
             raise e
         
+    @unit_of_work
     def get_secret_question(self, username: str):
         """
         Returns the secret question for a entered username.
@@ -96,6 +102,7 @@ class UserController:
         except SQLAlchemyError as e:
             raise e
 
+    @unit_of_work
     def reset_password(self, username: str, new_password: str, answer: str):
         """
         Reset the password for a user after verifying the secret answer.
@@ -112,6 +119,7 @@ class UserController:
             session.rollback()
             raise e
 
+    @unit_of_work
     def get_user(self, username: str):
         """
         Retrieve a user by their username.
@@ -1,17 +1,34 @@
 from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+
 from database.database import Base, engine, DB_DIR
 from models.user import User
 from models.audit_model import AuditLog
 from models import IncomeCategoryModel, IncomeModel, ExpenseCategoryModel, ExpenseModel, CashBoxPeriod
 
+ROOT_DIR = DB_DIR.parent
+
+
+def upgrade_database(revision="head"):
+    """
+    Apply the Alembic migrations to the application database.
+
+    Args:
+        revision (str, optional): The target revision. Defaults to "head".
+    """
+    config = Config(str(ROOT_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT_DIR / "migrations"))
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, revision)
+
+
 def check_and_create_db():
-    """Checks if the database exists; if not, creates it.
+    """Creates the database if needed and brings its schema up to date.
     """
-    db_file_path = DB_DIR / 'db.db'
-    
-    if not db_file_path.exists():
-        try:
-            Base.metadata.create_all(bind=engine)
-        except Exception as e:
-            print(f"Error occurred while creating the database: {e}")    
-            
+    try:
+        upgrade_database()
+    except Exception as e:
+        print(f"Error occurred while creating the database: {e}")
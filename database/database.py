@@ -1,13 +1,135 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from functools import wraps
 from pathlib import Path
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
+
+from database.sqlite_profile import apply_sqlite_profile, resolve_sqlite_profile
+from utils.utils import read_config_file_data
 
 DB_DIR = Path(__file__).parent
 
-DATABASE_URL = f"sqlite:///{DB_DIR}/db.db"
+DATABASE_URL = os.environ.get("CASH_BOX_DATABASE_URL", f"sqlite:///{DB_DIR}/db.db")
 
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+SQLITE_PRAGMAS = resolve_sqlite_profile(read_config_file_data())
+
+
+@event.listens_for(engine, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    apply_sqlite_profile(dbapi_connection, SQLITE_PRAGMAS)
+    # pysqlite ouvre ses transactions lui-même et casse les SAVEPOINT :
+    # on le passe en autocommit et SQLAlchemy émet BEGIN (cf. _on_begin).
+    dbapi_connection.isolation_level = None
+    # lower() et LIKE de SQLite ne convertissent que l'ASCII : "É" resterait "É".
+    dbapi_connection.create_function("py_lower", 1, _py_lower, deterministic=True)
+
+
+def _py_lower(value):
+    return value.lower() if isinstance(value, str) else value
+
+
+@event.listens_for(engine, "begin")
+def _on_begin(connection):
+    connection.exec_driver_sql("BEGIN")
+
+
 SessionLocal  = sessionmaker(bind=engine, autocommit=False, autoflush=False)
-session = SessionLocal()
+
+# Chaque thread obtient sa propre session (GUI, chargements en arrière-plan...).
+session = scoped_session(SessionLocal)
 Base = declarative_base()
+
+_scope = threading.local()
+
+
+@contextmanager
+def session_scope():
+    """
+    Open a unit of work on the current thread.
+
+    Every controller call made inside the block reuses the same session, so a
+    single UI action keeps one connection and one identity map across all of
+    its queries. Scopes can be nested; the session is only released when the
+    outermost scope exits.
+
+    Yields:
+        Session: The session bound to the current thread.
+    """
+    depth = getattr(_scope, "depth", 0)
+    _scope.depth = depth + 1
+    try:
+        yield session()
+    finally:
+        _scope.depth = depth
+        if depth == 0:
+            session.remove()
+
+
+def unit_of_work(func):
+    """
+    Decorator running a controller method inside `session_scope`.
+
+    Args:
+        func (callable): The method to wrap.
+
+    Returns:
+        callable: The wrapped method.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with session_scope():
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def backup_database(destination):
+    """
+    Copy the live database into `destination` with the SQLite backup API.
+
+    The copy is a consistent snapshot, including the transactions that still
+    live in the WAL journal, taken while the application keeps running.
+
+    Args:
+        destination (str | Path): The backup file, created or replaced.
+    """
+    source = engine.raw_connection()
+    try:
+        target = sqlite3.connect(destination)
+        try:
+            source.driver_connection.backup(target)
+        finally:
+            target.close()
+    finally:
+        source.close()
+
+
+def restore_database(source):
+    """
+    Replace the content of the live database with a backup file.
+
+    The pages of `source` are written into the open database with the SQLite
+    backup API, so its WAL journal stays consistent. The caller must first
+    stop every other user of the database (audit writer, background workers).
+
+    Args:
+        source (str | Path): The backup file to restore.
+    """
+    # Les connexions du pool ne doivent garder aucun cache de l'ancienne base.
+    engine.dispose()
+    backup = sqlite3.connect(source)
+    try:
+        target = engine.raw_connection()
+        try:
+            backup.backup(target.driver_connection)
+        finally:
+            target.close()
+    finally:
+        backup.close()
+    engine.dispose()
@@ -0,0 +1,168 @@
+"""
+FTS5 full-text index over the ledger (incomes and expenses).
+
+`ledger_fts` holds one row per transaction: its description and the title of
+its category. SQLite triggers keep it in sync with `incomes`, `expenses` and
+the category tables, so the application never writes to it directly.
+
+The rowid of an FTS row encodes the transaction: `id * 2` for an income and
+`id * 2 + 1` for an expense.
+
+Rebuild the index of an existing database with:
+
+    python -m database.full_text
+"""
+import re
+
+from sqlalchemy import text
+
+from database.database import engine
+
+FTS_TABLE = "ledger_fts"
+
+# table du grand livre -> (table des catégories, décalage du rowid)
+LEDGER_TABLES = {
+    "incomes": ("income_categories", 0),
+    "expenses": ("expense_categories", 1),
+}
+
+# remove_diacritics 2 : "electricite" trouve "Électricité" ; les index de
+# préfixe accélèrent la recherche pendant la saisie ("élec*").
+CREATE_FTS_TABLE = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+    description,
+    category,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def _rowid(alias, offset):
+    return f"{alias}.id * 2 + {offset}"
+
+
+def _triggers(table, category_table, offset):
+    category = f"(SELECT title FROM {category_table} WHERE id = new.category_id)"
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table}
+        BEGIN
+            INSERT INTO {FTS_TABLE} (rowid, description, category)
+            VALUES ({_rowid("new", offset)}, new.description, {category});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_fts_update
+        AFTER UPDATE OF description, category_id ON {table}
+        BEGIN
+            UPDATE {FTS_TABLE}
+            SET description = new.description, category = {category}
+            WHERE rowid = {_rowid("new", offset)};
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table}
+        BEGIN
+            DELETE FROM {FTS_TABLE} WHERE rowid = {_rowid("old", offset)};
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {category_table}_fts_update
+        AFTER UPDATE OF title ON {category_table}
+        BEGIN
+            UPDATE {FTS_TABLE} SET category = new.title
+            WHERE rowid IN (
+                SELECT {_rowid(table, offset)} FROM {table} WHERE category_id = new.id
+            );
+        END
+        """,
+    ]
+
+
+def _trigger_names(table, category_table):
+    return [
+        f"{table}_fts_insert",
+        f"{table}_fts_update",
+        f"{table}_fts_delete",
+        f"{category_table}_fts_update",
+    ]
+
+
+CREATE_FTS_TRIGGERS = [
+    statement
+    for table, (category_table, offset) in LEDGER_TABLES.items()
+    for statement in _triggers(table, category_table, offset)
+]
+
+DROP_FTS_TRIGGERS = [
+    f"DROP TRIGGER IF EXISTS {name}"
+    for table, (category_table, _) in LEDGER_TABLES.items()
+    for name in _trigger_names(table, category_table)
+]
+
+DROP_FTS_TABLE = f"DROP TABLE IF EXISTS {FTS_TABLE}"
+
+
+def populate_statements():
+    """
+    Return the statements that refill `ledger_fts` from the ledger tables.
+
+    Returns:
+        list[str]: SQL statements, to run in order in one transaction.
+    """
+    statements = [f"DELETE FROM {FTS_TABLE}"]
+    for table, (category_table, offset) in LEDGER_TABLES.items():
+        statements.append(
+            f"""
+            INSERT INTO {FTS_TABLE} (rowid, description, category)
+            SELECT {_rowid("t", offset)}, t.description, c.title
+            FROM {table} AS t LEFT JOIN {category_table} AS c ON c.id = t.category_id
+            """
+        )
+    return statements
+
+
+def rebuild_full_text_index(bind=engine):
+    """
+    Recreate `ledger_fts` and its triggers if needed, then refill it.
+
+    Args:
+        bind (Engine, optional): The database to rebuild. Defaults to the
+            application engine.
+
+    Returns:
+        int: The number of indexed transactions.
+    """
+    with bind.begin() as connection:
+        connection.exec_driver_sql(CREATE_FTS_TABLE)
+        for statement in CREATE_FTS_TRIGGERS + populate_statements():
+            connection.exec_driver_sql(statement)
+        connection.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+        return connection.execute(text(f"SELECT count(*) FROM {FTS_TABLE}")).scalar()
+
+
+def match_expression(query):
+    """
+    Turn the text typed by the user into an FTS5 MATCH expression.
+
+    Every word must appear (implicit AND), each one matched as a prefix so
+    results follow the user while they type. FTS5 operators and punctuation
+    are ignored.
+
+    Args:
+        query (str): The text typed by the user.
+
+    Returns:
+        str | None: The MATCH expression, or None when `query` has no word.
+    """
+    words = TOKEN.findall(query or "")
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+if __name__ == "__main__":
+    print(f"{rebuild_full_text_index()} opérations indexées dans {FTS_TABLE}.")
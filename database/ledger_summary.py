@@ -0,0 +1,181 @@
+"""
+Daily per-category summary of the ledger (incomes and expenses).
+
+`ledger_daily_summary` holds one row per (kind, date, category_id) with the
+number and the total amount (in minor units, like the ledger amounts) of the
+matching transactions. SQLite triggers update it in the same transaction as
+every insert, update and delete on `incomes` and `expenses` (controller
+writes, bulk writes and cascades alike), so dashboard aggregates read days x
+categories rows instead of every transaction.
+
+Check the table against the ledger, or rebuild it, with:
+
+    python -m database.ledger_summary verify
+    python -m database.ledger_summary rebuild
+"""
+import sys
+
+from sqlalchemy import text
+
+from database.database import engine
+
+SUMMARY_TABLE = "ledger_daily_summary"
+
+# table du grand livre -> valeur de la colonne `kind`
+LEDGER_KINDS = {
+    "incomes": "income",
+    "expenses": "expense",
+}
+
+CREATE_SUMMARY_TABLE = f"""
+CREATE TABLE IF NOT EXISTS {SUMMARY_TABLE} (
+    kind VARCHAR(10) NOT NULL,
+    date DATE NOT NULL,
+    category_id INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (kind, date, category_id)
+)
+"""
+
+
+def _add(kind, row):
+    return f"""
+            INSERT INTO {SUMMARY_TABLE} (kind, date, category_id, count, total)
+            VALUES ('{kind}', {row}.date, {row}.category_id, 1, {row}.amount)
+            ON CONFLICT (kind, date, category_id)
+            DO UPDATE SET count = count + 1, total = total + excluded.total;"""
+
+
+def _remove(kind, row):
+    key = f"kind = '{kind}' AND date = {row}.date AND category_id = {row}.category_id"
+    return f"""
+            UPDATE {SUMMARY_TABLE} SET count = count - 1, total = total - {row}.amount
+            WHERE {key};
+            DELETE FROM {SUMMARY_TABLE} WHERE {key} AND count <= 0;"""
+
+
+def _triggers(table, kind):
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_summary_insert AFTER INSERT ON {table}
+        BEGIN{_add(kind, "new")}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_summary_update
+        AFTER UPDATE OF amount, date, category_id ON {table}
+        BEGIN{_remove(kind, "old")}{_add(kind, "new")}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_summary_delete AFTER DELETE ON {table}
+        BEGIN{_remove(kind, "old")}
+        END
+        """,
+    ]
+
+
+CREATE_SUMMARY_TRIGGERS = [
+    statement
+    for table, kind in LEDGER_KINDS.items()
+    for statement in _triggers(table, kind)
+]
+
+DROP_SUMMARY_TRIGGERS = [
+    f"DROP TRIGGER IF EXISTS {table}_summary_{event}"
+    for table in LEDGER_KINDS
+    for event in ("insert", "update", "delete")
+]
+
+DROP_SUMMARY_TABLE = f"DROP TABLE IF EXISTS {SUMMARY_TABLE}"
+
+
+def _expected_rows():
+    return " UNION ALL ".join(
+        f"SELECT '{kind}' AS kind, date, category_id, count(*) AS count, sum(amount) AS total "
+        f"FROM {table} GROUP BY date, category_id"
+        for table, kind in LEDGER_KINDS.items()
+    )
+
+
+def populate_statements():
+    """
+    Return the statements that refill `ledger_daily_summary` from the ledger.
+
+    Returns:
+        list[str]: SQL statements, to run in order in one transaction.
+    """
+    return [
+        f"DELETE FROM {SUMMARY_TABLE}",
+        f"INSERT INTO {SUMMARY_TABLE} (kind, date, category_id, count, total) {_expected_rows()}",
+    ]
+
+
+VERIFY_SUMMARY = f"""
+WITH expected AS ({_expected_rows()})
+SELECT e.kind, e.date, e.category_id, e.count, e.total, s.count, s.total
+FROM expected AS e
+LEFT JOIN {SUMMARY_TABLE} AS s
+    ON s.kind = e.kind AND s.date = e.date AND s.category_id = e.category_id
+WHERE s.kind IS NULL OR s.count != e.count OR s.total != e.total
+UNION ALL
+SELECT s.kind, s.date, s.category_id, NULL, NULL, s.count, s.total
+FROM {SUMMARY_TABLE} AS s
+WHERE NOT EXISTS (
+    SELECT 1 FROM expected AS e
+    WHERE e.kind = s.kind AND e.date = s.date AND e.category_id = s.category_id
+)
+"""
+
+
+def verify_ledger_summary(bind=engine):
+    """
+    Compare `ledger_daily_summary` with the ledger tables.
+
+    Args:
+        bind (Engine, optional): The database to check. Defaults to the
+            application engine.
+
+    Returns:
+        list[tuple]: One row per drifted key: kind, date, category_id, the
+        expected count and total, then the stored count and total (None when
+        the row is missing on one side). Empty when the summary is exact.
+    """
+    with bind.connect() as connection:
+        return [
+            tuple(row)
+            for row in connection.execute(text(VERIFY_SUMMARY))
+        ]
+
+
+def rebuild_ledger_summary(bind=engine):
+    """
+    Recreate `ledger_daily_summary` and its triggers if needed, then refill it.
+
+    Args:
+        bind (Engine, optional): The database to rebuild. Defaults to the
+            application engine.
+
+    Returns:
+        int: The number of summary rows.
+    """
+    with bind.begin() as connection:
+        connection.exec_driver_sql(CREATE_SUMMARY_TABLE)
+        for statement in CREATE_SUMMARY_TRIGGERS + populate_statements():
+            connection.exec_driver_sql(statement)
+        return connection.execute(text(f"SELECT count(*) FROM {SUMMARY_TABLE}")).scalar()
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "verify"
+    if command == "rebuild":
+        print(f"{rebuild_ledger_summary()} lignes recalculées dans {SUMMARY_TABLE}.")
+    elif command == "verify":
+        drift = verify_ledger_summary()
+        for row in drift:
+            print("Écart :", row)
+        print(f"{len(drift)} écart(s) dans {SUMMARY_TABLE}.")
+        sys.exit(1 if drift else 0)
+    else:
+        sys.exit(f"Commande inconnue : {command} (verify ou rebuild)")
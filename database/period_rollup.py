@@ -0,0 +1,190 @@
+"""
+Frozen aggregates of the closed cash box periods.
+
+When a period is closed, `period_rollups` receives its figures for each kind
+(income or expense): one `total` row, one `category` row per category
+(bucket = category_id, label = its title at closing time), one `month` row
+per month (bucket = 'YYYY-MM') and one `day` row per day with transactions
+(bucket = 'YYYY-MM-DD'), each with the number and the total amount of the
+transactions. Reports, the controller totals and the dashboard (balance
+series included) read a closed period from these rows only; they are
+dropped when the period is reopened.
+
+The rollup is frozen: a transaction written later in the dates of a closed
+period is not added to it. Compare the rollups with the ledger with:
+
+    python -m database.period_rollup verify [period_id]
+"""
+import sys
+from datetime import timedelta
+
+from sqlalchemy import Date, bindparam, text
+
+from database.database import engine
+from database.ledger_summary import LEDGER_KINDS, SUMMARY_TABLE
+
+ROLLUP_TABLE = "period_rollups"
+
+CLOSED_STATUS = "Fermé"
+
+CREATE_ROLLUP_TABLE = f"""
+CREATE TABLE IF NOT EXISTS {ROLLUP_TABLE} (
+    period_id INTEGER NOT NULL REFERENCES cash_box_period (id) ON DELETE CASCADE,
+    kind VARCHAR(10) NOT NULL,
+    section VARCHAR(10) NOT NULL,
+    bucket VARCHAR(20) NOT NULL,
+    label VARCHAR(50),
+    count INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (period_id, kind, section, bucket)
+)
+"""
+
+DROP_ROLLUP_TABLE = f"DROP TABLE IF EXISTS {ROLLUP_TABLE}"
+
+# Chaque transaction du grand livre, sous la forme d'une ligne du résumé journalier.
+LEDGER_ROWS = " UNION ALL ".join(
+    f"SELECT '{kind}' AS kind, date, category_id, 1 AS count, amount AS total FROM {table}"
+    for table, kind in LEDGER_KINDS.items()
+)
+
+
+def _rollup_rows(source):
+    """
+    SELECT computing the rollup rows of the period :start - :end from `source`.
+
+    `source` has the columns of `ledger_daily_summary`: the summary itself
+    when a period is closed, the raw ledger when it is verified.
+    """
+    period = "date BETWEEN :start AND :end"
+    return f"""
+        SELECT kind, 'total' AS section, '' AS bucket, NULL AS label,
+               sum(count) AS count, sum(total) AS total
+        FROM ({source}) WHERE {period} GROUP BY kind
+        UNION ALL
+        SELECT s.kind, 'category', CAST(s.category_id AS TEXT), coalesce(ic.title, ec.title),
+               sum(s.count), sum(s.total)
+        FROM ({source}) AS s
+        LEFT JOIN income_categories AS ic ON s.kind = 'income' AND ic.id = s.category_id
+        LEFT JOIN expense_categories AS ec ON s.kind = 'expense' AND ec.id = s.category_id
+        WHERE s.{period} GROUP BY s.kind, s.category_id
+        UNION ALL
+        SELECT kind, 'month', substr(date, 1, 7), NULL, sum(count), sum(total)
+        FROM ({source}) WHERE {period} GROUP BY kind, substr(date, 1, 7)
+        UNION ALL
+        SELECT kind, 'day', substr(date, 1, 10), NULL, sum(count), sum(total)
+        FROM ({source}) WHERE {period} GROUP BY kind, substr(date, 1, 10)"""
+
+
+def _period_params(statement):
+    return statement.bindparams(bindparam("start", type_=Date), bindparam("end", type_=Date))
+
+
+FREEZE_ROLLUP = _period_params(text(
+    f"INSERT INTO {ROLLUP_TABLE} (period_id, kind, section, bucket, label, count, total) "
+    f"SELECT :period_id, * FROM ({_rollup_rows(f'SELECT * FROM {SUMMARY_TABLE}')})"
+))
+
+DROP_PERIOD_ROLLUP = text(f"DELETE FROM {ROLLUP_TABLE} WHERE period_id = :period_id")
+
+VERIFY_ROLLUP = _period_params(text(f"""
+WITH expected AS ({_rollup_rows(LEDGER_ROWS)}),
+stored AS (SELECT * FROM {ROLLUP_TABLE} WHERE period_id = :period_id)
+SELECT e.kind, e.section, e.bucket, e.count, e.total, s.count, s.total
+FROM expected AS e
+LEFT JOIN stored AS s ON s.kind = e.kind AND s.section = e.section AND s.bucket = e.bucket
+WHERE s.kind IS NULL OR s.count != e.count OR s.total != e.total
+UNION ALL
+SELECT s.kind, s.section, s.bucket, NULL, NULL, s.count, s.total
+FROM stored AS s
+WHERE NOT EXISTS (
+    SELECT 1 FROM expected AS e
+    WHERE e.kind = s.kind AND e.section = s.section AND e.bucket = s.bucket
+)
+"""))
+
+CLOSED_PERIODS = text(
+    "SELECT id, start_date, end_date FROM cash_box_period WHERE is_open = :status"
+).bindparams(bindparam("status", CLOSED_STATUS)).columns(start_date=Date, end_date=Date)
+
+
+def period_params(period_id, start_date, end_date):
+    """
+    Bind parameters of the rollup statements for one period.
+
+    The end bound includes the day after `end_date`, like the controller
+    queries.
+    """
+    return {"period_id": period_id, "start": start_date, "end": end_date + timedelta(days=1)}
+
+
+def freeze_period_rollup(connection, period_id, start_date, end_date):
+    """
+    Replace the rollup of a period with its current figures.
+
+    Runs on the caller's connection or session, inside its transaction.
+
+    Args:
+        connection (Connection | Session): Where to execute the statements.
+        period_id (int): The id of the period.
+        start_date (date): First day of the period.
+        end_date (date): Last day of the period.
+    """
+    params = period_params(period_id, start_date, end_date)
+    connection.execute(DROP_PERIOD_ROLLUP, params)
+    connection.execute(FREEZE_ROLLUP, params)
+
+
+def freeze_closed_periods(connection):
+    """
+    Freeze the rollup of every closed period.
+
+    Args:
+        connection (Connection): Where to execute the statements.
+
+    Returns:
+        int: The number of periods frozen.
+    """
+    periods = connection.execute(CLOSED_PERIODS).all()
+    for period_id, start_date, end_date in periods:
+        freeze_period_rollup(connection, period_id, start_date, end_date)
+    return len(periods)
+
+
+def verify_period_rollup(period_id=None, bind=engine):
+    """
+    Recompute the rollups of closed periods from the ledger and compare.
+
+    Args:
+        period_id (int, optional): The period to check. Defaults to every
+            closed period.
+        bind (Engine, optional): The database to check. Defaults to the
+            application engine.
+
+    Returns:
+        list[tuple]: One row per drifted bucket: period_id, kind, section,
+        bucket, the expected count and total, then the stored count and
+        total (None when the row is missing on one side). Empty when every
+        rollup matches the ledger.
+    """
+    drift = []
+    with bind.connect() as connection:
+        for id_, start_date, end_date in connection.execute(CLOSED_PERIODS).all():
+            if period_id is not None and id_ != period_id:
+                continue
+            params = period_params(id_, start_date, end_date)
+            drift.extend((id_, *row) for row in connection.execute(VERIFY_ROLLUP, params))
+    return drift
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "verify"
+    if command == "verify":
+        period_id = int(sys.argv[2]) if len(sys.argv) > 2 else None
+        drift = verify_period_rollup(period_id)
+        for row in drift:
+            print("Écart :", row)
+        print(f"{len(drift)} écart(s) dans {ROLLUP_TABLE}.")
+        sys.exit(1 if drift else 0)
+    else:
+        sys.exit(f"Commande inconnue : {command} (verify)")
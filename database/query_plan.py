@@ -0,0 +1,64 @@
+"""
+Helpers to inspect the SQL emitted by the controllers.
+
+`capture_statements` records every statement sent to SQLite and
+`explain_query_plan` returns the plan SQLite chooses for one of them.
+"""
+import re
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from database.database import engine
+
+FULL_SCAN = re.compile(r"^SCAN (\w+)(?! USING)")
+
+
+@contextmanager
+def capture_statements(bind=engine):
+    """
+    Record the statements executed on `bind` while the block runs.
+
+    Yields:
+        list: (statement, parameters) tuples, in execution order.
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(bind, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", before_cursor_execute)
+
+
+def explain_query_plan(statement, parameters=(), bind=engine):
+    """
+    Return the `EXPLAIN QUERY PLAN` lines of a statement.
+
+    Args:
+        statement (str): The SQL statement, as captured.
+        parameters (tuple | dict, optional): Its bound parameters.
+
+    Returns:
+        list[str]: The `detail` column of every plan step.
+    """
+    with bind.connect() as connection:
+        cursor = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[-1] for row in cursor]
+
+
+def full_table_scans(plan, tables):
+    """
+    Return the plan steps that read every row of one of `tables`.
+
+    A `SCAN <table> USING ... INDEX` step walks an index and is not reported.
+    """
+    scans = []
+    for detail in plan:
+        match = FULL_SCAN.match(detail)
+        if match and match.group(1) in tables:
+            scans.append(detail)
+    return scans
@@ -0,0 +1,50 @@
+"""
+Time buckets for the ledger aggregates.
+
+A bucket key always holds the year, so a history spanning several years
+never merges January 2024 with January 2025, and keys sort in chronological
+order as plain strings:
+
+    day       2024-01-31
+    week      2024-W05   (ISO 8601 week, with its ISO year)
+    month     2024-01
+    quarter   2024-Q1
+    year      2024
+
+`bucket_expression` computes the key in SQL. The same key is computed for a
+date in Python by `utils.time_buckets.bucket_key`, and turned into the text
+shown on the charts by `utils.time_buckets.bucket_label`.
+"""
+from sqlalchemy import Integer, cast, func
+
+from utils.time_buckets import check_granularity
+
+
+def bucket_expression(column, granularity="month"):
+    """
+    SQL expression of the bucket key of a date column.
+
+    The dates are stored as ISO strings (YYYY-MM-DD): the keys are read in
+    the string, without a strftime() per row, except for ISO weeks.
+
+    Args:
+        column: A Date column.
+        granularity (str, optional): One of GRANULARITIES. Defaults to "month".
+
+    Raises:
+        ValueError: If the granularity is unknown.
+    """
+    check_granularity(granularity)
+    if granularity == "day":
+        return func.substr(column, 1, 10)
+    if granularity == "month":
+        return func.substr(column, 1, 7)
+    if granularity == "year":
+        return func.substr(column, 1, 4)
+    if granularity == "quarter":
+        quarter = (cast(func.substr(column, 6, 2), Integer) + 2) // 3
+        return func.printf("%s-Q%d", func.substr(column, 1, 4), quarter)
+    # Semaine ISO : celle qui contient le jeudi, dans l'année de ce jeudi.
+    thursday = func.date(column, "-3 days", "weekday 4")
+    week = (cast(func.strftime("%j", thursday), Integer) - 1) // 7 + 1
+    return func.printf("%s-W%02d", func.strftime("%Y", thursday), week)
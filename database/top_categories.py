@@ -0,0 +1,54 @@
+"""
+Largest categories of a per-category series, with the remainder summed.
+
+A pie chart with hundreds of slices is unreadable and slow to lay out:
+`top_categories` keeps the `top_n` largest totals and sums every other
+category into a single remainder row, in SQL, so only top_n + 1 rows are
+read. The remainder row is told apart by its `is_remainder` flag, not by
+its label: a category may be titled like it.
+"""
+from sqlalchemy import case, func, literal, select
+
+# Libellé affiché de la ligne du reste ; les parenthèses le distinguent d'un titre de catégorie.
+REMAINDER_LABEL = "(Autres)"
+
+
+def top_categories(totals, top_n, *partition):
+    """
+    SELECT the `top_n` largest rows of `totals` and the sum of the others.
+
+    Categories are ranked by total (largest first, then by label). Each
+    output row has a `slot`: the rank of the category, or top_n + 1 for the
+    remainder row, which only exists when there are more than `top_n`
+    categories and is the only row with `is_remainder` true. Order by `slot`
+    to get the chart order.
+
+    Args:
+        totals: A subquery with one row per category and the columns `label`
+            and `total`.
+        top_n (int): The number of categories kept.
+        partition (str): Columns of `totals` ranked separately, e.g. "kind".
+
+    Returns:
+        Select: Rows (*partition, label, total, slot, is_remainder).
+
+    Raises:
+        ValueError: If top_n is smaller than 1.
+    """
+    if top_n < 1:
+        raise ValueError(f"top_n must be at least 1: {top_n}")
+    partition_columns = [totals.c[name] for name in partition]
+    rank = func.row_number().over(
+        partition_by=partition_columns or None,
+        order_by=(totals.c.total.desc(), totals.c.label),
+    )
+    ranked = select(*partition_columns, totals.c.label, totals.c.total, func.min(rank, top_n + 1).label("slot")).subquery()
+    ranked_partition = [ranked.c[name] for name in partition]
+    label = case((ranked.c.slot <= top_n, func.max(ranked.c.label)), else_=literal(REMAINDER_LABEL))
+    return select(
+        *ranked_partition,
+        label.label("label"),
+        func.sum(ranked.c.total).label("total"),
+        ranked.c.slot,
+        (ranked.c.slot > top_n).label("is_remainder"),
+    ).group_by(*ranked_partition, ranked.c.slot)
@@ -1,5 +1,5 @@
-from PySide6.QtCharts import QChart, QChartView, QBarSet, QBarSeries, QValueAxis, QBarCategoryAxis, QPieSeries
-from PySide6.QtCore import Qt, QDate, QSize, Signal, QEvent, QTimer
+from PySide6.QtCharts import QChart, QChartView, QBarSet, QBarSeries, QValueAxis, QBarCategoryAxis, QPieSeries, QLineSeries, QDateTimeAxis
+from PySide6.QtCore import Qt, QDate, QPointF, QSize, Signal, Slot, QEvent, QTimer, QObject, QRunnable, QThreadPool
 from PySide6.QtGui import QPainter, QIcon, QPixmap, QAction, QColor, QCloseEvent, QFontDatabase
 from PySide6.QtWidgets import (
     QApplication,
@@ -9,6 +9,7 @@ from PySide6.QtWidgets import (
     QDialog,
     QFrame,
     QGraphicsDropShadowEffect,
+    QGraphicsOpacityEffect,
     QGroupBox,
     QGridLayout,
     QHeaderView,
@@ -1,9 +1,13 @@
-from babel.numbers import format_currency
-
 from controllers.cash_box_controller import CashBoxPeriodController
+from controllers.change_events import change_bus
+from controllers.dashboard_service import DashboardService, DashboardSnapshot
+from controllers.period_context import period_context
+from database.ledger_summary import LEDGER_KINDS
+from utils.time_buckets import bucket_key
 from pyside6_custom_widgets.card import DashboardCardWidget
 from pyside6_custom_widgets.charts import (
     BarChartWidgetWithTwoDataSets,
+    LineChartWidget,
     PieChartWidget,
 )
 from pyside6_custom_widgets.dashboard import Dashboard
@@ -14,9 +18,11 @@ from imports import (
     QVBoxLayout,
     QHBoxLayout,
     QScrollArea,
+    QMessageBox,
     Qt,
 )
 from utils.utils import  set_app_icon
+from utils.workers import LatestTaskRunner
 from controllers.income_controller import IncomeController
 from controllers.expense_controller import ExpenseController
 from views import (
@@ -30,6 +36,12 @@ from qt_material import apply_stylesheet
 from views.about_us import AboutUs
 from views.manage_periodes_views import CashBoxPeriodList
 from views.save_database_view import DatabaseManager
+from models import CashBoxPeriod, ExpenseCategoryModel, IncomeCategoryModel
+from utils.formatting import format_amount
+
+
+# Catégories affichées dans chaque camembert ; les autres sont regroupées.
+PIE_TOP_N = 8
 
 
 class MainWindow(Dashboard):
@@ -45,7 +57,17 @@ class MainWindow(Dashboard):
         self.income_controller = IncomeController()
         self.expense_controller = ExpenseController()
         self.cash_box_perid_controller =  CashBoxPeriodController()
+        self.dashboard_service = DashboardService(top_n=PIE_TOP_N)
+        # Le tableau de bord est calculé hors du thread GUI ; seul le dernier
+        # calcul demandé est affiché.
+        self.dashboard_runner = LatestTaskRunner(self)
+        self.dashboard_runner.result.connect(self.render_dashboard)
+        self.dashboard_runner.error.connect(self.on_dashboard_error)
+        self.balance_runner = LatestTaskRunner(self)
+        self.balance_runner.result.connect(self.render_balance_series)
+        self.balance_runner.error.connect(self.on_dashboard_error)
         self.setup_pages()
+        change_bus.changed.connect(self.apply_change)
 
     def setup_menu(self):
         menus = [
@@ -198,10 +220,7 @@ class MainWindow(Dashboard):
         self.add_content_page(self.expense_widget, "Bienvenue sur la page des Dépense")
 
     def setup_main_page(self):
-        total_expense = self.expense_controller.get_total_expense
-        total_income = self.income_controller.get_total_income
-
-        inital_balance = self.cash_box_perid_controller.get_initial_balance
+        snapshot = DashboardSnapshot.empty()
 
         main_widget = QWidget()
         self.page_scroll_area = QScrollArea()
@@ -218,44 +237,56 @@ class MainWindow(Dashboard):
         self.initial_balance_card = DashboardCardWidget(
             title="Solde Initial",
             icon_name="fa.money",
-            content=f"{format_currency(inital_balance, currency="XOF",locale='fr_FR')}",
+            content=format_amount(snapshot.initial_balance),
+            formatter=format_amount,
             icon_color="blue",
         )
         self.income_card = DashboardCardWidget(
             title="Total Recette",
             icon_name="fa.money",
-            content=f"{format_currency(total_income, currency="XOF",locale='fr_FR')}",
+            content=format_amount(snapshot.total_income),
+            formatter=format_amount,
             icon_color="green",
         )
         self.expense_card = DashboardCardWidget(
             title="Total Dépense",
             icon_name="fa.money",
-            content=f"{format_currency(total_expense, currency="XOF",locale='fr_FR')}",
+            content=format_amount(snapshot.total_expense),
+            formatter=format_amount,
             icon_color="red",
         )
         self.balance_card = DashboardCardWidget(
             title="Solde",
             icon_name="fa.money",
-            content=f"{format_currency(inital_balance+total_income-total_expense, currency="XOF",locale='fr_FR')}",
+            content=format_amount(snapshot.balance),
+            formatter=format_amount,
             icon_color="blue",
         )
-        income_data = self.income_controller.get_income_by_category
-        income_monthly_data = self.income_controller.get_income_by_month
-        expense_data = self.expense_controller.get_expense_by_category
-        expense_monthly_data = self.expense_controller.get_expense_by_month
 
-        self.income_pie_chart_widget = PieChartWidget(data=income_data, title="Revenus par catégorie")
+        self.income_pie_chart_widget = PieChartWidget(
+            data=snapshot.income_by_category,
+            title="Revenus par catégorie",
+            category_attr="category",
+            value_attr="total_amount",
+            remainder_attr="is_remainder",
+        )
         self.income_pie_chart_widget.setMinimumSize(350, 350)
         chart_layout.addWidget(self.income_pie_chart_widget)
 
-        self.expense_pie_chart_widget = PieChartWidget(data=expense_data, title="Dépenses par catégorie")
+        self.expense_pie_chart_widget = PieChartWidget(
+            data=snapshot.expense_by_category,
+            title="Dépenses par catégorie",
+            category_attr="category",
+            value_attr="total_amount",
+            remainder_attr="is_remainder",
+        )
         self.expense_pie_chart_widget.setMinimumSize(350, 350)
         chart_layout.addWidget(self.expense_pie_chart_widget)
 
         income_vs_expense_bar_chart_layout = QHBoxLayout()
         self.income_vs_expense_bar_chart = BarChartWidgetWithTwoDataSets(
-            income_data=income_monthly_data,
-            expense_data=expense_monthly_data,
+            income_data=snapshot.income_by_month,
+            expense_data=snapshot.expense_by_month,
             title="Evolution mensuelle des revenus et des dépenses",
             xlabel="Mois",
             ylabel="Montant",
@@ -263,6 +294,16 @@ class MainWindow(Dashboard):
         self.income_vs_expense_bar_chart.setMinimumSize(350, 400)
         income_vs_expense_bar_chart_layout.addWidget(self.income_vs_expense_bar_chart)
 
+        balance_chart_layout = QHBoxLayout()
+        self.balance_chart = LineChartWidget(
+            data=[],
+            value_attr="balance",
+            title="Evolution journalière du solde",
+            ylabel="Solde",
+        )
+        self.balance_chart.setMinimumSize(350, 400)
+        balance_chart_layout.addWidget(self.balance_chart)
+
         card_layout.addWidget(self.initial_balance_card)
         card_layout.addWidget(self.income_card)
         card_layout.addWidget(self.expense_card)
@@ -270,43 +311,104 @@ class MainWindow(Dashboard):
         m_layout.addLayout(card_layout)
         m_layout.addLayout(chart_layout)
         m_layout.addLayout(income_vs_expense_bar_chart_layout)
+        m_layout.addLayout(balance_chart_layout)
         m_layout.addStretch()
         main_widget.setLayout(m_layout)
+        self.refresh_dashboard()
         return self.page_scroll_area
 
+    def dashboard_widgets(self):
+        return [
+            self.initial_balance_card,
+            self.income_card,
+            self.expense_card,
+            self.balance_card,
+            self.income_pie_chart_widget,
+            self.expense_pie_chart_widget,
+            self.income_vs_expense_bar_chart,
+        ]
+
+    def set_dashboard_loading(self, loading):
+        for widget in self.dashboard_widgets():
+            widget.set_loading(loading)
+
     def refresh_dashboard(self):
-        expense_controller = ExpenseController()
-        total_expense = expense_controller.get_total_expense
+        """Relance le calcul du tableau de bord en arrière-plan.
 
-        income_controller = IncomeController()
-        total_income = income_controller.get_total_income
+        Les valeurs affichées restent visibles (estompées) jusqu'à l'arrivée
+        du nouveau DashboardSnapshot ; un nouveau clic annule le calcul précédent.
+        """
+        self.set_dashboard_loading(True)
+        self.dashboard_runner.submit(self.dashboard_service.snapshot)
+        self.refresh_balance_chart()
 
-        initial_balance = self.cash_box_perid_controller.get_initial_balance
+    def refresh_balance_chart(self):
+        """Relit l'évolution du solde en arrière-plan (une seule requête)."""
+        self.balance_chart.set_loading(True)
+        self.balance_runner.submit(self.cash_box_perid_controller.get_balance_series, "day")
 
-        # Mettre à jour le contenu des widgets du tableau de bord
-        self.initial_balance_card.set_content(
-            f"{format_currency(initial_balance, currency='XOF', locale='fr_FR')}"
-        )
-        self.income_card.set_content(
-            f"{format_currency(total_income, currency='XOF', locale='fr_FR')}"
-        )
-        self.expense_card.set_content(
-            f"{format_currency(total_expense, currency='XOF', locale='fr_FR')}"
-        )
-        self.balance_card.set_content(
-            f"{format_currency(initial_balance + total_income - total_expense, currency='XOF', locale='fr_FR')}"
-        )
+    def render_balance_series(self, series):
+        self.balance_chart.update_chart(series)
+        self.balance_chart.set_loading(False)
 
-        income_data = self.income_controller.get_income_by_category
-        income_monthly_data = self.income_controller.get_income_by_month
-        expense_data = self.expense_controller.get_expense_by_category
-        expense_monthly_data = self.expense_controller.get_expense_by_month
+    def on_dashboard_error(self, error):
+        self.set_dashboard_loading(False)
+        self.balance_chart.set_loading(False)
+        QMessageBox.critical(self, "Erreur", f"Impossible d'actualiser le tableau de bord : {error}")
 
-        self.income_pie_chart_widget.update_chart(income_data)
-        self.expense_pie_chart_widget.update_chart(expense_data)
+    def render_dashboard(self, snapshot):
+        """Affiche un DashboardSnapshot dans les cartes et les graphiques."""
+        # Mettre à jour le contenu des widgets du tableau de bord
+        self.initial_balance_card.set_amount(snapshot.initial_balance)
+        self.income_card.set_amount(snapshot.total_income)
+        self.expense_card.set_amount(snapshot.total_expense)
+        self.balance_card.set_amount(snapshot.balance)
+
+        self.income_pie_chart_widget.update_chart(snapshot.income_by_category)
+        self.expense_pie_chart_widget.update_chart(snapshot.expense_by_category)
         self.income_vs_expense_bar_chart.update_chart(
-            new_income_data=income_monthly_data, new_expense_data=expense_monthly_data
+            new_income_data=snapshot.income_by_month, new_expense_data=snapshot.expense_by_month
         )
+        self.set_dashboard_loading(False)
+
+    def apply_change(self, event):
+        """Reporte une écriture sur le tableau de bord sans le recalculer.
+
+        Les recettes et dépenses créées, modifiées ou supprimées une à une
+        sont ajoutées aux cartes et aux graphiques. Les écritures en masse,
+        les catégories et les exercices relancent un calcul complet, de même
+        qu'un événement reçu pendant un calcul (son résultat l'ignorerait).
+        """
+        if event.model in (IncomeCategoryModel, ExpenseCategoryModel, CashBoxPeriod):
+            self.refresh_dashboard()
+            return
+        kind = LEDGER_KINDS.get(event.model.__tablename__)
+        if kind is None:
+            return
+        if event.action == "bulk" or self.dashboard_runner.is_running():
+            self.refresh_dashboard()
+            return
+
+        current_period = period_context.current
+        if current_period and current_period.is_closed:
+            # Un exercice fermé est affiché depuis ses agrégats figés.
+            return
+        if kind == "income":
+            card, pie_chart = self.income_card, self.income_pie_chart_widget
+        else:
+            card, pie_chart = self.expense_card, self.expense_pie_chart_widget
+        for delta in event.deltas():
+            if current_period and not current_period.contains(delta.date):
+                continue
+            card.add_amount(delta.amount)
+            self.balance_card.add_amount(delta.amount if kind == "income" else -delta.amount)
+            pie_chart.apply_delta(delta.category, delta.amount)
+            self.income_vs_expense_bar_chart.apply_delta(
+                bucket_key(delta.date, "month"), **{f"{kind}_delta": delta.amount}
+            )
+        # Une écriture décale le solde de tous les jours suivants : la série
+        # est relue, c'est une requête sur le résumé journalier.
+        self.refresh_balance_chart()
 
     def show_about_us(self):
         form = AboutUs()
@@ -315,6 +417,8 @@ class MainWindow(Dashboard):
     def show_db_manager(self):
         form = DatabaseManager()
         form.exec()
+        # Une restauration remplace toutes les données affichées.
+        self.refresh_dashboard()
         
     @property
     def get_pages_index(self):
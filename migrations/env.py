@@ -0,0 +1,73 @@
+from logging.config import fileConfig
+
+from alembic import context
+
+from database.database import DATABASE_URL, Base, engine
+import models  # noqa: F401  (registers every table on Base.metadata)
+from models.user import User  # noqa: F401
+from models.audit_model import AuditLog  # noqa: F401
+
+# this is the Alembic Config object, which provides
+# access to the values within the .ini file in use.
+config = context.config
+
+# Interpret the config file for Python logging, unless the application
+# runs the migrations itself and already configured logging.
+if config.config_file_name is not None and "connection" not in config.attributes:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """Run migrations in 'offline' mode.
+
+    Calls to context.execute() here emit the given string to the
+    script output.
+
+    """
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations in 'online' mode.
+
+    The application engine is used so that the database selected by
+    CASH_BOX_DATABASE_URL and the SQLite profile also apply here. A
+    connection can be handed over through `config.attributes["connection"]`.
+
+    """
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run(connection)
+        return
+
+    with engine.connect() as connection:
+        _run(connection)
+
+
+def _run(connection) -> None:
+    # SQLite ne sait pas modifier une colonne : Alembic recrée la table (mode batch).
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=True,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
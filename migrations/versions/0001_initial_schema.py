@@ -0,0 +1,112 @@
+"""initial schema
+
+Databases created before migrations were introduced already contain these
+tables (they were built with `Base.metadata.create_all`), so each table is
+only created when it is missing.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2024-10-01 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _base_columns():
+    return [
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "users" not in existing:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("username", sa.String(), nullable=False, unique=True),
+            sa.Column("password", sa.String(), nullable=False),
+            sa.Column("secret_question", sa.String(), nullable=False),
+            sa.Column("secret_answer", sa.String(), nullable=False),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+
+    if "audit_log" not in existing:
+        op.create_table(
+            "audit_log",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("table_name", sa.String(), nullable=False),
+            sa.Column("action", sa.String(), nullable=False),
+            sa.Column("record_id", sa.Integer(), nullable=False),
+            sa.Column(
+                "user_id",
+                sa.Integer(),
+                sa.ForeignKey("users.id", ondelete="CASCADE", onupdate="CASCADE"),
+                nullable=False,
+            ),
+            sa.Column("timestamp", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("description", sa.String(), nullable=False),
+        )
+        op.create_index("ix_audit_log_id", "audit_log", ["id"])
+
+    if "cash_box_period" not in existing:
+        op.create_table(
+            "cash_box_period",
+            sa.Column("start_date", sa.Date(), nullable=False),
+            sa.Column("end_date", sa.Date(), nullable=True),
+            sa.Column("initial_amount", sa.Float(), nullable=False),
+            sa.Column("ending_balance", sa.Float(), nullable=True),
+            sa.Column("is_open", sa.Enum("Ouvert", "Fermé", name="status_enum"), nullable=False),
+            *_base_columns(),
+        )
+
+    for kind, ledger in (("income", "incomes"), ("expense", "expenses")):
+        categories = f"{kind}_categories"
+        if categories not in existing:
+            op.create_table(
+                categories,
+                sa.Column("title", sa.String(50), nullable=False),
+                *_base_columns(),
+            )
+            op.create_index(f"ix_{categories}_title", categories, ["title"], unique=True)
+
+        if ledger not in existing:
+            op.create_table(
+                ledger,
+                sa.Column("amount", sa.Float(), nullable=False),
+                sa.Column("date", sa.Date(), nullable=False),
+                sa.Column("description", sa.String(150), nullable=True),
+                sa.Column(
+                    "category_id",
+                    sa.Integer(),
+                    sa.ForeignKey(f"{categories}.id", ondelete="CASCADE", onupdate="CASCADE"),
+                    nullable=False,
+                ),
+                *_base_columns(),
+            )
+
+
+def downgrade() -> None:
+    for table in (
+        "expenses",
+        "expense_categories",
+        "incomes",
+        "income_categories",
+        "cash_box_period",
+        "audit_log",
+        "users",
+    ):
+        op.drop_table(table)
@@ -0,0 +1,39 @@
+"""ledger date and category indexes
+
+Every list, filter and dashboard query on incomes/expenses filters on a
+`date` range, often together with `category_id`.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2024-10-02 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    "ix_{table}_date": ["date"],
+    "ix_{table}_category_id_date": ["category_id", "date"],
+    "ix_{table}_date_category_id_amount": ["date", "category_id", "amount"],
+}
+
+
+def upgrade() -> None:
+    for table in ("incomes", "expenses"):
+        for name, columns in INDEXES.items():
+            op.create_index(name.format(table=table), table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for table in ("incomes", "expenses"):
+        for name in INDEXES:
+            op.drop_index(name.format(table=table), table_name=table, if_exists=True)
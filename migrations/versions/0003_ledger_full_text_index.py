@@ -0,0 +1,99 @@
+"""ledger full-text index
+
+FTS5 table over the descriptions and category titles of incomes and
+expenses, kept in sync by triggers and filled from the existing rows.
+
+The SQL is written out as it was at this revision: later changes to
+database/full_text.py must not alter what this migration executes.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2024-10-09 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table du grand livre -> (table des catégories, décalage du rowid)
+LEDGER_TABLES = {
+    "incomes": ("income_categories", 0),
+    "expenses": ("expense_categories", 1),
+}
+
+CREATE_FTS_TABLE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS ledger_fts USING fts5(
+    description,
+    category,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+
+def _triggers(table, category_table, offset):
+    category = f"(SELECT title FROM {category_table} WHERE id = new.category_id)"
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table}
+        BEGIN
+            INSERT INTO ledger_fts (rowid, description, category)
+            VALUES (new.id * 2 + {offset}, new.description, {category});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_fts_update
+        AFTER UPDATE OF description, category_id ON {table}
+        BEGIN
+            UPDATE ledger_fts
+            SET description = new.description, category = {category}
+            WHERE rowid = new.id * 2 + {offset};
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table}
+        BEGIN
+            DELETE FROM ledger_fts WHERE rowid = old.id * 2 + {offset};
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {category_table}_fts_update
+        AFTER UPDATE OF title ON {category_table}
+        BEGIN
+            UPDATE ledger_fts SET category = new.title
+            WHERE rowid IN (
+                SELECT {table}.id * 2 + {offset} FROM {table} WHERE category_id = new.id
+            );
+        END
+        """,
+    ]
+
+
+def upgrade() -> None:
+    op.execute(CREATE_FTS_TABLE)
+    for table, (category_table, offset) in LEDGER_TABLES.items():
+        for statement in _triggers(table, category_table, offset):
+            op.execute(statement)
+    op.execute("DELETE FROM ledger_fts")
+    for table, (category_table, offset) in LEDGER_TABLES.items():
+        op.execute(
+            f"""
+            INSERT INTO ledger_fts (rowid, description, category)
+            SELECT t.id * 2 + {offset}, t.description, c.title
+            FROM {table} AS t LEFT JOIN {category_table} AS c ON c.id = t.category_id
+            """
+        )
+
+
+def downgrade() -> None:
+    for table, (category_table, _) in LEDGER_TABLES.items():
+        for name in (f"{table}_fts_insert", f"{table}_fts_update", f"{table}_fts_delete", f"{category_table}_fts_update"):
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.execute("DROP TABLE IF EXISTS ledger_fts")
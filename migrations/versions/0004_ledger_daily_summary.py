@@ -0,0 +1,98 @@
+"""ledger daily summary
+
+Per (kind, date, category) counts and totals of incomes and expenses, kept
+up to date by triggers and filled from the existing rows.
+
+The SQL is written out as it was at this revision (totals were FLOAT until
+0006): later changes to database/ledger_summary.py must not alter what this
+migration executes.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2024-10-16 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table du grand livre -> valeur de la colonne `kind`
+LEDGER_KINDS = {
+    "incomes": "income",
+    "expenses": "expense",
+}
+
+CREATE_SUMMARY_TABLE = """
+CREATE TABLE IF NOT EXISTS ledger_daily_summary (
+    kind VARCHAR(10) NOT NULL,
+    date DATE NOT NULL,
+    category_id INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    total FLOAT NOT NULL,
+    PRIMARY KEY (kind, date, category_id)
+)
+"""
+
+
+def _add(kind, row):
+    return f"""
+            INSERT INTO ledger_daily_summary (kind, date, category_id, count, total)
+            VALUES ('{kind}', {row}.date, {row}.category_id, 1, {row}.amount)
+            ON CONFLICT (kind, date, category_id)
+            DO UPDATE SET count = count + 1, total = total + excluded.total;"""
+
+
+def _remove(kind, row):
+    key = f"kind = '{kind}' AND date = {row}.date AND category_id = {row}.category_id"
+    return f"""
+            UPDATE ledger_daily_summary SET count = count - 1, total = total - {row}.amount
+            WHERE {key};
+            DELETE FROM ledger_daily_summary WHERE {key} AND count <= 0;"""
+
+
+def _triggers(table, kind):
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_summary_insert AFTER INSERT ON {table}
+        BEGIN{_add(kind, "new")}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_summary_update
+        AFTER UPDATE OF amount, date, category_id ON {table}
+        BEGIN{_remove(kind, "old")}{_add(kind, "new")}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_summary_delete AFTER DELETE ON {table}
+        BEGIN{_remove(kind, "old")}
+        END
+        """,
+    ]
+
+
+def upgrade() -> None:
+    op.execute(CREATE_SUMMARY_TABLE)
+    for table, kind in LEDGER_KINDS.items():
+        for statement in _triggers(table, kind):
+            op.execute(statement)
+    op.execute("DELETE FROM ledger_daily_summary")
+    for table, kind in LEDGER_KINDS.items():
+        op.execute(
+            "INSERT INTO ledger_daily_summary (kind, date, category_id, count, total) "
+            f"SELECT '{kind}', date, category_id, count(*), sum(amount) FROM {table} GROUP BY date, category_id"
+        )
+
+
+def downgrade() -> None:
+    for table in LEDGER_KINDS:
+        for event in ("insert", "update", "delete"):
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_summary_{event}")
+    op.execute("DROP TABLE IF EXISTS ledger_daily_summary")
@@ -0,0 +1,76 @@
+"""period rollups
+
+Frozen totals, per-category and per-month figures of the closed cash box
+periods, filled for the periods already closed.
+
+The SQL is written out as it was at this revision (totals were FLOAT until
+0006): later changes to database/period_rollup.py must not alter what this
+migration executes.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2024-10-23 09:00:00
+
+"""
+from datetime import timedelta
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CREATE_ROLLUP_TABLE = """
+CREATE TABLE IF NOT EXISTS period_rollups (
+    period_id INTEGER NOT NULL REFERENCES cash_box_period (id) ON DELETE CASCADE,
+    kind VARCHAR(10) NOT NULL,
+    section VARCHAR(10) NOT NULL,
+    bucket VARCHAR(20) NOT NULL,
+    label VARCHAR(50),
+    count INTEGER NOT NULL,
+    total FLOAT NOT NULL,
+    PRIMARY KEY (period_id, kind, section, bucket)
+)
+"""
+
+FREEZE_ROLLUP = sa.text("""
+INSERT INTO period_rollups (period_id, kind, section, bucket, label, count, total)
+SELECT :period_id, * FROM (
+    SELECT kind, 'total' AS section, '' AS bucket, NULL AS label,
+           sum(count) AS count, sum(total) AS total
+    FROM ledger_daily_summary WHERE date BETWEEN :start AND :end GROUP BY kind
+    UNION ALL
+    SELECT s.kind, 'category', CAST(s.category_id AS TEXT), coalesce(ic.title, ec.title),
+           sum(s.count), sum(s.total)
+    FROM ledger_daily_summary AS s
+    LEFT JOIN income_categories AS ic ON s.kind = 'income' AND ic.id = s.category_id
+    LEFT JOIN expense_categories AS ec ON s.kind = 'expense' AND ec.id = s.category_id
+    WHERE s.date BETWEEN :start AND :end GROUP BY s.kind, s.category_id
+    UNION ALL
+    SELECT kind, 'month', substr(date, 1, 7), NULL, sum(count), sum(total)
+    FROM ledger_daily_summary WHERE date BETWEEN :start AND :end GROUP BY kind, substr(date, 1, 7)
+)
+""").bindparams(sa.bindparam("start", type_=sa.Date), sa.bindparam("end", type_=sa.Date))
+
+CLOSED_PERIODS = sa.text(
+    "SELECT id, start_date, end_date FROM cash_box_period WHERE is_open = 'Fermé'"
+).columns(start_date=sa.Date, end_date=sa.Date)
+
+
+def upgrade() -> None:
+    op.execute(CREATE_ROLLUP_TABLE)
+    connection = op.get_bind()
+    for period_id, start_date, end_date in connection.execute(CLOSED_PERIODS).all():
+        # Même borne de fin que les requêtes des contrôleurs : le lendemain est inclus.
+        connection.execute(
+            FREEZE_ROLLUP, {"period_id": period_id, "start": start_date, "end": end_date + timedelta(days=1)}
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS period_rollups")
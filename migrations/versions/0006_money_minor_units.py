@@ -0,0 +1,176 @@
+"""money minor units
+
+Amounts stored as INTEGER numbers of minor units (centimes) instead of
+floats: ledger amounts, period balances and the totals of the summary and
+rollup tables. The ledger triggers are dropped while the tables are
+rebuilt, then recreated and the summary refilled.
+
+The SQL is written out as it was at this revision: later changes to
+database/full_text.py, database/ledger_summary.py or models/money.py must
+not alter what this migration executes.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2024-10-30 09:00:00
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MINOR_UNITS = 100
+
+# table du grand livre -> (kind du résumé, table des catégories, décalage du rowid FTS)
+LEDGER_TABLES = {
+    "incomes": ("income", "income_categories", 0),
+    "expenses": ("expense", "expense_categories", 1),
+}
+
+SUMMARY_TABLE = """
+CREATE TABLE IF NOT EXISTS ledger_daily_summary (
+    kind VARCHAR(10) NOT NULL,
+    date DATE NOT NULL,
+    category_id INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    total {total_type} NOT NULL,
+    PRIMARY KEY (kind, date, category_id)
+)
+"""
+
+MONEY_COLUMNS = {
+    "incomes": ("amount",),
+    "expenses": ("amount",),
+    "cash_box_period": ("initial_amount", "ending_balance"),
+    "period_rollups": ("total",),
+}
+
+
+def _scale(table, columns, expression):
+    assignments = ", ".join(f"{column} = {expression.format(column=column)}" for column in columns)
+    op.execute(f"UPDATE {table} SET {assignments}")
+
+
+def _alter(table, columns, existing_type, type_):
+    with op.batch_alter_table(table) as batch_op:
+        for column in columns:
+            batch_op.alter_column(column, existing_type=existing_type, type_=type_)
+
+
+def _summary_triggers(table, kind):
+    def add(row):
+        return f"""
+            INSERT INTO ledger_daily_summary (kind, date, category_id, count, total)
+            VALUES ('{kind}', {row}.date, {row}.category_id, 1, {row}.amount)
+            ON CONFLICT (kind, date, category_id)
+            DO UPDATE SET count = count + 1, total = total + excluded.total;"""
+
+    def remove(row):
+        key = f"kind = '{kind}' AND date = {row}.date AND category_id = {row}.category_id"
+        return f"""
+            UPDATE ledger_daily_summary SET count = count - 1, total = total - {row}.amount
+            WHERE {key};
+            DELETE FROM ledger_daily_summary WHERE {key} AND count <= 0;"""
+
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_summary_insert AFTER INSERT ON {table}
+        BEGIN{add("new")}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_summary_update
+        AFTER UPDATE OF amount, date, category_id ON {table}
+        BEGIN{remove("old")}{add("new")}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_summary_delete AFTER DELETE ON {table}
+        BEGIN{remove("old")}
+        END
+        """,
+    ]
+
+
+def _fts_triggers(table, category_table, offset):
+    category = f"(SELECT title FROM {category_table} WHERE id = new.category_id)"
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table}
+        BEGIN
+            INSERT INTO ledger_fts (rowid, description, category)
+            VALUES (new.id * 2 + {offset}, new.description, {category});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_fts_update
+        AFTER UPDATE OF description, category_id ON {table}
+        BEGIN
+            UPDATE ledger_fts
+            SET description = new.description, category = {category}
+            WHERE rowid = new.id * 2 + {offset};
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table}
+        BEGIN
+            DELETE FROM ledger_fts WHERE rowid = old.id * 2 + {offset};
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {category_table}_fts_update
+        AFTER UPDATE OF title ON {category_table}
+        BEGIN
+            UPDATE ledger_fts SET category = new.title
+            WHERE rowid IN (
+                SELECT {table}.id * 2 + {offset} FROM {table} WHERE category_id = new.id
+            );
+        END
+        """,
+    ]
+
+
+def _drop_ledger_triggers():
+    # Les triggers disparaîtraient avec les tables recréées par le mode batch.
+    for table, (_, category_table, _) in LEDGER_TABLES.items():
+        for name in ("summary_insert", "summary_update", "summary_delete", "fts_insert", "fts_update", "fts_delete"):
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_{name}")
+        op.execute(f"DROP TRIGGER IF EXISTS {category_table}_fts_update")
+    op.execute("DROP TABLE IF EXISTS ledger_daily_summary")
+
+
+def _create_ledger_triggers(total_type):
+    """Recreate the summary table with `total_type` totals, the ledger triggers, and refill the summary."""
+    op.execute(SUMMARY_TABLE.format(total_type=total_type))
+    for table, (kind, category_table, offset) in LEDGER_TABLES.items():
+        for statement in _summary_triggers(table, kind) + _fts_triggers(table, category_table, offset):
+            op.execute(statement)
+    for table, (kind, _, _) in LEDGER_TABLES.items():
+        op.execute(
+            "INSERT INTO ledger_daily_summary (kind, date, category_id, count, total) "
+            f"SELECT '{kind}', date, category_id, count(*), sum(amount) FROM {table} GROUP BY date, category_id"
+        )
+
+
+def upgrade() -> None:
+    _drop_ledger_triggers()
+    for table, columns in MONEY_COLUMNS.items():
+        # Convertir avant de changer le type : le mode batch copie avec CAST.
+        _scale(table, columns, f"CAST(round({{column}} * {MINOR_UNITS}) AS INTEGER)")
+        _alter(table, columns, sa.Float(), sa.Integer())
+    _create_ledger_triggers("INTEGER")
+
+
+def downgrade() -> None:
+    _drop_ledger_triggers()
+    for table, columns in MONEY_COLUMNS.items():
+        _alter(table, columns, sa.Integer(), sa.Float())
+        _scale(table, columns, f"{{column}} / {MINOR_UNITS}.0")
+    _create_ledger_triggers("FLOAT")
@@ -0,0 +1,46 @@
+"""period rollup days
+
+Per-day rows in `period_rollups`, so the balance series of a closed period
+is read from its rollup like its other figures. The days of the periods
+already closed are filled from `ledger_daily_summary`.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2024-11-06 09:00:00
+
+"""
+from datetime import timedelta
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FREEZE_DAYS = sa.text("""
+INSERT OR REPLACE INTO period_rollups (period_id, kind, section, bucket, label, count, total)
+SELECT :period_id, kind, 'day', substr(date, 1, 10), NULL, sum(count), sum(total)
+FROM ledger_daily_summary WHERE date BETWEEN :start AND :end GROUP BY kind, substr(date, 1, 10)
+""").bindparams(sa.bindparam("start", type_=sa.Date), sa.bindparam("end", type_=sa.Date))
+
+CLOSED_PERIODS = sa.text(
+    "SELECT id, start_date, end_date FROM cash_box_period WHERE is_open = 'Fermé'"
+).columns(start_date=sa.Date, end_date=sa.Date)
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    for period_id, start_date, end_date in connection.execute(CLOSED_PERIODS).all():
+        # Même borne de fin que les requêtes des contrôleurs : le lendemain est inclus.
+        connection.execute(
+            FREEZE_DAYS, {"period_id": period_id, "start": start_date, "end": end_date + timedelta(days=1)}
+        )
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM period_rollups WHERE section = 'day'")
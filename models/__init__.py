@@ -1,6 +1,11 @@
 from .base_model import BaseModel as BaseModel
+from .base_model import display_columns as display_columns
+from .money import Money as Money
+from .money import MoneyType as MoneyType
 from .incomes import IncomeCategoryModel as IncomeCategoryModel
 from .incomes import IncomeModel as IncomeModel
 from .expense import ExpenseCategoryModel as ExpenseCategoryModel
 from .expense import ExpenseModel as ExpenseModel
-from .cash_box_period import CashBoxPeriod as CashBoxPeriod
\ No newline at end of file
+from .cash_box_period import CashBoxPeriod as CashBoxPeriod
+from .ledger_summary import LedgerDailySummary as LedgerDailySummary
+from .period_rollup import PeriodRollup as PeriodRollup
@@ -12,3 +12,25 @@ class BaseModel(Base):
     id = Column(Integer, primary_key=True, autoincrement=True, info={"tab_col_index":1})
     created_at = Column(DateTime, default=func.now(), nullable=False, info={"editable":"false", "tab_col_index":-2})
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False, info={"editable":"false", "tab_col_index":-1})
+
+
+def display_columns(model):
+    """
+    Return the columns of a model in the order of the list views.
+
+    Columns are sorted by their `tab_col_index` info (their position in the
+    table when missing); negative indexes come last, e.g. the timestamps.
+
+    Args:
+        model: The SQLAlchemy model class.
+
+    Returns:
+        list[Column]: The table columns, in display order.
+    """
+    columns_with_order = [
+        (column.info.get("tab_col_index", index), column.name, column)
+        for index, column in enumerate(model.__table__.columns)
+    ]
+    positive_columns = sorted(item for item in columns_with_order if item[0] >= 0)
+    negative_columns = sorted(item for item in columns_with_order if item[0] < 0)
+    return [column for _, _, column in positive_columns + negative_columns]
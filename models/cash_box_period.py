@@ -1,6 +1,8 @@
-from sqlalchemy import Column, Date, Enum, Float, func
+from sqlalchemy import Column, Date, Enum, func
+from sqlalchemy.orm import Mapped, relationship
 
 from models.base_model import BaseModel
+from models.money import MoneyType
 
 
 class CashBoxPeriod(BaseModel):
@@ -25,7 +27,7 @@ class CashBoxPeriod(BaseModel):
         },
     )
     initial_amount = Column(
-        Float,
+        MoneyType(),
         nullable=False,
         info={
             "verbose_name": "Solde Initial",
@@ -34,8 +36,8 @@ class CashBoxPeriod(BaseModel):
         },
     )
     ending_balance = Column(
-        Float,
-        default=0.0,
+        MoneyType(),
+        default=0,
         nullable=True,
         info={
             "verbose_name": "Solde Final",
@@ -53,6 +55,10 @@ class CashBoxPeriod(BaseModel):
             "tab_col_index": 6,
         },
     )
+
+    rollups: Mapped[list["PeriodRollup"]] = relationship(
+        "PeriodRollup", cascade="all, delete-orphan"
+    )
     
     def __str__(self):
         return f"(id={self.id}, start_date={self.start_date}, end_date={self.end_date}, initial_amount={self.initial_amount}, ending_balance={self.ending_balance}, is_open={self.is_open.title})"
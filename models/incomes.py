@@ -1,9 +1,10 @@
 from sqlalchemy.orm import Mapped
-from sqlalchemy import Column, Date, Integer, String, Float, ForeignKey, DateTime
+from sqlalchemy import Column, Date, Index, Integer, String, ForeignKey, DateTime
 from sqlalchemy.orm import relationship
 
 from database.database import Base
 from models import BaseModel
+from models.money import MoneyType
 
 
 class IncomeCategoryModel(BaseModel):
@@ -41,10 +42,15 @@ class IncomeCategoryModel(BaseModel):
 class IncomeModel(BaseModel):
 
     __tablename__ = "incomes"
+    __table_args__ = (
+        Index("ix_incomes_date", "date"),
+        Index("ix_incomes_category_id_date", "category_id", "date"),
+        Index("ix_incomes_date_category_id_amount", "date", "category_id", "amount"),
+    )
     __verbose_name__ = "Recette"
 
     amount = Column(
-        Float,
+        MoneyType(),
         nullable=False,
         info={"verbose_name": "Montant", "column_type": "numeric", "tab_col_index": 4},
     )
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Date, Integer, String
+
+from database.database import Base
+from models.money import MoneyType
+
+
+class LedgerDailySummary(Base):
+    """
+    Count and total of the incomes or expenses of one category on one day.
+
+    The rows are maintained by SQLite triggers on `incomes` and `expenses`
+    (see `database/ledger_summary.py`): the application only reads them.
+    """
+
+    __tablename__ = "ledger_daily_summary"
+
+    kind = Column(String(10), primary_key=True)
+    date = Column(Date, primary_key=True)
+    category_id = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False)
+    total = Column(MoneyType(), nullable=False)
+
+    def __repr__(self):
+        return f"<LedgerDailySummary(kind={self.kind}, date={self.date}, category_id={self.category_id}, count={self.count}, total={self.total})>"
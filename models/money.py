@@ -0,0 +1,149 @@
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from functools import total_ordering
+
+from sqlalchemy import Integer
+from sqlalchemy.types import TypeDecorator
+
+# Nombre d'unités mineures (centimes) dans une unité.
+MINOR_UNITS = 100
+
+
+@total_ordering
+class Money:
+    """
+    An amount of money held as an exact number of minor units (centimes).
+
+    Amounts are stored as integers in the database (see MoneyType), so sums
+    and comparisons of totals are exact. Values given in major units (int,
+    float, Decimal or the text typed in a form) are converted with
+    `from_major`; `to_decimal` and `float()` give major units back for
+    display.
+
+    Attributes:
+        minor (int): The amount in minor units.
+    """
+
+    __slots__ = ("minor",)
+
+    def __init__(self, minor=0):
+        object.__setattr__(self, "minor", int(minor))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Money is immutable")
+
+    @classmethod
+    def from_major(cls, value):
+        """
+        Build an amount from a value in major units.
+
+        Args:
+            value (Money | int | float | Decimal | str): The amount, e.g. 5000,
+                12.5 or "1 250,50". Text may use spaces as thousands
+                separators and a comma as decimal separator.
+
+        Returns:
+            Money: The amount, rounded half up to the minor unit.
+
+        Raises:
+            ValueError: If the value is not an amount.
+        """
+        if isinstance(value, Money):
+            return value
+        if isinstance(value, bool):
+            raise ValueError(f"Invalid amount: {value!r}")
+        if isinstance(value, int):
+            return cls(value * MINOR_UNITS)
+        if isinstance(value, float):
+            value = repr(value)
+        if isinstance(value, str):
+            value = "".join(value.split()).replace(",", ".")
+        try:
+            minor = (Decimal(value) * MINOR_UNITS).quantize(Decimal(1), rounding=ROUND_HALF_UP)
+        except (InvalidOperation, TypeError):
+            raise ValueError(f"Invalid amount: {value!r}") from None
+        if not minor.is_finite():
+            raise ValueError(f"Invalid amount: {value!r}")
+        return cls(minor)
+
+    def to_decimal(self):
+        """The amount in major units, as an exact Decimal."""
+        return Decimal(self.minor).scaleb(-2)
+
+    def __float__(self):
+        return self.minor / MINOR_UNITS
+
+    def __int__(self):
+        return int(self.to_decimal())
+
+    def __str__(self):
+        # Texte en unités majeures, relisible par from_major : "5000", "12.50".
+        if self.minor % MINOR_UNITS == 0:
+            return str(self.minor // MINOR_UNITS)
+        return format(self.to_decimal(), "f")
+
+    def __repr__(self):
+        return f"Money({self})"
+
+    def __hash__(self):
+        # Égal à un nombre de même valeur : même hash, comme Decimal.
+        return hash(self.to_decimal())
+
+    def __bool__(self):
+        return self.minor != 0
+
+    @staticmethod
+    def _coerce(other):
+        try:
+            return Money.from_major(other)
+        except ValueError:
+            return None
+
+    def __eq__(self, other):
+        other = self._coerce(other)
+        return NotImplemented if other is None else self.minor == other.minor
+
+    def __lt__(self, other):
+        other = self._coerce(other)
+        return NotImplemented if other is None else self.minor < other.minor
+
+    def __add__(self, other):
+        other = self._coerce(other)
+        return NotImplemented if other is None else Money(self.minor + other.minor)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        other = self._coerce(other)
+        return NotImplemented if other is None else Money(self.minor - other.minor)
+
+    def __rsub__(self, other):
+        other = self._coerce(other)
+        return NotImplemented if other is None else Money(other.minor - self.minor)
+
+    def __neg__(self):
+        return Money(-self.minor)
+
+    def __abs__(self):
+        return Money(abs(self.minor))
+
+
+class MoneyType(TypeDecorator):
+    """
+    Column type storing a Money as an INTEGER number of minor units.
+
+    Bound values may be Money or amounts in major units (see
+    Money.from_major); rows are read back as Money.
+    """
+
+    impl = Integer
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return Money.from_major(value).minor
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return Money(value)
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, ForeignKey, Integer, String
+
+from database.database import Base
+from models.money import MoneyType
+
+
+class PeriodRollup(Base):
+    """
+    Frozen figures of a closed cash box period for one kind and one bucket.
+
+    `section` is "total" (empty bucket), "category" (bucket = category id,
+    label = its title at closing time), "month" (bucket = 'YYYY-MM') or
+    "day" (bucket = 'YYYY-MM-DD'). The rows are written when the period is
+    closed (see `database/period_rollup.py`).
+    """
+
+    __tablename__ = "period_rollups"
+
+    period_id = Column(
+        Integer, ForeignKey("cash_box_period.id", ondelete="CASCADE"), primary_key=True
+    )
+    kind = Column(String(10), primary_key=True)
+    section = Column(String(10), primary_key=True)
+    bucket = Column(String(20), primary_key=True)
+    label = Column(String(50), nullable=True)
+    count = Column(Integer, nullable=False)
+    total = Column(MoneyType(), nullable=False)
+
+    def __repr__(self):
+        return f"<PeriodRollup(period_id={self.period_id}, kind={self.kind}, section={self.section}, bucket={self.bucket}, count={self.count}, total={self.total})>"
@@ -0,0 +1,129 @@
+import qtawesome as qta
+
+from PySide6.QtCore import QEvent, QModelIndex, QPersistentModelIndex, QRect, QSize, Qt
+from PySide6.QtGui import QColor, QPainter
+from PySide6.QtWidgets import QStyle, QStyledItemDelegate
+
+# Rôle des cellules qui porte l'identifiant de l'enregistrement de la ligne.
+ID_ROLE = Qt.UserRole
+
+BUTTON_SIZE = QSize(36, 32)
+BUTTON_SPACING = 6
+ICON_SIZE = QSize(18, 18)
+
+# Couleurs des boutons "primary" et "danger" de styles/button.qss (normal, survol).
+EDIT_COLORS = (QColor("#007bff"), QColor("#0056b3"))
+DELETE_COLORS = (QColor("#dc3545"), QColor("#c82333"))
+
+
+class ActionButtonsDelegate(QStyledItemDelegate):
+    """
+    Paints the edit and delete buttons of a table row in its "Actions" cell.
+
+    Replaces an ActionButtonsWidget per row: the buttons are only drawn, the
+    delegate finds the button under the mouse itself, highlights it and calls
+    the callback with the record ID read from the cell (`ID_ROLE`). A single
+    delegate serves every row.
+
+    Args:
+        view (QAbstractItemView): The view whose "Actions" column is painted.
+        edit_callback (callable, optional): Called with the record ID when the
+            edit button is clicked.
+        delete_callback (callable, optional): Called with the record ID when
+            the delete button is clicked.
+    """
+
+    def __init__(self, view, edit_callback=None, delete_callback=None):
+        super().__init__(view)
+        self.view = view
+        self.buttons = (
+            ("edit", qta.icon("fa.edit", color="white"), EDIT_COLORS, edit_callback),
+            ("delete", qta.icon("fa5s.trash-alt", color="white"), DELETE_COLORS, delete_callback),
+        )
+        self.hovered = (QPersistentModelIndex(), None)
+        # Le survol est suivi sur toute la vue : editorEvent ne voit pas la souris sortir de la cellule.
+        view.setMouseTracking(True)
+        view.viewport().installEventFilter(self)
+
+    def button_rects(self, cell_rect):
+        """
+        Compute where the buttons are drawn in a cell.
+
+        Args:
+            cell_rect (QRect): The rectangle of the cell.
+
+        Returns:
+            list[tuple[str, QRect]]: (button name, rectangle) pairs, centred
+            in the cell.
+        """
+        width = len(self.buttons) * BUTTON_SIZE.width() + (len(self.buttons) - 1) * BUTTON_SPACING
+        left = cell_rect.left() + (cell_rect.width() - width) // 2
+        top = cell_rect.top() + (cell_rect.height() - BUTTON_SIZE.height()) // 2
+        return [
+            (name, QRect(left + position * (BUTTON_SIZE.width() + BUTTON_SPACING), top, BUTTON_SIZE.width(), BUTTON_SIZE.height()))
+            for position, (name, *_) in enumerate(self.buttons)
+        ]
+
+    def button_at(self, cell_rect, pos):
+        """Return the name of the button under `pos`, or None."""
+        for name, rect in self.button_rects(cell_rect):
+            if rect.contains(pos):
+                return name
+        return None
+
+    def paint(self, painter, option, index):
+        # Fond de la cellule (sélection, lignes alternées) dessiné par le style.
+        self.initStyleOption(option, index)
+        style = option.widget.style() if option.widget else None
+        if style:
+            style.drawPrimitive(QStyle.PE_PanelItemViewItem, option, painter, option.widget)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        hovered_index, hovered_name = self.hovered
+        for (name, icon, colors, _), (_, rect) in zip(self.buttons, self.button_rects(option.rect)):
+            painter.setBrush(colors[hovered_index == index and hovered_name == name])
+            painter.drawRoundedRect(rect, 8, 8)
+            icon_rect = QRect(rect.topLeft(), ICON_SIZE)
+            icon_rect.moveCenter(rect.center())
+            icon.paint(painter, icon_rect)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        width = len(self.buttons) * BUTTON_SIZE.width() + (len(self.buttons) + 1) * BUTTON_SPACING
+        return QSize(width, BUTTON_SIZE.height() + 2 * BUTTON_SPACING)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            name = self.button_at(option.rect, event.position().toPoint())
+            for button_name, _, _, callback in self.buttons:
+                if button_name == name and callback:
+                    callback(index.data(ID_ROLE))
+                    return True
+        return super().editorEvent(event, model, option, index)
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.MouseMove:
+            index = self.view.indexAt(event.position().toPoint())
+            name = None
+            if index.isValid() and self.view.itemDelegateForColumn(index.column()) is self:
+                name = self.button_at(self.view.visualRect(index), event.position().toPoint())
+            self._set_hovered(index if name else QModelIndex(), name)
+        elif event.type() == QEvent.Leave:
+            self._set_hovered(QModelIndex(), None)
+        return False
+
+    def _set_hovered(self, index, name):
+        previous_index, previous_name = self.hovered
+        if (previous_index, previous_name) == (index, name):
+            return
+        self.hovered = (QPersistentModelIndex(index), name)
+        # Seules les cellules concernées sont redessinées.
+        for changed in (previous_index, index):
+            if changed.isValid():
+                self.view.viewport().update(self.view.visualRect(QModelIndex(changed)))
+        if name:
+            self.view.viewport().setCursor(Qt.PointingHandCursor)
+        else:
+            self.view.viewport().unsetCursor()
@@ -1,5 +1,6 @@
 from imports import QWidget, QVBoxLayout, QColor, QHBoxLayout, QGraphicsDropShadowEffect
 import qtawesome as qta
+from .effects import set_loading_effect
 from .label import Label
 from utils.qss_file_loader import load_stylesheet
 
@@ -12,12 +13,16 @@ class DashboardCardWidget(QWidget):
         title (str): The title text of the card.
         content (str): The main content of the card.
         icon_name (str, optional): The name of the QtAwesome icon. Defaults to 'fa5s.info-circle'.
+        formatter (callable, optional): Turns the amount given to `set_amount`
+            into the displayed text. Defaults to str.
     """
 
     def __init__(
-        self, icon_name, title="", content="", theme_name="primary", icon_color="white", parent=None
+        self, icon_name, title="", content="", theme_name="primary", icon_color="white", formatter=str, parent=None
     ):
         super().__init__(parent)
+        self.formatter = formatter
+        self.amount = 0
         self.setMinimumSize(250, 145)
         self.setMaximumSize(350, 145)
         style = load_stylesheet("styles/dashboard_card_widget.qss")
@@ -75,6 +80,34 @@ class DashboardCardWidget(QWidget):
         """
         self.content_label.set_text(content)
 
+    def set_amount(self, amount):
+        """
+        Affiche un montant, mis en forme par `formatter`.
+
+        Args:
+            amount (float): Le montant à afficher.
+        """
+        self.amount = amount
+        self.set_content(self.formatter(amount))
+
+    def add_amount(self, delta):
+        """
+        Ajoute `delta` au montant affiché, sans relire la base.
+
+        Args:
+            delta (float): Le montant à ajouter (négatif pour retirer).
+        """
+        self.set_amount(self.amount + delta)
+
+    def set_loading(self, loading):
+        """
+        Estompe le contenu pendant son actualisation, sans l'effacer.
+
+        Args:
+            loading (bool): True pendant le chargement des nouvelles valeurs.
+        """
+        set_loading_effect(self.content_label, loading)
+
 
 if __name__ == "__main__":
     import sys
@@ -1,7 +1,10 @@
-from imports import QChart, QChartView, QPainter, QColor, QBarSet, QBarSeries, QBarCategoryAxis, QValueAxis, QPieSeries, QWidget, QVBoxLayout, Qt
+from bisect import bisect_left
+
+from imports import QChart, QChartView, QPainter, QColor, QBarSet, QBarSeries, QBarCategoryAxis, QValueAxis, QPieSeries, QLineSeries, QDateTimeAxis, QDate, QPointF, QWidget, QVBoxLayout, Qt
 from sqlalchemy.engine.row import Row
 
-from utils.utils import get_month_name
+from pyside6_custom_widgets.effects import set_loading_effect
+from utils.time_buckets import bucket_label
 
 class BarChartWidget(QWidget):
     """A custom widget for displaying bar charts.
@@ -213,14 +216,19 @@ class BarChartWidgetWithTwoDataSets(QWidget):
         title (str, optional): The title of the chart. Defaults to "Title".
         xlabel (str, optional): The label for the x-axis. Defaults to "X Axis".
         ylabel (str, optional): The label for the y-axis. Defaults to "Y Axis".
+        granularity (str, optional): The time bucket of the data ("day", "week",
+            "month", "quarter" or "year"). Each item holds its bucket key (see
+            `utils/time_buckets.py`) in the attribute of the same name.
+            Defaults to "month".
         parent (QWidget, optional): The parent widget of this widget. Defaults to None.
     """
 
-    def __init__(self, income_data, expense_data, title="Monthly Income vs Expenses", xlabel="Month", ylabel="Amount", parent=None):
+    def __init__(self, income_data, expense_data, title="Monthly Income vs Expenses", xlabel="Month", ylabel="Amount", granularity="month", parent=None):
         """Initialize the BarChartWidget with the provided data and labels."""
         super().__init__(parent)
         self.income_data = income_data
         self.expense_data = expense_data
+        self.granularity = granularity
         self.xlabel = xlabel
         self.ylabel = ylabel
         self.title = title
@@ -271,41 +279,231 @@ class BarChartWidgetWithTwoDataSets(QWidget):
 
     def process_data(self):
         """Process the income and expense data and populate the bar sets with values."""
-        self.income_bar_set.remove(0, self.income_bar_set.count())
-        self.expense_bar_set.remove(0, self.expense_bar_set.count())
-        
-        # Ensure that the data is aligned by month
-        months = set(item.month for item in self.income_data).union(item.month for item in self.expense_data)
-        sorted_months = sorted(months)
+        self.buckets, income_values, expense_values = self.extract_values()
+        self.fill_bar_set(self.income_bar_set, income_values)
+        self.fill_bar_set(self.expense_bar_set, expense_values)
+
+    def extract_values(self):
+        """Return the sorted bucket keys and the income and expense values aligned on them."""
+        # Ensure that the data is aligned by bucket; the keys sort chronologically
+        income_dict = {getattr(item, self.granularity): float(item.total_income) for item in self.income_data}
+        expense_dict = {getattr(item, self.granularity): float(item.total_expense) for item in self.expense_data}
+        buckets = sorted(set(income_dict).union(expense_dict))
+        return (
+            buckets,
+            [income_dict.get(bucket, 0.0) for bucket in buckets],
+            [expense_dict.get(bucket, 0.0) for bucket in buckets],
+        )
+
+    @staticmethod
+    def fill_bar_set(bar_set, values):
+        """Replace every value of a bar set in one batch.
+
+        Args:
+            bar_set (QBarSet): The bar set to fill.
+            values (list[float]): Its new values.
+        """
+        # Un retrait et un ajout groupés : le graphique n'est recalculé qu'une fois.
+        bar_set.remove(0, bar_set.count())
+        bar_set.append(values)
+
+    @classmethod
+    def update_bar_set(cls, bar_set, values):
+        """Write new values into a bar set of the same length, touching only the changed bars.
 
-        income_dict = {item.month: item.total_income for item in self.income_data}
-        expense_dict = {item.month: item.total_expense for item in self.expense_data}
+        When more than a quarter of the bars changed, the bar set is refilled
+        in one batch instead.
 
-        for month in sorted_months:
-            self.income_bar_set.append(income_dict.get(month, 0))
-            self.expense_bar_set.append(expense_dict.get(month, 0))
+        Args:
+            bar_set (QBarSet): The bar set to update.
+            values (list[float]): Its new values, one per bar.
+        """
+        changed = [index for index, value in enumerate(values) if bar_set.at(index) != value]
+        if len(changed) > len(values) // 4:
+            cls.fill_bar_set(bar_set, values)
+            return
+        for index in changed:
+            bar_set.replace(index, values[index])
 
     def extract_categories(self):
         """Extract categories (x-axis labels) from the data."""
-        months = set(item.month for item in self.income_data).union(item.month for item in self.expense_data)
-        sorted_months = sorted(months)
-        return [f"{get_month_name(int(month))}" for month in sorted_months]
+        return [bucket_label(bucket, self.granularity) for bucket in self.buckets]
 
-    def update_chart(self, new_income_data, new_expense_data):
-        """Update the chart with new data and refresh the display.
+    def update_chart(self, new_income_data, new_expense_data, animate=False):
+        """Update the chart with new data, changing only what differs.
+
+        When the buckets did not change, the x axis is kept and only the bars
+        whose value changed are replaced. A few buckets added or removed are
+        inserted into or removed from the axis one by one; the axis is only
+        rebuilt when more than a quarter of the buckets changed. Data
+        refreshes are not animated.
 
         Args:
             new_income_data (list): The new income data to be used for the chart.
             new_expense_data (list): The new expense data to be used for the chart.
+            animate (bool, optional): Animate the change. Defaults to False.
         """
         self.income_data = new_income_data
         self.expense_data = new_expense_data
+        self.chart.setAnimationOptions(QChart.SeriesAnimations if animate else QChart.NoAnimation)
+        buckets, income_values, expense_values = self.extract_values()
+        if buckets != self.buckets:
+            added = set(buckets).difference(self.buckets)
+            removed = set(self.buckets).difference(buckets)
+            if len(added) + len(removed) > len(buckets) // 4:
+                self.buckets = buckets
+                self.fill_bar_set(self.income_bar_set, income_values)
+                self.fill_bar_set(self.expense_bar_set, expense_values)
+                self.categories = self.extract_categories()
+                self.axis_x.clear()
+                self.axis_x.append(self.categories)
+                return
+            for bucket in removed:
+                self.remove_bucket(self.buckets.index(bucket))
+            for bucket in sorted(added):
+                self.insert_bucket(bisect_left(self.buckets, bucket), bucket)
+        self.update_bar_set(self.income_bar_set, income_values)
+        self.update_bar_set(self.expense_bar_set, expense_values)
+
+    def insert_bucket(self, index, bucket):
+        """Insert an empty bucket at `index` in the bar sets and on the x axis."""
+        self.buckets.insert(index, bucket)
+        self.income_bar_set.insert(index, 0)
+        self.expense_bar_set.insert(index, 0)
+        self.categories.insert(index, bucket_label(bucket, self.granularity))
+        self.axis_x.insert(index, self.categories[index])
+
+    def remove_bucket(self, index):
+        """Remove the bucket at `index` from the bar sets and the x axis."""
+        del self.buckets[index]
+        self.income_bar_set.remove(index, 1)
+        self.expense_bar_set.remove(index, 1)
+        self.axis_x.remove(self.categories.pop(index))
+
+    def apply_delta(self, bucket, income_delta=0, expense_delta=0):
+        """Add amounts to the bars of one bucket without rebuilding the bar sets.
+
+        A bucket that has no bar yet is inserted at its place on the axis.
+
+        Args:
+            bucket (str): The bucket key, e.g. "2024-01" for a monthly chart.
+            income_delta (Money | float, optional): Amount to add to the income bar.
+            expense_delta (Money | float, optional): Amount to add to the expense bar.
+        """
+        index = bisect_left(self.buckets, bucket)
+        if index == len(self.buckets) or self.buckets[index] != bucket:
+            self.insert_bucket(index, bucket)
+        if income_delta:
+            self.income_bar_set.replace(index, self.income_bar_set.at(index) + float(income_delta))
+        if expense_delta:
+            self.expense_bar_set.replace(index, self.expense_bar_set.at(index) + float(expense_delta))
+
+    def set_loading(self, loading):
+        """Dim the chart while new data is being loaded, keeping the current one.
+
+        Args:
+            loading (bool): True while the data is being refreshed.
+        """
+        set_loading_effect(self.chart_view, loading)
+
+
+class LineChartWidget(QWidget):
+    """A custom widget for displaying a value over time as a line chart.
+
+    Args:
+        data (list): Objects with a date and a value, in chronological order.
+        date_attr (str, optional): The attribute holding the date. Defaults to "date".
+        value_attr (str, optional): The attribute holding the value. Defaults to "value".
+        title (str, optional): The title of the chart. Defaults to "Title".
+        xlabel (str, optional): The label for the x-axis. Defaults to "Date".
+        ylabel (str, optional): The label for the y-axis. Defaults to "Y Axis".
+        date_format (str, optional): Qt format of the dates on the x-axis. Defaults to "dd/MM/yyyy".
+        parent (QWidget, optional): The parent widget of this widget. Defaults to None.
+    """
+
+    def __init__(self, data, date_attr="date", value_attr="value", title="Title", xlabel="Date", ylabel="Y Axis", date_format="dd/MM/yyyy", parent=None):
+        """Initialize the LineChartWidget with the provided data and labels."""
+        super().__init__(parent)
+        self.data = data
+        self.date_attr = date_attr
+        self.value_attr = value_attr
+        self.title = title
+        self.xlabel = xlabel
+        self.ylabel = ylabel
+        self.date_format = date_format
+
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Set up the user interface for the line chart widget."""
+        self.series = QLineSeries()
+        self.series.setName(self.ylabel)
+        self.series.setColor(QColor("#1976D2"))
+
+        self.chart = QChart()
+        self.chart.addSeries(self.series)
+        self.chart.setTitle(self.title)
+        self.chart.setTheme(QChart.ChartThemeLight)
+        self.chart.legend().hide()
+
+        self.axis_x = QDateTimeAxis()
+        self.axis_x.setFormat(self.date_format)
+        self.axis_x.setTitleText(self.xlabel)
+        self.chart.addAxis(self.axis_x, Qt.AlignBottom)
+        self.series.attachAxis(self.axis_x)
+
+        self.axis_y = QValueAxis()
+        self.axis_y.setTitleText(self.ylabel)
+        self.chart.addAxis(self.axis_y, Qt.AlignLeft)
+        self.series.attachAxis(self.axis_y)
+
+        self.process_data()
+
+        self.chart_view = QChartView(self.chart)
+        self.chart_view.setRenderHint(QPainter.Antialiasing)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.chart_view)
+        self.setLayout(layout)
+
+    def process_data(self):
+        """Replace the points of the series with the data, in one call."""
+        moments = []
+        points = []
+        for item in self.data:
+            day = getattr(item, self.date_attr)
+            moments.append(QDate(day.year, day.month, day.day).startOfDay())
+            points.append(QPointF(moments[-1].toMSecsSinceEpoch(), float(getattr(item, self.value_attr))))
+        self.series.replace(points)
+        if not points:
+            return
+
+        self.axis_x.setRange(moments[0], moments[-1])
+        values = [point.y() for point in points]
+        low, high = min(values), max(values)
+        if low == high:
+            low, high = low - 1, high + 1
+        self.axis_y.setRange(low, high)
+        self.axis_y.applyNiceNumbers()
+
+    def update_chart(self, new_data):
+        """Update the chart with new data and refresh the display.
+
+        Args:
+            new_data (list): The new data to be used for the chart.
+        """
+        self.data = new_data
         self.process_data()
-        self.categories = self.extract_categories()
-        self.axis_x.clear()
-        self.axis_x.append(self.categories)
         self.chart_view.repaint()
 
+    def set_loading(self, loading):
+        """Dim the chart while new data is being loaded, keeping the current one.
+
+        Args:
+            loading (bool): True while the data is being refreshed.
+        """
+        set_loading_effect(self.chart_view, loading)
+
 
 class PieChartWidget(QWidget):
     """A custom widget for displaying pie charts with support for various data formats.
@@ -318,21 +516,28 @@ class PieChartWidget(QWidget):
         title (str, optional): The title of the chart. Defaults to "My Title".
         category_attr (str, optional): The attribute or key for categories. Defaults to "category".
         value_attr (str, optional): The attribute or key for values. Defaults to 'value'.
+        remainder_attr (str, optional): The attribute or key flagging the item
+            that sums the categories left out of the data (e.g.
+            "is_remainder"); deltas of those categories go to its slice. Slices
+            are keyed on the flag and the category, so the remainder never
+            merges with a category of the same label. Defaults to None.
         parent (QWidget, optional): The parent widget of this widget. Defaults to None.
     """
 
-    def __init__(self, data, title="My Title", category_attr=None, value_attr=None, parent=None):
+    def __init__(self, data, title="My Title", category_attr=None, value_attr=None, remainder_attr=None, parent=None):
         """Initialize the PieChartWidget with the provided data and title."""
         super().__init__(parent)
         self.data = data
         self.title = title
         self.category_attr = category_attr
         self.value_attr = value_attr
+        self.remainder_attr = remainder_attr
         self.setup_ui()
 
     def setup_ui(self):
         """Set up the user interface for the pie chart widget."""
         self.series = QPieSeries()
+        self.slices = {}
         self.process_data()
 
         chart = QChart()
@@ -340,9 +545,6 @@ class PieChartWidget(QWidget):
         chart.setTitle(self.title)
         chart.setAnimationOptions(QChart.SeriesAnimations)
 
-        for slice in self.series.slices():
-            slice.setLabelVisible(True)
-
         self.chart_view = QChartView(chart)
         self.chart_view.setRenderHint(QPainter.Antialiasing)
 
@@ -351,21 +553,71 @@ class PieChartWidget(QWidget):
         self.setLayout(layout)
 
     def process_data(self):
-        """Process the data and add it to the pie chart series."""
-        self.series.clear()
+        """Update the pie chart series from the data, in place.
+
+        The slice of a category already shown only gets its new value: slices
+        are appended or removed only when the categories change.
+        """
+        values = {}
         for item in self.data:
+            is_remainder = False
             if isinstance(item, Row) and len(item) == 2:
                 # If the data is in tuple format, e.g., (category, value)
                 category, value = item
-                self.series.append(str(category), value)
             elif isinstance(item, dict):
                 # If the data is in dictionary format, e.g., {'category': 'Food', 'value': 100}
                 category = item.get(self.category_attr, 'Unknown')
                 value = item.get(self.value_attr, 0)
-                self.series.append(str(category), value)
+                is_remainder = bool(self.remainder_attr and item.get(self.remainder_attr))
             else:
                 # Default case for list of objects with attributes
-                self.series.append(str(getattr(item, self.category_attr)), getattr(item, self.value_attr))
+                category, value = getattr(item, self.category_attr), getattr(item, self.value_attr)
+                is_remainder = bool(self.remainder_attr and getattr(item, self.remainder_attr, False))
+            values[(is_remainder, str(category))] = float(value)
+
+        for key in [key for key in self.slices if key not in values]:
+            self.series.remove(self.slices.pop(key))
+        for key, value in values.items():
+            slice = self.slices.get(key)
+            if slice is None:
+                self._append_slice(key, value)
+            elif slice.value() != value:
+                slice.setValue(value)
+
+    def _append_slice(self, key, value):
+        slice = self.series.append(key[1], value)
+        slice.setLabelVisible(True)
+        self.slices[key] = slice
+
+    def _remainder_key(self):
+        """Return the key of the remainder slice, or None when there is none."""
+        return next((key for key in self.slices if key[0]), None)
+
+    def apply_delta(self, category, delta):
+        """Add `delta` to the slice of `category` without rebuilding the series.
+
+        The slice is created if needed and removed when its value drops to zero.
+        A category without a slice goes to the remainder slice when there is
+        one, since the data left it out.
+
+        Args:
+            category (str): The label of the slice.
+            delta (Money | float): The amount to add (negative to subtract).
+        """
+        key = (False, str(category))
+        delta = float(delta)
+        if key not in self.slices and self._remainder_key() is not None:
+            key = self._remainder_key()
+        slice = self.slices.get(key)
+        if slice is None:
+            if delta > 0:
+                self._append_slice(key, delta)
+            return
+        value = slice.value() + delta
+        if value <= 0:
+            self.series.remove(self.slices.pop(key))
+        else:
+            slice.setValue(value)
 
     def update_chart(self, new_data):
         """Update the pie chart with new data and refresh the display.
@@ -377,6 +629,15 @@ class PieChartWidget(QWidget):
         self.process_data()
         self.chart_view.repaint()
 
+    def set_loading(self, loading):
+        """Dim the chart while new data is being loaded, keeping the current one.
+
+        Args:
+            loading (bool): True while the data is being refreshed.
+        """
+        set_loading_effect(self.chart_view, loading)
+
+
 class PieChartWidget2(QWidget):
     """A custom widget for displaying pie charts.
 
@@ -0,0 +1,17 @@
+from imports import QGraphicsOpacityEffect
+
+
+def set_loading_effect(widget, loading):
+    """
+    Estompe `widget` pendant une actualisation et le rétablit ensuite.
+
+    Args:
+        widget (QWidget): Le widget dont le contenu est en cours d'actualisation.
+        loading (bool): True pendant le chargement des nouvelles valeurs.
+    """
+    if loading:
+        effect = QGraphicsOpacityEffect(widget)
+        effect.setOpacity(0.45)
+        widget.setGraphicsEffect(effect)
+    else:
+        widget.setGraphicsEffect(None)
@@ -0,0 +1,97 @@
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from pyside6_custom_widgets.action_delegate import ID_ROLE
+
+# Nombre de lignes lues à chaque fetchMore.
+FETCH_CHUNK = 200
+
+
+class LazyTableModel(QAbstractTableModel):
+    """
+    Table model reading its rows chunk by chunk from a controller.
+
+    Rows are fetched through `fetch_page` (`BaseController.query_page` or any
+    callable with its contract) when the view asks for more with
+    canFetchMore/fetchMore, i.e. when it is scrolled near the last loaded row.
+    Cells are formatted in `data`, which the view only calls for the rows
+    it paints; every cell of a row gives the record ID under ID_ROLE.
+
+    Args:
+        columns (list[str]): Names of the columns read with `value_getter`.
+        headers (list[str]): Header labels. Headers beyond `columns` (e.g.
+            "Actions") get empty cells.
+        value_getter (callable): value_getter(row, column) -> value.
+        formatter (callable): formatter(value, column_index) -> str.
+        chunk_size (int, optional): Rows read at a time. Defaults to FETCH_CHUNK.
+        parent (QObject, optional): The parent object. Defaults to None.
+    """
+
+    def __init__(self, columns, headers, value_getter, formatter, chunk_size=FETCH_CHUNK, parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self.headers = headers
+        self.value_getter = value_getter
+        self.formatter = formatter
+        self.chunk_size = chunk_size
+        self.fetch_page = None
+        self.rows = []
+        self.next_key = None
+        self.total = 0
+
+    def set_source(self, fetch_page, page=None):
+        """
+        Replace the rows by those of `fetch_page` and read the first chunk.
+
+        Args:
+            fetch_page (callable): fetch_page(key, limit) -> Page, called with
+                key None for the first chunk, then with `Page.next_key`.
+            page (Page, optional): The first chunk, when already read, e.g.
+                on a background thread.
+        """
+        if page is None:
+            page = fetch_page(None, self.chunk_size)
+        self.beginResetModel()
+        self.fetch_page = fetch_page
+        self.rows = list(page.rows)
+        self.next_key = page.next_key
+        self.total = page.total
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.next_key is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        page = self.fetch_page(self.next_key, self.chunk_size)
+        self.next_key = page.next_key
+        self.total = page.total
+        if page.rows:
+            self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(page.rows) - 1)
+            self.rows.extend(page.rows)
+            self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == ID_ROLE:
+            return self.rows[index.row()].id
+        if role != Qt.DisplayRole or index.column() >= len(self.columns):
+            return None
+        value = self.value_getter(self.rows[index.row()], self.columns[index.column()])
+        return self.formatter(value, index.column())
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    def row(self, row_index):
+        """Return the record shown on a row."""
+        return self.rows[row_index]
@@ -0,0 +1,194 @@
+from PySide6.QtWidgets import QHeaderView, QMessageBox, QTableView
+
+from utils.formatting import format_number
+from utils.workers import Debouncer, LatestTaskRunner
+from pyside6_custom_widgets.table_model import FETCH_CHUNK, LazyTableModel
+from pyside6_custom_widgets.table_widget import CustomTableWidget
+
+# Délai sans saisie avant de lancer une requête de filtrage.
+FILTER_DELAY_MS = 250
+
+
+class CustomTableView(CustomTableWidget):
+    """
+    Model-backed variant of CustomTableWidget for large tables.
+
+    Takes the same arguments as CustomTableWidget, but the rows are not
+    copied into table items: a LazyTableModel reads them from the controller
+    chunk by chunk (`BaseController.query_page`) as the table is scrolled, and
+    only the visible cells are formatted. Rows are snapshots
+    (`BaseController.get_snapshot_type`), not model instances. The
+    pagination buttons scroll by `items_per_page` rows; totals are computed
+    by the database.
+
+    The search bar, the filter widgets and the sort headers update one
+    FilterSpec, compiled into a single query. They are debounced: a filter runs
+    `filter_delay_ms` after the last change, on a background thread, and
+    only the result of the latest filter is shown.
+
+    Args:
+        chunk_size (int, optional): Rows read from the controller at a time.
+            Defaults to FETCH_CHUNK.
+        filter_delay_ms (int, optional): Quiet time before a filter runs.
+            Defaults to FILTER_DELAY_MS.
+    """
+
+    def __init__(
+        self,
+        model,
+        controller=None,
+        edit_column=True,
+        formatter=None,
+        edit_callback=None,
+        delete_callback=None,
+        create_command=None,
+        custom_style=None,
+        enable_pagination=True,
+        items_per_page=10,
+        chunk_size=FETCH_CHUNK,
+        filter_delay_ms=FILTER_DELAY_MS,
+    ):
+        self.chunk_size = chunk_size
+        self.source = None
+        # Requêtes de filtrage hors du thread GUI : seul le dernier résultat est affiché.
+        self.filter_runner = LatestTaskRunner()
+        self.filter_debouncer = Debouncer(self._run_filter, filter_delay_ms)
+        super().__init__(
+            model,
+            controller=controller,
+            edit_column=edit_column,
+            formatter=formatter,
+            edit_callback=edit_callback,
+            delete_callback=delete_callback,
+            create_command=create_command,
+            custom_style=custom_style,
+            enable_pagination=enable_pagination,
+            items_per_page=items_per_page,
+        )
+        self.filter_runner.result.connect(self._show_source)
+        self.filter_runner.error.connect(self._on_filter_error)
+
+    def _get_instances(self):
+        # Les lignes sont lues par morceaux par le modèle de table.
+        return None
+
+    def _create_table(self):
+        return QTableView()
+
+    def _set_headers(self):
+        """
+        Sets the column headers and the model of the table view.
+        """
+        self.headers = self._get_headers()
+        if self.edit_column and "Actions" not in self.headers:
+            self.headers.append("Actions")
+
+        self.table_model = LazyTableModel(
+            self.columns,
+            self.headers,
+            value_getter=self.get_column_value,
+            formatter=self.format_value,
+            chunk_size=self.chunk_size,
+            parent=self,
+        )
+        self.table.setModel(self.table_model)
+        self.table.setColumnHidden(self.headers.index("id"), True)
+        # Hauteur fixe : la vue n'a pas à mesurer chaque ligne.
+        vertical_header = self.table.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.Fixed)
+        if self.edit_column:
+            vertical_header.setDefaultSectionSize(50)
+        self.table_model.rowsInserted.connect(self._on_rows_fetched)
+
+    def get_column_value(self, instance, column):
+        """
+        Reads a column of a row snapshot; foreign keys already hold the label of the related record.
+        """
+        return getattr(instance, column)
+
+    def _spec_source(self, spec):
+        """Rows matching a FilterSpec, read from the database page by page, with their totals."""
+
+        def fetch_page(key, limit):
+            return self.controller.query_page(spec, key, limit, snapshots=True)
+
+        def open_source():
+            first_page = fetch_page(None, self.chunk_size)
+            return fetch_page, first_page, first_page.amount_total
+
+        return open_source
+
+    def _set_data(self):
+        # Les lignes sont relues par le modèle, à travers `filter_spec`.
+        self.source = None
+        self.update_pagination()
+
+    def apply_filters(self):
+        """
+        Shows the rows matching `filter_spec` once the filter widgets are left alone.
+        """
+        self.source = self._spec_source(self.filter_spec)
+        self.filter_debouncer.trigger()
+
+    def _run_filter(self):
+        """
+        Loads the current rows in the background; a newer filter supersedes it.
+        """
+        self.filter_runner.submit(self.source)
+
+    def update_pagination(self):
+        """
+        Shows the first chunk of the current rows and their totals, at once.
+
+        Pending filters are cancelled: their results would be older.
+        """
+        self.filter_debouncer.cancel()
+        self.filter_runner.cancel()
+        if self.source is None:
+            self.source = self._spec_source(self.filter_spec)
+        self._show_source(self.source())
+
+    def _show_source(self, opened_source):
+        """
+        Shows the rows and the amount total returned by a source.
+        """
+        fetch_page, first_page, self.amount_total = opened_source
+        self.table_model.set_source(fetch_page, first_page)
+        self._on_rows_fetched(None, 0, self.table_model.rowCount() - 1)
+        self.update_amount_total()
+
+    def _on_filter_error(self, error):
+        QMessageBox.critical(self, "Erreur", f"Impossible de filtrer les données : {error}")
+
+    def _on_rows_fetched(self, parent, first, last):
+        """
+        Updates the row count once rows are fetched.
+        """
+        self.pagination_info_label.setText(
+            f"Showing {self.table_model.rowCount()} of {self.table_model.total} rows"
+        )
+
+    def update_amount_total(self):
+        """
+        Updates the label to show the total amount of the current rows if the 'amount' column exists.
+        """
+        if "amount" in self.columns:
+            self.amount_total_label.setText(f"Total Amount: {format_number(self.amount_total)}")
+        else:
+            self.amount_total_label.clear()
+
+    def show_prev_page(self):
+        """
+        Scrolls the table up by one page.
+        """
+        self._scroll_rows(-self.items_per_page)
+
+    def show_next_page(self):
+        """
+        Scrolls the table down by one page; rows are fetched as needed.
+        """
+        self._scroll_rows(self.items_per_page)
+
+    def _scroll_rows(self, count):
+        scroll_bar = self.table.verticalScrollBar()
+        scroll_bar.setValue(scroll_bar.value() + count)
@@ -1,6 +1,8 @@
+from dataclasses import replace
+
 from sqlalchemy import Date, DateTime
-from babel.numbers import format_decimal
 
+from PySide6.QtCore import QSignalBlocker, Qt
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
@@ -11,12 +13,18 @@ from PySide6.QtWidgets import (
     QMessageBox,
 )
 
+from controllers.base_controller import FilterSpec
+from database.database import session_scope
+from models.base_model import display_columns
+from models.money import Money
+from utils.formatting import format_column, format_number, format_value
+from pyside6_custom_widgets.action_delegate import ID_ROLE, ActionButtonsDelegate
 from pyside6_custom_widgets.button import Button
 from pyside6_custom_widgets.date_edit import DateEdit
 from pyside6_custom_widgets.label import Label
 from pyside6_custom_widgets.combobox_3 import ComboBox
 from pyside6_custom_widgets.line_edit import LineEdit
-from pyside6_custom_widgets.widget_items_button import ActionButtonsWidget, ActionButtonsWidget2
+from pyside6_custom_widgets.widget_items_button import ActionButtonsWidget2
 from utils.qss_file_loader import load_stylesheet
 
 
@@ -63,6 +71,10 @@ class CustomTableWidget(QWidget):
         self.items_per_page = items_per_page
         self.current_page = 0
         self.current_combo_filter_name = None
+        self.current_start_filter_date = None
+        self.current_end_filter_date = None
+        # Filtres et tri courants, mis à jour un par un par les widgets de filtrage.
+        self.filter_spec = FilterSpec()
         self.instances = self._get_instances()
         self.filtered_instances = self._get_instances()
 
@@ -97,7 +109,7 @@ class CustomTableWidget(QWidget):
         self.cancel_filter_button = Button(
             text="",
             icon_name="fa.times-circle",
-            command=self.refresh_data,
+            command=self.cancel_filters,
             theme_color="secondary",
         )
         self.search_bar = LineEdit(
@@ -110,8 +122,13 @@ class CustomTableWidget(QWidget):
         self.add_dynamic_filters()
         self.filter_layout.addStretch()
         # Table setup
-        self.table = QTableWidget()
+        self.table = self._create_table()
         self._set_headers()
+        # Un clic sur un en-tête trie les lignes dans la base.
+        header = self.table.horizontalHeader()
+        header.setSortIndicatorShown(True)
+        header.setSortIndicator(-1, Qt.AscendingOrder)
+        header.sortIndicatorChanged.connect(self.sort_by_column)
 
         if "Actions" in self.headers:
             action_col_index = self.headers.index("Actions")
@@ -129,6 +146,14 @@ class CustomTableWidget(QWidget):
 
             # Set the 'Actions' column to have a fixed size
             header.setSectionResizeMode(action_col_index, QHeaderView.Fixed)
+
+            # One delegate paints the buttons of every row
+            self.action_delegate = ActionButtonsDelegate(
+                self.table,
+                edit_callback=self.edit_callback,
+                delete_callback=self.delete_callback or self.delete_instance,
+            )
+            self.table.setItemDelegateForColumn(action_col_index, self.action_delegate)
         self.table.setSelectionBehavior(QTableWidget.SelectRows)  # Select whole rows
         self.table.setSelectionMode(QTableWidget.SingleSelection)
         self.table.setAlternatingRowColors(True)
@@ -157,6 +182,12 @@ class CustomTableWidget(QWidget):
 
         self.layout.addLayout(self.pagination_layout)
 
+    def _create_table(self):
+        """
+        Creates the table widget showing the rows.
+        """
+        return QTableWidget()
+
     def _set_headers(self):
         """
         Sets the column headers for the QTableWidget.
@@ -216,26 +247,27 @@ class CustomTableWidget(QWidget):
         """
         if col in self.formatter:
             return self.formatter[col](value)  # Apply custom formatter
+        return format_value(value)  # Numbers, amounts and dates in the fr_FR format
 
-        if isinstance(value, (int, float)):  # Format numbers with thousand separators
-            return format_decimal(value, locale="fr_FR")
-        elif isinstance(value, Date):  # Format dates
-            return value.strftime("%d/%m/%Y")
-        elif isinstance(value, DateTime):
-            return value.strftime("%d/%m/%Y %H:%M")
-        else:
-            return str(value)
+    def format_column(self, values, col):
+        """
+        Formats all the values of a column in one call, each distinct value once.
+        """
+        return format_column(values, self.formatter.get(col, format_value))
 
     def populate_table(self, instances):
         self.table.setRowCount(0)
         id_col_index = self.headers.index("id")
+        columns = [
+            self.format_column([self.get_column_value(instance, col) for instance in instances], col_idx)
+            for col_idx, col in enumerate(self.columns)
+        ]
         for row_idx, instance in enumerate(instances):
             row_position = self.table.rowCount()
             self.table.insertRow(row_position)
 
             for col_idx, col in enumerate(self.columns):
-                value = self.get_column_value(instance, col)
-                formatted_value = self.format_value(value, col_idx)
+                formatted_value = columns[col_idx][row_idx]
                 self.table.setItem(
                     row_position, col_idx, QTableWidgetItem(formatted_value)
                 )
@@ -243,19 +275,10 @@ class CustomTableWidget(QWidget):
                     self.table.setColumnHidden(row_position, True)
 
             if self.edit_column:
-                action_widget = ActionButtonsWidget(
-                    modify_callback=lambda _, r=instance.id: (
-                        self.edit_callback(r) if self.edit_callback else None
-                    ),
-                    delete_callback=lambda _, r=instance.id: (
-                        self.delete_callback(r)
-                        if self.delete_callback
-                        else self.delete_instance
-                    ),
-                )
-                self.table.setCellWidget(
-                    row_position, len(self.headers) - 1, action_widget
-                )
+                # The buttons are painted by the delegate from the row's id
+                action_item = QTableWidgetItem()
+                action_item.setData(ID_ROLE, instance.id)
+                self.table.setItem(row_position, len(self.headers) - 1, action_item)
                 self.table.setRowHeight(row_position, 50)
 
     def get_column_value(self, instance, column):
@@ -291,136 +314,108 @@ class CustomTableWidget(QWidget):
 
     def _get_columns(self):
         """
-        Récupère et trie les colonnes du modèle SQLAlchemy en fonction de `tab_col_index`.
+        Récupère les colonnes du modèle SQLAlchemy triées selon `tab_col_index`.
         Les colonnes avec des valeurs négatives de `tab_col_index` apparaissent à la fin.
         """
-        # Récupérer toutes les colonnes avec leur ordre `tab_col_index` spécifié dans le modèle
-        columns_with_order = [
-            (col.info.get("tab_col_index", index), col.name)
-            for index, col in enumerate(self.model.__table__.columns)
-        ]
-
-        # Séparer les colonnes avec des index négatifs (qui iront en dernier) et positifs/nuls
-        positive_columns = [
-            (index, name) for index, name in columns_with_order if index >= 0
-        ]
-        negative_columns = [
-            (index, name) for index, name in columns_with_order if index < 0
-        ]
-
-        # Trier les colonnes positives par `tab_col_index` croissant et les négatives également
-        sorted_positive_columns = sorted(positive_columns)
-        sorted_negative_columns = sorted(negative_columns)
-
-        # Combiner les colonnes positives d'abord, puis les négatives
-        sorted_columns = [
-            col_name
-            for _, col_name in sorted_positive_columns + sorted_negative_columns
-        ]
-
-        return sorted_columns
+        return [column.name for column in display_columns(self.model)]
 
     def _get_headers(self):
-
-        columns_with_order = [
-            (
-                col.info.get("tab_col_index", index),
-                col.info.get("verbose_name", col.name),
-            )
-            for index, col in enumerate(self.model.__table__.columns)
-        ]
-
-        positive_columns = [
-            (index, name) for index, name in columns_with_order if index >= 0
-        ]
-        negative_columns = [
-            (index, name) for index, name in columns_with_order if index < 0
-        ]
-
-        sorted_positive_columns = sorted(positive_columns)
-        sorted_negative_columns = sorted(negative_columns)
-
-        sorted_columns = [
-            col_name
-            for _, col_name in sorted_positive_columns + sorted_negative_columns
-        ]
-
-        return sorted_columns
+        return [column.info.get("verbose_name", column.name) for column in display_columns(self.model)]
 
     def _set_data(self):
         """
         Sets the table data and refreshes the table.
 
-        Args:
-            instances (list): A list of model instances.
+        The rows are read again through `filter_spec`: the filters and the
+        sort order survive a refresh (e.g. after a create, edit or delete).
         """
         self.instances = self._get_instances()
-        self.filtered_instances = self._get_instances()
+        if self.filter_spec == FilterSpec():
+            self.filtered_instances = self._get_instances()
+        else:
+            self.filtered_instances = self.controller.query_page(self.filter_spec, limit=None).rows
         self.update_pagination()
 
     def refresh_data(self):
         """
         Refresh the data displayed in the table.
         """
-        self._set_data()
-        self.update_combobox_items()
+        with session_scope():
+            self._set_data()
+            self.update_combobox_items()
 
-    def filter_data(self):
+    def cancel_filters(self):
         """
-        Filters the table data based on the search text.
+        Clears the filters, the sort order and the filter widgets, then refreshes the table.
         """
-        search_text = self.search_bar.get_text().lower()
-
-        if search_text:
-            self.filtered_instances = [
-                instance
-                for instance in self.instances
-                if self.instance_matches_search(instance, search_text)
-            ]
-        else:
-            self.filtered_instances = self.instances
+        # Vider les widgets sans déclencher leurs filtres : la liste n'est relue qu'une fois.
+        with QSignalBlocker(self.search_bar.line_edit):
+            self.search_bar.clear_content()
+        combo_filter = self.findChild(ComboBox, self.current_combo_filter_name) if self.current_combo_filter_name else None
+        if combo_filter:
+            with QSignalBlocker(combo_filter.combobox):
+                combo_filter.combobox.setCurrentIndex(0)
+        for name in (self.current_start_filter_date, self.current_end_filter_date):
+            date_filter = self.findChild(DateEdit, name) if name else None
+            if date_filter:
+                with QSignalBlocker(date_filter.date_edit):
+                    date_filter.clear_content()
+        with QSignalBlocker(self.table.horizontalHeader()):
+            self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.filter_spec = FilterSpec()
+        self.current_page = 0
+        self.refresh_data()
 
-        self.update_pagination()
+    def filter_data(self):
+        """
+        Filters the table data based on the search text, keeping the other filters.
+        """
+        search_text = self.search_bar.get_text().strip()
+        self.filter_spec = replace(self.filter_spec, text=search_text)
+        self.apply_filters()
 
     def filter_by_category(self):
+        """
+        Filters the table data on the selected related record, keeping the other filters.
+        """
         cbx = self.findChild(ComboBox, self.current_combo_filter_name)
         id = cbx.get_selected_user_data() if cbx else ""
-
-        if id:
-            self.filtered_instances = self.controller.get_filter_by_category_id(id)
-        else:
-            self.filtered_instances = self.instances
-
-        self.update_pagination()
+        self.filter_spec = self.filter_spec.with_equal(self.current_combo_filter_name, id)
+        self.apply_filters()
 
     def filter_by_period(self):
+        """
+        Filters the table data on the selected dates, keeping the other filters.
+        """
         start_date_edit = self.findChild(DateEdit, self.current_start_filter_date)
         end_date_edit = self.findChild(DateEdit, self.current_end_filter_date)
         start_date = start_date_edit.get_date()
         end_date = end_date_edit.get_date()
-        self.filtered_instances = self.controller.get_filter_by_period(
-            start_date, end_date
-        )
-        self.update_pagination()
+        self.filter_spec = replace(self.filter_spec, date_range=(start_date, end_date))
+        self.apply_filters()
 
-    def instance_matches_search(self, instance, search_text):
+    def sort_by_column(self, column_index, order):
         """
-        Checks if an instance matches the search text.
+        Sorts the table data on a column, keeping the filters.
 
         Args:
-            instance (object): The instance of the SQLAlchemy model.
-            search_text (str): The search input text.
-
-        Returns:
-            bool: True if the instance matches the search text, False otherwise.
+            column_index (int): The clicked column; columns without data
+                (e.g. "Actions") restore the default order.
+            order (Qt.SortOrder): The sort direction.
         """
-        # Exclude the 'Actions' column from the search
-        searchable_columns = [col for col in self.columns if col != "Actions"]
+        sort = ()
+        if 0 <= column_index < len(self.columns):
+            sort = ((self.columns[column_index], order == Qt.DescendingOrder),)
+        self.filter_spec = replace(self.filter_spec, sort=sort)
+        self.apply_filters()
 
-        return any(
-            search_text in str(getattr(instance, col)).lower()
-            for col in searchable_columns
-        )
+    def apply_filters(self):
+        """
+        Shows the rows matching `filter_spec`, read with a single query.
+        """
+        self.filtered_instances = self.controller.query_page(self.filter_spec, limit=None).rows
+        self.current_page = 0
+        self.update_pagination()
 
     def update_pagination(self):
         """
@@ -461,8 +456,8 @@ class CustomTableWidget(QWidget):
         Updates the label to show the total amount of the filtered rows if the 'amount' column exists.
         """
         if "amount" in self.columns:
-            total = sum(getattr(instance, "amount", 0) for instance in self.filtered_instances)
-            self.amount_total_label.setText(f"Total Amount: {format_decimal(total, locale='fr_FR')}")
+            total = sum((getattr(instance, "amount", 0) for instance in self.filtered_instances), Money())
+            self.amount_total_label.setText(f"Total Amount: {format_number(total)}")
         else:
             self.amount_total_label.clear()
             
@@ -519,8 +514,12 @@ class CustomTableWidget(QWidget):
         combo_filter = self.findChild(ComboBox, self.current_combo_filter_name)
         if combo_filter:
             new_items = self.get_cbx_items(self.current_combo_filter_name)
-            combo_filter.combobox.clear()  # Clear existing items
-            combo_filter.set_items(new_items)  # Add updated items
+            selected = combo_filter.get_selected_user_data()
+            with QSignalBlocker(combo_filter.combobox):
+                combo_filter.combobox.clear()  # Clear existing items
+                combo_filter.set_items(new_items)  # Add updated items
+                # Garder l'élément filtré sélectionné, s'il existe encore.
+                combo_filter.combobox.setCurrentIndex(max(combo_filter.combobox.findData(selected), 0))
 
     def get_cbx_items(self, column_name):
         object_list = self.controller.get_related_model_all(column_name)
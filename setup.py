@@ -14,6 +14,7 @@ def find_data_file(filename):
 
 # Liste des dépendances à inclure
 packages = [
+    'alembic',
     'babel',
     'bcrypt',
     'pyparsing',
@@ -34,6 +35,8 @@ packages = [
 # Inclure les fichiers non-Python nécessaires à votre application
 include_files = [
     find_data_file("config.json"), 
+    find_data_file("alembic.ini"),
+    find_data_file("migrations"),
     find_data_file("initial_balance.json"),
     find_data_file("db.db"), 
     find_data_file("resources/icons/icon_3.ico"), 
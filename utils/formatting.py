@@ -0,0 +1,168 @@
+"""
+Locale formatting of numbers, amounts and dates for the screens (fr_FR, XOF).
+
+babel's format_decimal and format_currency resolve the locale and walk the
+pattern again on every call. NumberFormat compiles a pattern once (symbols,
+precision, prefixes and suffixes are read up front) and renders a value with
+str.format(); results are memoised, since lists repeat the same amounts and
+dates many times. format_column formats a whole table column in one call.
+
+Check the output against babel and time both with:
+
+    python -m benchmarks.formatting
+"""
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+
+from babel import Locale
+from babel.numbers import get_currency_precision, get_currency_symbol, get_decimal_symbol, get_group_symbol
+
+from models.money import Money
+
+LOCALE = "fr_FR"
+CURRENCY = "XOF"
+DATE_FORMAT = "%d/%m/%Y"
+DATETIME_FORMAT = "%d/%m/%Y %H:%M"
+
+# Nombre de valeurs formatées gardées en mémoire par format.
+CACHE_SIZE = 65536
+
+
+class NumberFormat:
+    """
+    A babel number pattern of one locale, compiled once.
+
+    Plain patterns (3-digit grouping, no exponent, significant digits,
+    percent or quoted text) are rendered with str.format() and give the same
+    text as babel; other patterns are handed to babel.
+
+    Args:
+        pattern (NumberPattern): The parsed pattern, e.g.
+            `Locale.parse("fr_FR").decimal_formats[None]`.
+        locale (str, optional): The locale. Defaults to LOCALE.
+        currency (str, optional): The currency of a currency pattern; its
+            number of digits replaces the precision of the pattern.
+        cache_size (int, optional): Number of formatted values memoised.
+            Defaults to CACHE_SIZE.
+    """
+
+    def __init__(self, pattern, locale=LOCALE, currency=None, cache_size=CACHE_SIZE):
+        self.pattern = pattern
+        self.locale = Locale.parse(locale)
+        self.currency = currency
+        self.min_frac, self.max_frac = pattern.frac_prec
+        if currency:
+            self.min_frac = self.max_frac = get_currency_precision(currency)
+        self.quantum = Decimal(1).scaleb(-self.max_frac)
+        self.group = get_group_symbol(self.locale)
+        self.decimal = get_decimal_symbol(self.locale)
+        symbol = get_currency_symbol(currency, self.locale) if currency else "¤"
+        self.prefix = tuple(text.replace("¤", symbol) for text in pattern.prefix)
+        self.suffix = tuple(text.replace("¤", symbol) for text in pattern.suffix)
+        self.compiled = (
+            pattern.grouping == (3, 3)
+            and pattern.int_prec[0] == 1
+            and pattern.scale == 0
+            and not pattern.exp_prec
+            and "@" not in pattern.pattern
+            and "'" not in "".join(self.prefix + self.suffix)
+            and "¤¤" not in pattern.pattern
+        )
+        self._cached = lru_cache(maxsize=cache_size)(self._format)
+
+    def __call__(self, value):
+        """
+        Format a number.
+
+        Args:
+            value (Money | int | float | Decimal): The number.
+
+        Returns:
+            str: The formatted number, e.g. "1 234,5".
+        """
+        return self._cached(value)
+
+    def _format(self, value):
+        if isinstance(value, Money):
+            value = value.to_decimal()
+        elif isinstance(value, int):
+            value = Decimal(value)
+        elif not isinstance(value, Decimal):
+            # Comme babel : un float passe par sa représentation décimale.
+            value = Decimal(str(value))
+        if not self.compiled or not value.is_finite():
+            return self.pattern.apply(value, self.locale, currency=self.currency)
+        negative = int(value.is_signed())
+        try:
+            rounded = abs(value).quantize(self.quantum)
+        except InvalidOperation:
+            return self.pattern.apply(value, self.locale, currency=self.currency)
+        integer, _, fraction = f"{rounded:,f}".partition(".")
+        number = integer.replace(",", self.group)
+        fraction = fraction.rstrip("0").ljust(self.min_frac, "0")
+        if fraction and (self.min_frac or fraction.strip("0")):
+            number = f"{number}{self.decimal}{fraction}"
+        return f"{self.prefix[negative]}{number}{self.suffix[negative]}"
+
+
+_locale = Locale.parse(LOCALE)
+format_number = NumberFormat(_locale.decimal_formats[None])
+format_amount = NumberFormat(_locale.currency_formats["standard"], currency=CURRENCY)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def format_date(value):
+    """Format a date as shown in the lists, e.g. "31/01/2024"."""
+    return value.strftime(DATE_FORMAT)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def format_datetime(value):
+    """Format a date and time as shown in the lists, e.g. "31/01/2024 14:05"."""
+    return value.strftime(DATETIME_FORMAT)
+
+
+def format_value(value):
+    """
+    Format a cell value by type: numbers and amounts, dates, date-times.
+
+    Args:
+        value: The value read from a record.
+
+    Returns:
+        str: The text to display; other values go through str().
+    """
+    if isinstance(value, (Money, Decimal, int, float)):
+        return format_number(value)
+    if isinstance(value, datetime):
+        return format_datetime(value)
+    if isinstance(value, date):
+        return format_date(value)
+    return str(value)
+
+
+def format_column(values, formatter=format_value):
+    """
+    Format a whole column, formatting each distinct value only once.
+
+    Args:
+        values (Iterable): The values of the column.
+        formatter (callable, optional): Formats one value. Defaults to
+            format_value.
+
+    Returns:
+        list[str]: The formatted values, in the same order.
+    """
+    memo = {}
+    column = []
+    for value in values:
+        try:
+            text = memo[value]
+        except KeyError:
+            text = memo[value] = formatter(value)
+        except TypeError:
+            # Valeur non hachable : formatée sans mémoire.
+            text = formatter(value)
+        column.append(text)
+    return column
@@ -0,0 +1,83 @@
+"""
+Time bucket keys and labels of the ledger aggregates.
+
+A bucket key always holds the year, so a history spanning several years
+never merges January 2024 with January 2025, and keys sort in chronological
+order as plain strings:
+
+    day       2024-01-31
+    week      2024-W05   (ISO 8601 week, with its ISO year)
+    month     2024-01
+    quarter   2024-Q1
+    year      2024
+
+`bucket_key` computes the key of a date and `bucket_label` turns a key into
+the text shown on the charts. The same keys are computed in SQL by
+`database/time_buckets.py`.
+"""
+from utils.utils import get_month_name
+
+GRANULARITIES = ("day", "week", "month", "quarter", "year")
+
+
+def check_granularity(granularity):
+    """
+    Reject an unknown granularity.
+
+    Raises:
+        ValueError: If the granularity is not one of GRANULARITIES.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity: {granularity}")
+
+
+def bucket_key(day, granularity="month"):
+    """
+    Bucket key of a date, as computed in SQL by `database.time_buckets.bucket_expression`.
+
+    Args:
+        day (date): The date.
+        granularity (str, optional): One of GRANULARITIES. Defaults to "month".
+
+    Raises:
+        ValueError: If the granularity is unknown.
+    """
+    check_granularity(granularity)
+    if granularity == "day":
+        return day.isoformat()
+    if granularity == "week":
+        year, week, _ = day.isocalendar()
+        return f"{year}-W{week:02d}"
+    if granularity == "month":
+        return f"{day.year}-{day.month:02d}"
+    if granularity == "quarter":
+        return f"{day.year}-Q{(day.month + 2) // 3}"
+    return str(day.year)
+
+
+def bucket_label(key, granularity="month"):
+    """
+    Text shown for a bucket key, e.g. "Janvier 2024", "S05 2024", "T1 2024".
+
+    Args:
+        key (str): The bucket key.
+        granularity (str, optional): One of GRANULARITIES. Defaults to "month".
+
+    Raises:
+        ValueError: If the granularity is unknown.
+    """
+    check_granularity(granularity)
+    key = str(key)
+    if granularity == "day":
+        year, month, day = key.split("-")
+        return f"{day}/{month}/{year}"
+    if granularity == "week":
+        year, week = key.split("-W")
+        return f"S{week} {year}"
+    if granularity == "month":
+        year, month = key.split("-")
+        return f"{get_month_name(int(month))} {year}"
+    if granularity == "quarter":
+        year, quarter = key.split("-Q")
+        return f"T{quarter} {year}"
+    return key
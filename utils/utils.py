@@ -66,10 +66,11 @@ def save_config_data(value_1:str, value_2:str):
         `value_2` (str): value of the first key
     """
 
-    config = {
+    config = read_config_file_data() or {}
+    config.update({
         "user_id": value_1,
         "user_name": value_2,
-    }
+    })
     
     with config_file.open('w') as f:
         json.dump(config, f)
@@ -0,0 +1,166 @@
+import weakref
+
+from imports import QObject, QRunnable, QThreadPool, QTimer, Signal, Slot
+
+
+class WorkerSignals(QObject):
+    """
+    Signals emitted by a Worker, delivered on the thread of their receiver.
+
+    Signals:
+        result (int, object): Generation of the task and its return value.
+        error (int, object): Generation of the task and the exception raised.
+    """
+
+    result = Signal(int, object)
+    error = Signal(int, object)
+
+
+class Worker(QRunnable):
+    """
+    Run a function on a QThreadPool thread.
+
+    The function gets its own database session: `session` is a scoped_session,
+    so controller calls made on the pool thread never share the GUI session.
+
+    Args:
+        generation (int): Token sent back with the result.
+        fn (callable): The function to run.
+    """
+
+    def __init__(self, generation, fn, *args, **kwargs):
+        super().__init__()
+        self.generation = generation
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        # Le runner garde la référence Python : Qt ne doit pas détruire l'objet.
+        self.setAutoDelete(False)
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.error.emit(self.generation, e)
+        else:
+            self.signals.result.emit(self.generation, result)
+
+
+class LatestTaskRunner(QObject):
+    """
+    Run tasks in the background and only deliver the result of the latest one.
+
+    Each `submit` supersedes the previous task: if it has not started yet it
+    is removed from the queue, otherwise its result is dropped when it
+    arrives. Tasks run one at a time on a private thread pool.
+
+    Signals:
+        result (object): Return value of the latest task.
+        error (object): Exception raised by the latest task.
+    """
+
+    result = Signal(object)
+    error = Signal(object)
+
+    # Runners vivants, arrêtés ensemble avant une restauration de la base.
+    _instances = weakref.WeakSet()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.generation = 0
+        self._workers = {}
+        LatestTaskRunner._instances.add(self)
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Run `fn(*args, **kwargs)` in the background, superseding earlier tasks.
+
+        Args:
+            fn (callable): The function to run.
+        """
+        self._take_queued()
+        self.generation += 1
+        worker = Worker(self.generation, fn, *args, **kwargs)
+        # Connexion à des slots de cet objet (thread GUI) : Qt met les appels
+        # en file d'attente au lieu de les exécuter dans le thread du pool.
+        worker.signals.result.connect(self._on_result)
+        worker.signals.error.connect(self._on_error)
+        self._workers[self.generation] = worker
+        self.pool.start(worker)
+
+    def cancel(self):
+        """
+        Drop every submitted task: queued ones are removed, the result of the
+        running one will be ignored.
+        """
+        self._take_queued()
+        self.generation += 1
+
+    def wait(self):
+        """
+        Drop the queued tasks and block until the running one has finished;
+        its result is ignored.
+        """
+        self.cancel()
+        self.pool.waitForDone()
+
+    @classmethod
+    def wait_all(cls):
+        """Call `wait` on every runner, e.g. before the database is replaced."""
+        for runner in list(cls._instances):
+            runner.wait()
+
+    def _take_queued(self):
+        for generation, worker in list(self._workers.items()):
+            if self.pool.tryTake(worker):
+                del self._workers[generation]
+
+    def is_running(self):
+        """Return True while the latest task has not delivered its result."""
+        return self.generation in self._workers
+
+    @Slot(int, object)
+    def _on_result(self, generation, value):
+        self._workers.pop(generation, None)
+        if generation == self.generation:
+            self.result.emit(value)
+
+    @Slot(int, object)
+    def _on_error(self, generation, exception):
+        self._workers.pop(generation, None)
+        if generation == self.generation:
+            self.error.emit(exception)
+
+
+class Debouncer(QObject):
+    """
+    Coalesce bursts of calls: `fn` runs once, `delay_ms` after the last call.
+
+    Args:
+        fn (callable): The function to run, without arguments.
+        delay_ms (int): Quiet time in milliseconds before `fn` runs.
+        parent (QObject, optional): The parent object. Defaults to None.
+    """
+
+    def __init__(self, fn, delay_ms, parent=None):
+        super().__init__(parent)
+        self.fn = fn
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self.fn)
+
+    def trigger(self):
+        """(Re)start the countdown; an earlier pending call is replaced."""
+        self.timer.start()
+
+    def cancel(self):
+        """Forget the pending call, if any."""
+        self.timer.stop()
+
+    def is_pending(self):
+        """Return True while a call is waiting for the end of the countdown."""
+        return self.timer.isActive()
@@ -1,12 +1,13 @@
 from sqlalchemy import Date, DateTime, Enum, Float, Integer, String
 
 from imports import QDialog, QVBoxLayout, QHBoxLayout, QFrame, QSize, QGridLayout, QSpacerItem, QSizePolicy, QMessageBox, QWidget, Signal, QCloseEvent
+from models.money import MoneyType
 from pyside6_custom_widgets.button import Button
 from pyside6_custom_widgets.label import Label
 from pyside6_custom_widgets.labeled_combobox_2 import LabeledComboBox
 from pyside6_custom_widgets.labeled_date_edit import LabeledDateEdit
 from pyside6_custom_widgets.labeled_line_edit import LabeledLineEdit
-from pyside6_custom_widgets.table_widget import CustomTableWidget
+from pyside6_custom_widgets.table_view import CustomTableView
 from utils.utils import  set_app_icon
 
 from qt_material import apply_stylesheet
@@ -113,8 +114,8 @@ class BaseFormWidget(QDialog):
         if not editable:
             return 
 
-        # Handle String, Integer, Float columns without foreign keys
-        if isinstance(column.type, (String, Integer, Float)) and not column.foreign_keys and input_type != "enum":
+        # Handle String, Integer, Float and Money columns without foreign keys
+        if isinstance(column.type, (String, Integer, Float, MoneyType)) and not column.foreign_keys and input_type != "enum":
             return LabeledLineEdit(label_text=verbose_name, required=required, input_type=input_type)
 
         # Handle ForeignKey columns
@@ -135,7 +136,7 @@ class BaseFormWidget(QDialog):
         """
         Create a non-editable field based on the column type.
         """
-        if isinstance(column.type, (String, Integer, Float)) and not column.foreign_keys:
+        if isinstance(column.type, (String, Integer, Float, MoneyType)) and not column.foreign_keys:
             field_widget = LabeledLineEdit(label_text=verbose_name, required=required)
         elif column.foreign_keys:
             field_widget = LabeledComboBox(label_text=verbose_name, required=required)
@@ -257,7 +258,7 @@ class UpdateView(BaseFormWidget):
     
 class ListView(QWidget):
     """
-    Generic view to display list of model elements using a CustomTableWidget.
+    Generic view to display list of model elements using a CustomTableView.
     """
     reload_data_signal = Signal()
     def __init__(self, model=None, controller=None):
@@ -270,11 +271,11 @@ class ListView(QWidget):
 
     def setup_ui(self):
         """
-        Sets up the UI by initializing the CustomTableWidget with headers and data.
+        Sets up the UI by initializing the CustomTableView with headers and data.
         """
         self.main_layout = QVBoxLayout()
 
-        self.custom_table = CustomTableWidget(
+        self.custom_table = CustomTableView(
             model=self.model,
             controller=self.controller,
             edit_callback=self.edit_row,
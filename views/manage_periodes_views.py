@@ -38,10 +38,9 @@ class CashBoxPeriodUpdateView(UpdateView):
             form_data = self.get_form_data()
             if self.validate_fields():
                 if form_data.get('is_open') == 'Fermé':
+                    # Le contrôleur calcule le solde final et fige les agrégats de l'exercice.
                     response = QMessageBox.question(self, "Confirmation de fermerture d'exercice", "Cet exercice va à présent être fermé. Continuer?", QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
-                    if response == QMessageBox.Yes:
-                        form_data["ending_balance"] = self.controller.calculate_ending_balance()
-                    elif response == QMessageBox.No:
+                    if response == QMessageBox.No:
                         return
                 self.controller.update(id_=self.id, **form_data)  
                 self.refresh_signal.emit()
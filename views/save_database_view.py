@@ -1,13 +1,17 @@
 import os
-from pathlib import Path
-import shutil
 from imports import QDialog, QWidget, QVBoxLayout, QFileDialog, QMessageBox
 
+from controllers.audit_writer import audit_writer
+from controllers.base_controller import BaseController
+from controllers.period_context import period_context
+from database.create_db import upgrade_database
+from database.database import backup_database, restore_database
 from pyside6_custom_widgets.button import Button
 
 from qt_material import apply_stylesheet
 
 from utils.utils import set_app_icon
+from utils.workers import LatestTaskRunner
 class DatabaseManager(QDialog):
     def __init__(self):
         super().__init__()
@@ -34,10 +38,8 @@ class DatabaseManager(QDialog):
 
         if destination_folder:
             try:
-                # Assure-toi que le chemin de la base de données est correct
-                db_path = Path(__file__).parent.parent / "database/db.db"
                 backup_path = os.path.join(destination_folder, "database_backup.db")
-                shutil.copy(db_path, backup_path)
+                backup_database(backup_path)
 
                 QMessageBox.information(self, "Backup Success", 
                     f"Backup completed successfully!\nLocation: {backup_path}")
@@ -52,9 +54,14 @@ class DatabaseManager(QDialog):
 
         if backup_file:
             try:
-                # Assure-toi que le chemin de la base de données est correct
-                db_path = Path(__file__).parent.parent / "database/db.db"
-                shutil.copy(backup_file, db_path)
+                # Plus aucune écriture ni lecture en arrière-plan pendant la restauration.
+                audit_writer.shutdown()
+                LatestTaskRunner.wait_all()
+                restore_database(backup_file)
+                # Une sauvegarde ancienne est mise au schéma courant.
+                upgrade_database()
+                period_context.invalidate()
+                BaseController._invalidate_counts()
 
                 QMessageBox.information(self, "Restore Success", 
                     f"Database has been restored successfully from: {backup_file}")